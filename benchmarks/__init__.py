@@ -0,0 +1,14 @@
+"""
+Reproducible performance benchmarks for the certificate system.
+
+Run with ``python manage.py run_benchmarks --scale 1k``. The suite builds a
+separate benchmark database (never the configured one), seeds synthetic
+certificates, reissue logs and activity logs at the requested scale, then
+times the hot paths through the Django test client and reports throughput,
+latency percentiles and query counts as JSON so runs can be compared across
+commits (``--compare previous.json``).
+
+    seed.py       synthetic data at a given scale
+    scenarios.py  the requests that are timed
+    runner.py     database/media setup, measurement and reporting
+"""
@@ -0,0 +1,218 @@
+# benchmarks/runner.py
+"""
+Benchmark database and media setup, measurement and reporting.
+
+The benchmark database is created through Django's test database machinery,
+next to (never instead of) the configured one: a file in the temp directory
+for SQLite, ``bench_<NAME>`` elsewhere. With ``keepdb`` it survives between
+runs, so a large seed only has to be paid once. Generated files go to a
+temporary MEDIA_ROOT that is removed afterwards.
+"""
+import json
+import platform
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.db import connection, reset_queries
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from benchmarks import seed as seeding
+from benchmarks.scenarios import SCENARIOS
+
+WARMUP = 2
+SAMPLE_SIZE = 500
+
+
+def _percentile(ordered, pct):
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _benchmark_db_name(scale):
+    if connection.vendor == "sqlite":
+        return str(Path(tempfile.gettempdir()) / f"brgy_cms_bench_{scale}.sqlite3")
+    return f"bench_{connection.settings_dict['NAME']}"
+
+
+def _prepare_media():
+    """Temporary MEDIA_ROOT holding copies of the bundled templates and default signature."""
+    media_root = Path(tempfile.mkdtemp(prefix="brgy_bench_media_"))
+    source = Path(settings.MEDIA_ROOT)
+    if (source / "certificate_templates").exists():
+        shutil.copytree(source / "certificate_templates", media_root / "certificate_templates")
+    default_signature = source / "signatures" / "default_signature.png"
+    if default_signature.exists():
+        (media_root / "signatures").mkdir()
+        shutil.copy2(default_signature, media_root / "signatures" / "default_signature.png")
+    return media_root
+
+
+def _sample_state(rng, scenarios):
+    from certificates.models import ActivityLog, Certificate
+
+    state = {"pending": {}}
+    for name in {s.name for s in scenarios if s.name.startswith("generate_")}:
+        document_type = name[len("generate_"):]
+        pks = Certificate.objects.filter(document_type=document_type, status="PENDING").order_by("?")
+        state["pending"][document_type] = list(pks.values_list("pk", flat=True)[:SAMPLE_SIZE])
+
+    state["tokens"] = [str(t) for t in Certificate.objects.order_by("?").values_list("verification_token", flat=True)[:SAMPLE_SIZE]]
+    state["search_terms"] = [seeding.LAST_NAMES[i] for i in rng.sample(range(len(seeding.LAST_NAMES)), 5)] + ["Maria", "Rizal"]
+    today = timezone.localdate()
+    state["log_dates"] = [(today - timedelta(days=rng.randrange(seeding.SPAN_DAYS))).isoformat() for _ in range(20)]
+    if not ActivityLog.objects.exists():
+        state["log_dates"] = [today.isoformat()]
+    return state
+
+
+def measure(scenario, client, state, iterations=None):
+    """Run one scenario; returns its latency, throughput and query statistics."""
+    iterations = iterations or scenario.iterations
+    timings, queries, errors = [], [], 0
+
+    for i in range(WARMUP + iterations):
+        reset_queries()
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            try:
+                response = scenario.run(client, state, i)
+                # Streaming responses are only produced when consumed
+                if getattr(response, "streaming", False):
+                    b"".join(response.streaming_content)
+            except (IndexError, KeyError):
+                # Ran out of sample data (e.g. no pending certificates left)
+                break
+            elapsed = time.perf_counter() - start
+        if i < WARMUP:
+            continue
+        if response.status_code != scenario.expected_status:
+            errors += 1
+        timings.append(elapsed * 1000)
+        queries.append(len(captured.captured_queries))
+
+    if not timings:
+        return {"iterations": 0, "skipped": "no sample data"}
+
+    ordered = sorted(timings)
+    total_s = sum(timings) / 1000
+    return {
+        "iterations": len(timings),
+        "errors": errors,
+        "throughput_rps": round(len(timings) / total_s, 2) if total_s else None,
+        "mean_ms": round(sum(timings) / len(timings), 2),
+        "p50_ms": round(_percentile(ordered, 50), 2),
+        "p95_ms": round(_percentile(ordered, 95), 2),
+        "p99_ms": round(_percentile(ordered, 99), 2),
+        "max_ms": round(ordered[-1], 2),
+        "queries_mean": round(sum(queries) / len(queries), 1),
+        "queries_max": max(queries),
+    }
+
+
+def run(scale, names=None, iterations=None, keepdb=False, seed_value=1, log=print):
+    """
+    Seed (if needed) and run the selected scenarios. Returns the JSON-ready
+    report. ``names`` restricts the scenarios; ``iterations`` overrides their
+    defaults.
+    """
+    from certificates import signatures, template_registry
+    from certificates.models import ActivityLog, Certificate, ReissueLog
+
+    count = seeding.parse_scale(scale)
+    scenarios = [s for s in SCENARIOS if not names or s.name in names]
+
+    setup_test_environment()
+    connection.settings_dict.setdefault("TEST", {})["NAME"] = _benchmark_db_name(scale)
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False, keepdb=keepdb)
+    media_root = _prepare_media()
+
+    try:
+        existing = Certificate.objects.count()
+        if existing < count:
+            log(f"Seeding {count - existing} certificates...")
+            started = time.perf_counter()
+            step = max(seeding.BATCH_SIZE, count // 10)
+            seeding.seed(
+                count - existing, seed_value=seed_value + existing,
+                progress=lambda done, total: log(f"  {done}/{total}") if done % step == 0 or done == total else None,
+            )
+            log(f"Seeded in {time.perf_counter() - started:.1f}s")
+
+        rows = {
+            "certificates": Certificate.objects.count(),
+            "reissue_logs": ReissueLog.objects.count(),
+            "activity_logs": ActivityLog.objects.count(),
+        }
+        state = _sample_state(random.Random(seed_value), scenarios)
+
+        results = {}
+        with override_settings(
+            MEDIA_ROOT=str(media_root), CERTIFICATE_GENERATION_ASYNC=False, CERTIFICATE_PROFILE_MEMORY=False,
+            CERTIFICATE_SLOW_GENERATION_MS=None, DEBUG=False,
+        ):
+            template_registry.invalidate()
+            signatures.invalidate()
+            client = Client()
+            client.force_login(seeding._users()[0])
+            for scenario in scenarios:
+                log(f"Running {scenario.name}...")
+                results[scenario.name] = measure(scenario, client, state, iterations)
+        template_registry.invalidate()
+        signatures.invalidate()
+    finally:
+        shutil.rmtree(media_root, ignore_errors=True)
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": timezone.now().isoformat(),
+            "scale": scale,
+            "rows": rows,
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "warmup": WARMUP,
+        },
+        "scenarios": results,
+    }
+
+
+def compare(current, baseline):
+    """Rows of (scenario, metric, baseline, current, change %) for p50/p95/queries."""
+    rows = []
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before or not result.get("iterations") or not before.get("iterations"):
+            continue
+        for metric in ("p50_ms", "p95_ms", "queries_mean"):
+            old, new = before.get(metric), result.get(metric)
+            change = round((new - old) / old * 100, 1) if old else None
+            rows.append((name, metric, old, new, change))
+    return rows
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
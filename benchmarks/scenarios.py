@@ -0,0 +1,95 @@
+# benchmarks/scenarios.py
+"""
+Timed scenarios. Each scenario performs one request per iteration through the
+Django test client, logged in as the benchmark admin, and returns the
+response. ``state`` holds sample data prepared by the runner (verification
+tokens, pending certificate ids, search terms).
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+from benchmarks.seed import DOCUMENT_TYPES
+
+
+@dataclass
+class Scenario:
+    name: str
+    run: Callable
+    iterations: int = 50
+    expected_status: int = 200
+
+
+def _generate(document_type):
+    def run(client, state, i):
+        # Each iteration generates a different pending certificate
+        pk = state["pending"][document_type].pop()
+        return client.get(f"/certificates/{pk}/generate/")
+    return run
+
+
+def _reports(client, state, i):
+    return client.get("/certificates/reports/")
+
+
+def _reports_pdf(client, state, i):
+    return client.get("/certificates/reports/pdf/")
+
+
+def _dashboard(client, state, i):
+    # First three pages, following the Next cursor
+    params = {"cursor": state["dashboard_cursor"]} if i % 3 and state.get("dashboard_cursor") else {}
+    response = client.get("/certificates/dashboard/", params)
+    state["dashboard_cursor"] = response.context["recent_certs"].next_cursor if response.context else None
+    return response
+
+
+def _list_search(client, state, i):
+    terms = state["search_terms"]
+    return client.get("/certificates/", {"search": terms[i % len(terms)]})
+
+
+def _list_filter(client, state, i):
+    return client.get("/certificates/", {"document_type": DOCUMENT_TYPES[i % 3], "status": "COMPLETED"})
+
+
+def _activity_type(client, state, i):
+    return client.get("/certificates/activity-logs/", {"type": ["login", "failed", "create"][i % 3]})
+
+
+def _activity_search(client, state, i):
+    terms = state["search_terms"]
+    return client.get("/certificates/activity-logs/", {"search": terms[i % len(terms)]})
+
+
+def _activity_date(client, state, i):
+    dates = state["log_dates"]
+    return client.get("/certificates/activity-logs/", {"date": dates[i % len(dates)]})
+
+
+def _verify(client, state, i):
+    tokens = state["tokens"]
+    return client.get(f"/certificates/verify/{tokens[i % len(tokens)]}/")
+
+
+def _qr(client, state, i):
+    tokens = state["tokens"]
+    return client.get(f"/certificates/qr/{tokens[i % len(tokens)]}/")
+
+
+SCENARIOS = [
+    *(Scenario(f"generate_{t}", _generate(t), iterations=20, expected_status=302) for t in DOCUMENT_TYPES),
+    Scenario("reports", _reports, iterations=20),
+    Scenario("reports_pdf", _reports_pdf, iterations=20),
+    Scenario("dashboard", _dashboard),
+    Scenario("list_certificates_search", _list_search),
+    Scenario("list_certificates_filter", _list_filter),
+    Scenario("activity_logs_type", _activity_type, iterations=20),
+    Scenario("activity_logs_search", _activity_search, iterations=20),
+    Scenario("activity_logs_date", _activity_date, iterations=20),
+    Scenario("verify_certificate", _verify, iterations=200),
+    Scenario("certificate_qr", _qr, iterations=200),
+]
+
+
+def by_name():
+    return {scenario.name: scenario for scenario in SCENARIOS}
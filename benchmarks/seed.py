@@ -0,0 +1,186 @@
+# benchmarks/seed.py
+"""
+Synthetic data for benchmarks.
+
+Rows are inserted with bulk_create in batches. Creation dates are spread over
+the last ``SPAN_DAYS`` days so date filters, monthly aggregates and
+expirations behave like a long-running installation.
+"""
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from certificates import search, statistics
+from certificates.models import (
+    LIFECYCLE_ACTIVE, LIFECYCLE_EXPIRED, ActivityLog, Certificate, ReissueLog, UserProfile, normalize_key,
+)
+
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+SPAN_DAYS = 3 * 365
+BATCH_SIZE = 5_000
+BENCH_PASSWORD = "benchmark"
+
+FIRST_NAMES = [
+    "Juan", "Maria", "Jose", "Ana", "Pedro", "Rosa", "Carlo", "Liza", "Mark", "Grace",
+    "Paolo", "Joy", "Ramon", "Teresa", "Miguel", "Carmen", "Angelo", "Nina", "Rafael", "Bea",
+]
+LAST_NAMES = [
+    "Santos", "Reyes", "Cruz", "Bautista", "Ocampo", "Garcia", "Mendoza", "Torres", "Tomas", "Andrada",
+    "Castillo", "Flores", "Villanueva", "Ramos", "Aquino", "Dela Cruz", "Navarro", "Salazar", "Mercado", "Soriano",
+]
+STREETS = ["Rizal St.", "Mabini St.", "Bonifacio Ave.", "Luna St.", "Del Pilar St.", "Gov. Pascual Ave."]
+PURPOSES = [
+    "Employment", "Scholarship", "Bank Requirement", "Medical Assistance", "Burial Assistance",
+    "School Requirement", "Business Permit", "Police Clearance", "Postal ID", "Travel",
+]
+DOCUMENT_TYPES = ["clearance", "residency", "indigency"]
+PREFIXES = {"clearance": "CLR", "residency": "RES", "indigency": "IND"}
+
+
+def parse_scale(value):
+    """Accept a named scale (1k, 100k, 1m) or a plain number of certificates."""
+    value = str(value).lower().replace("_", "")
+    if value in SCALES:
+        return SCALES[value]
+    try:
+        count = int(value)
+    except ValueError:
+        raise ValueError(f"Unknown scale '{value}'; use one of {', '.join(SCALES)} or a number.")
+    if count < 1:
+        raise ValueError("Scale must be at least 1.")
+    return count
+
+
+@contextmanager
+def _explicit_created_at(*models):
+    """Let bulk_create keep the generated created_at/reissued_at values."""
+    fields = [
+        field for model in models for field in model._meta.concrete_fields
+        if getattr(field, "auto_now_add", False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def _users():
+    admin, created = User.objects.get_or_create(
+        username="bench_admin", defaults={"is_superuser": True, "is_staff": True, "first_name": "Bench"}
+    )
+    if created:
+        admin.set_password(BENCH_PASSWORD)
+        admin.save()
+    staff = []
+    for i in range(10):
+        user, created = User.objects.get_or_create(username=f"bench_staff{i}", defaults={"first_name": f"Staff{i}"})
+        if created:
+            user.set_password(BENCH_PASSWORD)
+            user.save()
+            UserProfile.objects.get_or_create(user=user, defaults={"role": "staff"})
+        staff.append(user)
+    return admin, staff
+
+
+def _certificate(rng, index, now):
+    document_type = DOCUMENT_TYPES[index % len(DOCUMENT_TYPES)]
+    created_at = now - timedelta(seconds=rng.randrange(SPAN_DAYS * 86400))
+    reissued = rng.random() < 0.1
+    reissue_date = created_at + timedelta(days=rng.randrange(1, 200)) if reissued else None
+    if reissue_date and reissue_date > now:
+        reissue_date = now
+    issue_date = reissue_date or created_at
+    full_name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}"
+    purpose = rng.choice(PURPOSES)
+    return Certificate(
+        unique_id=f"{PREFIXES[document_type]}-B{index:09d}",
+        full_name=full_name,
+        full_name_key=normalize_key(full_name),
+        address=f"{rng.randrange(1, 999)} {rng.choice(STREETS)}, Longos, Malabon City",
+        age=rng.randrange(18, 90),
+        occupation=rng.choice(["Vendor", "Driver", "Teacher", "Student", "Nurse", "None"]),
+        purpose=purpose,
+        purpose_key=normalize_key(purpose),
+        resident_since=str(rng.randrange(1970, 2024)),
+        document_type=document_type,
+        # Most certificates are generated; keep a pending pool for the generation benchmark
+        status="PENDING" if rng.random() < 0.2 else "COMPLETED",
+        verification_token=uuid.UUID(int=rng.getrandbits(128), version=4),
+        created_at=created_at,
+        reissue_date=reissue_date,
+        reissued=reissued,
+        expiration_date=issue_date + timedelta(days=365),
+        lifecycle=LIFECYCLE_EXPIRED if issue_date + timedelta(days=365) < now else LIFECYCLE_ACTIVE,
+    )
+
+
+def _activity(rng, user, now):
+    created_at = now - timedelta(seconds=rng.randrange(SPAN_DAYS * 86400))
+    roll = rng.random()
+    if roll < 0.35:
+        return ActivityLog(user=user, action_type="login", action=f"{user.username} logged in", created_at=created_at)
+    if roll < 0.65:
+        return ActivityLog(user=user, action_type="logout", action=f"{user.username} logged out", created_at=created_at)
+    if roll < 0.75:
+        return ActivityLog(
+            user=user, action_type="failed", action=f"Failed login attempt for username: {user.username}",
+            created_at=created_at,
+        )
+    if roll < 0.95:
+        return ActivityLog(
+            user=user, action_type="create",
+            action=f"Created certificate for {rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} "
+                   f"({rng.choice(DOCUMENT_TYPES)})",
+            created_at=created_at,
+        )
+    return ActivityLog(user=user, action_type="reissue", action="Reissued certificate", created_at=created_at)
+
+
+def seed(count, seed_value=1, progress=None):
+    """
+    Insert ``count`` certificates plus proportional reissue and activity logs.
+    Returns a dict of row counts.
+    """
+    rng = random.Random(seed_value)
+    now = timezone.now()
+    admin, staff = _users()
+    users = [admin] + staff
+
+    created = {"certificates": 0, "reissue_logs": 0, "activity_logs": 0}
+    with _explicit_created_at(Certificate, ReissueLog, ActivityLog):
+        for start in range(0, count, BATCH_SIZE):
+            size = min(BATCH_SIZE, count - start)
+            with transaction.atomic():
+                certs = Certificate.objects.bulk_create(
+                    [_certificate(rng, start + i, now) for i in range(size)], batch_size=BATCH_SIZE
+                )
+                # SQLite and PostgreSQL return primary keys from bulk_create
+                reissues = [
+                    ReissueLog(
+                        certificate=cert, reissued_by=rng.choice(users), reissued_at=cert.reissue_date,
+                        remarks="Reissued for benchmark",
+                    )
+                    for cert in certs if cert.reissued
+                ]
+                ReissueLog.objects.bulk_create(reissues, batch_size=BATCH_SIZE)
+                logs = [_activity(rng, rng.choice(users), now) for _ in range(size)]
+                ActivityLog.objects.bulk_create(logs, batch_size=BATCH_SIZE)
+
+            created["certificates"] += size
+            created["reissue_logs"] += len(reissues)
+            created["activity_logs"] += len(logs)
+            if progress:
+                progress(created["certificates"], count)
+
+    # bulk_create bypasses the signals that maintain the daily statistics and search index
+    statistics.rebuild()
+    search.rebuild()
+    return created
@@ -96,6 +96,26 @@ else:
         }
     }
 
+# -------------------------------
+# CACHES
+# -------------------------------
+# "verification" must be shared by every process that saves certificates (web
+# workers, certificate_worker, cron commands) so a save anywhere drops the cached
+# result everywhere (see certificates/verification.py): Redis when REDIS_URL is
+# set, otherwise files on the local disk (one host only)
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "verification": (
+        {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": os.environ["REDIS_URL"]}
+        if os.getenv("REDIS_URL")
+        else {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": BASE_DIR / "cache" / "verification",
+            "OPTIONS": {"MAX_ENTRIES": 50000},
+        }
+    ),
+}
+
 # -------------------------------
 # PASSWORD VALIDATION
 # -------------------------------
@@ -128,6 +148,73 @@ MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 CERTIFICATE_TEMPLATE_DIR = MEDIA_ROOT / "certificate_templates"
 
+# Public base URL, used for links built outside a request (e.g. QR codes from batch jobs)
+SITE_URL = os.getenv(
+    "SITE_URL",
+    f"https://{RENDER_EXTERNAL_HOSTNAME}" if RENDER_EXTERNAL_HOSTNAME else "http://127.0.0.1:8000",
+)
+
+# -------------------------------
+# CERTIFICATE GENERATION JOBS
+# -------------------------------
+# When True, generate_certificate only queues a job for `manage.py certificate_worker`
+CERTIFICATE_GENERATION_ASYNC = os.getenv("CERTIFICATE_GENERATION_ASYNC", "True") == "True"
+CERTIFICATE_JOB_MAX_ATTEMPTS = 3
+CERTIFICATE_JOB_LEASE_SECONDS = 120
+
+# Certificate PDFs: "reportlab" (native layouts), "unoserver" (DOCX converted by pooled
+# headless LibreOffice), "fake" (tests/dev converter) or "" (disabled)
+CERTIFICATE_PDF_BACKEND = os.getenv("CERTIFICATE_PDF_BACKEND", "reportlab")
+CERTIFICATE_PDF_POOL_SIZE = int(os.getenv("CERTIFICATE_PDF_POOL_SIZE", "2"))
+CERTIFICATE_PDF_TIMEOUT = 60
+
+# Per-stage generation timings (see certificates/instrumentation.py). Memory tracing
+# slows generation noticeably; enable it only while profiling.
+CERTIFICATE_PROFILING = True
+CERTIFICATE_PROFILE_MEMORY = os.getenv("CERTIFICATE_PROFILE_MEMORY", "False") == "True"
+# Log generations slower than this (ms) as JSON to the "certificates.generation" logger
+CERTIFICATE_SLOW_GENERATION_MS = int(os.getenv("CERTIFICATE_SLOW_GENERATION_MS", "0")) or None
+
+# -------------------------------
+# ACTIVITY LOG
+# -------------------------------
+# Activity logs are buffered per worker and written in batches (see certificates/audit.py).
+# Security events are always written immediately.
+ACTIVITY_LOG_BUFFERED = os.getenv("ACTIVITY_LOG_BUFFERED", "True") == "True"
+ACTIVITY_LOG_BUFFER_SIZE = 50
+ACTIVITY_LOG_FLUSH_SECONDS = 2
+
+# -------------------------------
+# RETENTION
+# -------------------------------
+# `manage.py apply_retention` archives older activity logs and expired sessions to
+# compressed JSONL under RETENTION_ARCHIVE_DIR and deletes them (see certificates/retention.py)
+RETENTION_ARCHIVE_DIR = Path(os.getenv("RETENTION_ARCHIVE_DIR", BASE_DIR / "archives"))
+RETENTION_DAYS = {
+    "activity_logs": int(os.getenv("RETENTION_ACTIVITY_LOG_DAYS", "365")),
+    "sessions": int(os.getenv("RETENTION_SESSION_DAYS", "7")),
+}
+RETENTION_BATCH_SIZE = 1000
+
+# -------------------------------
+# CERTIFICATE EXPIRY
+# -------------------------------
+# `manage.py expire_certificates` marks certificates past their expiration date as
+# EXPIRED (see certificates/expiry.py); run it from cron
+CERTIFICATE_EXPIRY_BATCH_SIZE = 1000
+
+# Verification results are cached per token in the "verification" cache and
+# dropped when the certificate changes (see certificates/verification.py)
+VERIFICATION_CACHE_SECONDS = 60 * 60 * 24
+# Most certificates accepted by one bulk verification request
+VERIFICATION_BULK_MAX = 500
+
+# Signed QR claims for offline verification (see certificates/claims.py). Scanner
+# apps need QR_CLAIM_KEY; without it a key is derived from SECRET_KEY.
+QR_SIGNED_CLAIMS = os.getenv("QR_SIGNED_CLAIMS", "False") == "True"
+QR_CLAIM_KEY_ID = os.getenv("QR_CLAIM_KEY_ID", "1")
+QR_CLAIM_KEYS = {QR_CLAIM_KEY_ID: os.environ["QR_CLAIM_KEY"]} if os.getenv("QR_CLAIM_KEY") else {}
+
 # -------------------------------
 # DEFAULT AUTO FIELD
 # -------------------------------
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import Certificate, ActivityLog, AdminSignature, CertificateTemplate, ReissueLog
+from . import audit, claims, report_cache
+from .models import Certificate, ActivityLog, AdminSignature, CertificateTemplate, ReissueLog, GenerationJob, FailedLogin, ClaimRevocation
 
 
 @admin.register(Certificate)
@@ -49,10 +50,7 @@ class CertificateAdmin(admin.ModelAdmin):
 
     # Log creation if new
         if was_new:
-            ActivityLog.objects.create(
-                user=request.user,
-                action=f"Created certificate {obj.unique_id} - {obj.full_name}"
-            )
+            audit.log(request.user, f"Created certificate {obj.unique_id} - {obj.full_name}")
 
     # Log reissue if reissue_date changed
         if change and 'reissue_date' in form.changed_data and obj.reissue_date:
@@ -69,6 +67,36 @@ class ActivityLogAdmin(admin.ModelAdmin):
     list_filter = ("created_at",)
 
 
+# ✅ Admin: Failed Login Counters
+@admin.register(FailedLogin)
+class FailedLoginAdmin(admin.ModelAdmin):
+    list_display = ("username", "failures", "last_failed_at")
+    search_fields = ("username",)
+    ordering = ("-last_failed_at",)
+
+
+# ✅ Admin: Revoked QR Claims
+@admin.register(ClaimRevocation)
+class ClaimRevocationAdmin(admin.ModelAdmin):
+    list_display = ("unique_id", "reason", "revoked_before", "updated_at")
+    search_fields = ("unique_id",)
+    list_filter = ("reason",)
+    ordering = ("-updated_at",)
+    readonly_fields = ("updated_at",)
+
+    def save_model(self, request, obj, form, change):
+        # Through claims.revoke so the cached revocation list is refreshed
+        claims.revoke(obj.unique_id, before=obj.revoked_before, reason=obj.reason)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        report_cache.bump(claims.REVOCATIONS)
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        report_cache.bump(claims.REVOCATIONS)
+
+
 # ✅ Admin: Digital Signatures
 @admin.register(AdminSignature)
 class AdminSignatureAdmin(admin.ModelAdmin):
@@ -89,3 +117,10 @@ class ReissueLogAdmin(admin.ModelAdmin):
     search_fields = ("certificate__unique_id", "reissued_by__username", "remarks")
     list_filter = ("reissued_at",)
 
+
+# ✅ Admin: Generation Jobs
+@admin.register(GenerationJob)
+class GenerationJobAdmin(admin.ModelAdmin):
+    list_display = ("certificate", "status", "attempts", "requested_by", "created_at", "finished_at")
+    search_fields = ("certificate__unique_id", "requested_by__username", "last_error")
+    list_filter = ("status", "created_at")
@@ -6,6 +6,11 @@ class CertificatesConfig(AppConfig):
     name = "certificates"
 
     def ready(self):
+        # ✅ Register signal receivers. signals.py was never imported before, so
+        # this also turns on its login / logout / failed-login activity logs
+        # (nothing else records those) besides the template cache invalidation
+        from . import signals  # noqa: F401
+
         # ✅ Import and run startup checks for template directory
         try:
             from .startup import ensure_certificate_templates
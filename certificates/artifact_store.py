@@ -0,0 +1,80 @@
+# certificates/artifact_store.py
+"""
+Content-addressed storage for generated certificate files.
+
+Artifacts are named after a SHA-256 of everything that goes into them
+(template version, certificate values, signature image, QR payload), e.g.
+``generated/docx/3f/3f9a...e1.docx``. Identical inputs map to the same file,
+so repeat requests reuse it instead of rendering again, and two residents who
+share a name can no longer overwrite each other's documents.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+
+_lock = threading.Lock()
+_file_digests = {}  # (path, mtime_ns, size) -> sha256 hex
+
+
+def bytes_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(path):
+    """SHA-256 of a file's content, cached by path, mtime and size."""
+    path = Path(path)
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    digest = _file_digests.get(key)
+    if digest is None:
+        digest = bytes_digest(path.read_bytes())
+        with _lock:
+            _file_digests[key] = digest
+    return digest
+
+
+def artifact_key(**inputs):
+    """Stable hash of the inputs that determine an artifact's content."""
+    payload = json.dumps(inputs, sort_keys=True, default=str, separators=(",", ":"))
+    return bytes_digest(payload.encode("utf-8"))
+
+
+def artifact_name(kind, key, extension):
+    """Storage name relative to MEDIA_ROOT, sharded by the key's first byte."""
+    return f"generated/{kind}/{key[:2]}/{key}.{extension}"
+
+
+def artifact_path(name):
+    return Path(settings.MEDIA_ROOT) / name
+
+
+def exists(name):
+    return artifact_path(name).exists()
+
+
+def write(name, data=None, writer=None):
+    """
+    Atomically store an artifact from ``data`` bytes or ``writer(tmp_path)``.
+    Concurrent writers of the same key produce identical content, so the last
+    rename simply wins.
+    """
+    target = artifact_path(name)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, suffix=target.suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if data is not None:
+                f.write(data)
+        if writer is not None:
+            writer(tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return name
@@ -0,0 +1,136 @@
+# certificates/audit.py
+"""
+Buffered activity logging.
+
+``log(user, action)`` records an ActivityLog without a write on the request
+path: events are buffered in memory per worker process and inserted with a
+single bulk_create once ACTIVITY_LOG_BUFFER_SIZE events are waiting or the
+oldest has waited ACTIVITY_LOG_FLUSH_SECONDS (checked by a background thread).
+The buffer is flushed at interpreter exit, so a normal worker shutdown
+loses nothing.
+
+Events are queued when the surrounding transaction commits, so a rolled back
+action is not logged. ``critical=True`` (security events such as failed
+logins) writes immediately, as does everything when ACTIVITY_LOG_BUFFERED
+is False.
+
+Settings:
+    ACTIVITY_LOG_BUFFERED         buffer events (default True)
+    ACTIVITY_LOG_BUFFER_SIZE      flush when this many events are waiting (default 50)
+    ACTIVITY_LOG_FLUSH_SECONDS    flush events older than this (default 2)
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from certificates import search
+
+logger = logging.getLogger("certificates.audit")
+
+# Events kept when flushing keeps failing; beyond this the oldest are dropped
+MAX_PENDING = 5000
+
+_lock = threading.Lock()
+_buffer = []        # unsaved ActivityLog instances, oldest first
+_oldest_at = None   # time.monotonic() when the oldest buffered event was queued
+_flusher = None
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _build(user, action, action_type):
+    from certificates.models import ActivityLog, classify_action
+
+    return ActivityLog(
+        user=user if user is not None and user.is_authenticated else None,
+        action=action[:255],
+        action_type=action_type or classify_action(action),
+    )
+
+
+def log(user, action, action_type=None, critical=False):
+    """Record that ``user`` (or None) did ``action``."""
+    entry = _build(user, action, action_type)
+    if critical or not _setting("ACTIVITY_LOG_BUFFERED", True):
+        entry.save()
+        return entry
+    transaction.on_commit(lambda: _enqueue(entry))
+    return entry
+
+
+def _enqueue(entry):
+    global _oldest_at
+    with _lock:
+        if not _buffer:
+            _oldest_at = time.monotonic()
+        _buffer.append(entry)
+        full = len(_buffer) >= _setting("ACTIVITY_LOG_BUFFER_SIZE", 50)
+    _ensure_flusher()
+    if full:
+        flush()
+
+
+def flush():
+    """Write all buffered events now. Returns the number written."""
+    from certificates.models import ActivityLog
+
+    global _oldest_at
+    with _lock:
+        entries = _buffer[:]
+        _buffer.clear()
+        _oldest_at = None
+    if not entries:
+        return 0
+    try:
+        with transaction.atomic():
+            ActivityLog.objects.bulk_create(entries)
+            # bulk_create skips post_save, which indexes single saves
+            search.update("activity_log", [entry.pk for entry in entries])
+    except Exception:
+        logger.exception("Could not write %d activity log entries", len(entries))
+        with _lock:
+            _buffer[:0] = entries
+            if len(_buffer) > MAX_PENDING:
+                logger.error("Dropping %d activity log entries", len(_buffer) - MAX_PENDING)
+                del _buffer[:len(_buffer) - MAX_PENDING]
+            _oldest_at = time.monotonic()
+        return 0
+    return len(entries)
+
+
+def pending():
+    with _lock:
+        return len(_buffer)
+
+
+def _due():
+    with _lock:
+        return _oldest_at is not None and time.monotonic() - _oldest_at >= _setting("ACTIVITY_LOG_FLUSH_SECONDS", 2)
+
+
+def _run_flusher():
+    interval = _setting("ACTIVITY_LOG_FLUSH_SECONDS", 2)
+    while True:
+        time.sleep(interval)
+        if _due():
+            close_old_connections()
+            flush()
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(target=_run_flusher, name="activity-log-flusher", daemon=True)
+            _flusher.start()
+
+
+atexit.register(flush)
@@ -0,0 +1,163 @@
+# certificates/batch.py
+"""
+Batch certificate generation across a process pool.
+
+The parent process resolves templates and the signing admin's signature once,
+then fans rendering out over a ProcessPoolExecutor. Each worker process keeps
+its own parsed templates (template_registry) and the signature bytes, so they
+are loaded once per worker rather than once per certificate. Workers never
+touch the database; the parent writes results back with bulk_update.
+"""
+import itertools
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+from django.db import connections, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from certificates import audit, report_cache, statistics, template_registry, verification
+from certificates.generation import build_verify_url, render_certificate_docx, resolve_signature_path
+from certificates.models import Certificate, DOCUMENT_CHOICES
+from certificates.utils import _ensure_dirs
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 200
+
+# Per worker process state, set up by _init_worker
+_worker_signature = None
+
+
+@dataclass
+class BatchResult:
+    total: int = 0
+    succeeded: int = 0
+    failures: dict = field(default_factory=dict)  # pk -> error message
+
+    @property
+    def failed(self):
+        return len(self.failures)
+
+
+def _init_worker(template_paths, signature_bytes):
+    global _worker_signature
+    template_registry.prime_paths(template_paths)
+    _worker_signature = signature_bytes
+
+
+def _render_one(cert, verify_url):
+    """Render a single certificate in a worker process. Returns (pk, docx_name)."""
+    return cert.pk, render_certificate_docx(cert, verify_url, _worker_signature)
+
+
+def _chunks(queryset, size):
+    """Yield lists of certificates ordered by pk without a large OFFSET scan."""
+    last_pk = 0
+    while True:
+        chunk = list(queryset.filter(pk__gt=last_pk).order_by("pk")[:size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1].pk
+
+
+def _save_results(rendered):
+    """
+    Bulk-write generated file names and COMPLETED status. Returns the pks
+    written; certificates deleted while they rendered are skipped.
+    """
+    if not rendered:
+        return set()
+    certs = Certificate.objects.in_bulk(list(rendered))
+    if not certs:
+        return set()
+    now = timezone.now()
+    for pk, cert in certs.items():
+        if cert.generated_docx.name != rendered[pk]:
+            cert.generated_pdf = None  # stale until converted again
+        cert.generated_docx.name = rendered[pk]
+        cert.status = "COMPLETED"
+        cert.updated_at = now  # bulk_update skips auto_now
+    with transaction.atomic():
+        Certificate.objects.bulk_update(
+            certs.values(), ["generated_docx", "generated_pdf", "status", "updated_at"], batch_size=500
+        )
+        # bulk_update sends no signals
+        statistics.record_changes(certs.values())
+        verification.invalidate_many((cert.verification_token, cert.unique_id) for cert in certs.values())
+        report_cache.bump(report_cache.CERTIFICATES)
+    return set(certs)
+
+
+def generate_certificates(certificates, user=None, base_url=None, workers=None,
+                          chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    (Re)generate DOCX files for many certificates.
+
+    ``certificates`` is a Certificate queryset or an iterable of pks; ``user``
+    is the admin whose signature is embedded; ``progress(done, total, result)``
+    is called after each certificate. Failures are collected per pk in the
+    returned BatchResult and never stop the batch.
+    """
+    if isinstance(certificates, QuerySet):
+        queryset = certificates
+    else:
+        queryset = Certificate.objects.filter(pk__in=list(certificates))
+
+    _ensure_dirs()
+    result = BatchResult(total=queryset.count())
+    if not result.total:
+        return result
+
+    template_paths = {
+        doc_type: template_registry.get_template_path(doc_type) for doc_type, _ in DOCUMENT_CHOICES
+    }
+    signature_path = resolve_signature_path(user) if user else None
+    signature_bytes = signature_path.read_bytes() if signature_path else None
+
+    chunks = _chunks(queryset, chunk_size)
+    first_chunk = next(chunks, [])
+
+    # Workers are forked (all at once) on the first submit and must not
+    # inherit an open database connection.
+    connections.close_all()
+
+    done = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_worker,
+        initargs=(template_paths, signature_bytes),
+    ) as executor:
+        for chunk in itertools.chain([first_chunk], chunks):
+            futures = {
+                executor.submit(_render_one, cert, build_verify_url(cert, base_url)): cert.pk
+                for cert in chunk
+            }
+            rendered = {}
+            for future in as_completed(futures):
+                pk = futures[future]
+                try:
+                    _, docx_name = future.result()
+                    rendered[pk] = docx_name
+                except Exception as e:
+                    logger.warning(f"Batch generation failed for certificate {pk}: {e}")
+                    result.failures[pk] = str(e)
+                done += 1
+                if progress:
+                    progress(done, result.total, result)
+
+            saved = _save_results(rendered)
+            for pk in rendered.keys() - saved:
+                result.failures[pk] = "Certificate was deleted during generation."
+            result.succeeded += len(saved)
+
+    try:
+        audit.log(user, f"Batch generated {result.succeeded} certificates ({result.failed} failed)")
+    except Exception:
+        logger.exception("Could not log batch generation")
+
+    return result
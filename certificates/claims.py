@@ -0,0 +1,201 @@
+# certificates/claims.py
+"""
+Signed certificate claims for offline verification.
+
+With QR_SIGNED_CLAIMS enabled, the verification URL printed as a QR code
+carries a compact signed claim in its fragment:
+
+    https://<site>/certificates/verify/<token>/#c=BC1.<key id>.<claim>.<signature>
+
+Phones still open the verification page (browsers never send the
+fragment). Scanner apps holding the claim key verify the certificate
+without calling the server:
+
+1. Check the signature: HMAC-SHA256 over "BC1.<key id>.<claim>" with the
+   key named by <key id>, truncated to 16 bytes. All parts are unpadded
+   base64url.
+2. Decode the claim, a JSON object:
+       i  unique_id
+       t  document type
+       a  issued (or reissued) at, Unix seconds
+       e  expires at, Unix seconds (or null)
+       n  name hash: base64url of the first 12 bytes of SHA-256 over the
+          holder's name trimmed, single-spaced and case-folded
+3. Reject it when ``e`` has passed, or when the revocation list (fetched in
+   bulk from /certificates/revocations.json and refreshed when online) has
+   an entry for ``i`` with ``before`` null or greater than ``a``.
+4. Optionally compare ``n`` with the hash of the name on the paper.
+
+verify() below is the reference implementation.
+
+Claims are HMAC-signed, so verifiers must be trusted with the key.
+QR_CLAIM_KEYS maps key ids to secrets so keys can be rotated. Old ids stay
+listed until the certificates signed with them have expired.
+"""
+import base64
+import hashlib
+import hmac
+import json
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+PREFIX = "BC1"
+SIGNATURE_BYTES = 16
+NAME_HASH_BYTES = 12
+
+VALID = "valid"
+EXPIRED = "expired"
+REVOKED = "revoked"
+NAME_MISMATCH = "name_mismatch"
+
+
+class InvalidClaim(Exception):
+    """The text is not a claim signed with a known key."""
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _epoch(value):
+    return int(value.timestamp()) if value else None
+
+
+def enabled():
+    return getattr(settings, "QR_SIGNED_CLAIMS", False)
+
+
+def keys():
+    """{key id: secret bytes}. Without QR_CLAIM_KEYS a key is derived from SECRET_KEY."""
+    configured = getattr(settings, "QR_CLAIM_KEYS", None)
+    if configured:
+        return {kid: secret.encode() if isinstance(secret, str) else secret for kid, secret in configured.items()}
+    return {"0": hashlib.sha256(f"certificates.claims:{settings.SECRET_KEY}".encode()).digest()}
+
+
+def current_key_id():
+    available = keys()
+    kid = getattr(settings, "QR_CLAIM_KEY_ID", None)
+    return kid if kid in available else next(iter(available))
+
+
+def name_hash(full_name):
+    from certificates.models import normalize_key
+
+    return _b64(hashlib.sha256(normalize_key(full_name).encode()).digest()[:NAME_HASH_BYTES])
+
+
+def claim_for(cert):
+    """The claim for a Certificate (or any object with the same attributes)."""
+    return {
+        "i": cert.unique_id,
+        "t": cert.document_type,
+        "a": _epoch(cert.reissue_date or cert.created_at),
+        "e": _epoch(cert.expiration_date),
+        "n": name_hash(cert.full_name),
+    }
+
+
+def _signature(key, signed):
+    return _b64(hmac.new(key, signed.encode("ascii"), hashlib.sha256).digest()[:SIGNATURE_BYTES])
+
+
+def sign(claim, kid=None):
+    kid = kid or current_key_id()
+    body = _b64(json.dumps(claim, separators=(",", ":"), sort_keys=True).encode())
+    signed = f"{PREFIX}.{kid}.{body}"
+    return f"{signed}.{_signature(keys()[kid], signed)}"
+
+
+def decode(text):
+    """Return the claim in ``text`` after checking its signature; raises InvalidClaim."""
+    try:
+        prefix, kid, body, signature = text.split(".")
+    except (AttributeError, ValueError):
+        raise InvalidClaim("Not a certificate claim.")
+    key = keys().get(kid)
+    if prefix != PREFIX or key is None:
+        raise InvalidClaim("Unknown claim version or key.")
+    if not hmac.compare_digest(signature, _signature(key, f"{prefix}.{kid}.{body}")):
+        raise InvalidClaim("Bad signature.")
+    try:
+        return json.loads(_unb64(body))
+    except ValueError:
+        raise InvalidClaim("Malformed claim.")
+
+
+def verify(text, revocations=None, full_name=None, now=None):
+    """
+    Offline check of a claim. ``revocations`` maps unique_id to the
+    revocation list's ``before`` (Unix seconds, or None for every claim).
+    Returns (claim, outcome) with outcome VALID, EXPIRED, REVOKED or
+    NAME_MISMATCH; raises InvalidClaim for forged or malformed text.
+    """
+    claim = decode(text)
+    now = _epoch(now or timezone.now())
+    revocations = revocations or {}
+    if claim["i"] in revocations:
+        before = revocations[claim["i"]]
+        if before is None or claim["a"] < before:
+            return claim, REVOKED
+    if claim["e"] is not None and claim["e"] < now:
+        return claim, EXPIRED
+    if full_name is not None and not hmac.compare_digest(claim["n"], name_hash(full_name)):
+        return claim, NAME_MISMATCH
+    return claim, VALID
+
+
+def qr_fragment(cert):
+    """URL fragment carrying the certificate's signed claim."""
+    return f"#c={sign(claim_for(cert))}"
+
+
+# -------------------------------------------------
+# REVOCATION LIST
+# -------------------------------------------------
+REVOCATIONS = "revocations"  # DataVersion behind the cached revocation list
+
+
+def revoke(unique_id, before=None, reason="invalidated"):
+    """
+    Revoke claims for ``unique_id`` issued before ``before`` (a datetime),
+    or all of its claims when ``before`` is None.
+    """
+    from certificates import report_cache
+    from certificates.models import ClaimRevocation
+
+    if not unique_id:
+        return
+    before = before.replace(microsecond=0) if before else None
+    values = {"revoked_before": before, "reason": reason, "updated_at": timezone.now()}
+    with transaction.atomic():
+        if not ClaimRevocation.objects.filter(unique_id=unique_id).update(**values):
+            try:
+                with transaction.atomic():
+                    ClaimRevocation.objects.create(unique_id=unique_id, **values)
+            except IntegrityError:
+                ClaimRevocation.objects.filter(unique_id=unique_id).update(**values)
+        report_cache.bump(REVOCATIONS)
+
+
+def revocation_list(since=None):
+    """Revocations changed at or after ``since`` (Unix seconds), oldest change first."""
+    from certificates.models import ClaimRevocation
+
+    rows = ClaimRevocation.objects.order_by("updated_at", "pk")
+    if since:
+        rows = rows.filter(updated_at__gte=datetime.fromtimestamp(since, tz=dt_timezone.utc))
+    return {
+        "generated": _epoch(timezone.now()),
+        "revocations": [
+            {"id": unique_id, "before": _epoch(before), "reason": reason}
+            for unique_id, before, reason in rows.values_list("unique_id", "revoked_before", "reason").iterator()
+        ],
+    }
@@ -0,0 +1,57 @@
+# certificates/expiry.py
+"""
+Expiry sweep: marks certificates whose expiration date has passed as
+lifecycle EXPIRED.
+
+Queries do not depend on the sweep for correctness (see
+CertificateQuerySet.active/expired), but keeping ``lifecycle`` current lets
+the active_certificate_key constraint release expired slots and lets
+``lifecycle=ACTIVE`` filters use certificate_expiry_idx on their own.
+
+Rows are updated BATCH_SIZE at a time, each batch in its own short
+transaction, so a large backlog never holds a long write lock.
+
+Settings:
+    CERTIFICATE_EXPIRY_BATCH_SIZE    rows updated per batch (default 1000)
+
+Run ``manage.py expire_certificates`` from cron (e.g. hourly).
+"""
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from certificates import verification
+from certificates.models import LIFECYCLE_EXPIRED, Certificate
+
+
+def sweep(batch_size=None, now=None, dry_run=False, progress=None):
+    """
+    Mark certificates expired as of ``now`` (default: the current time).
+    Returns {"expired": n, "now": dt}; with ``dry_run``, "expired" is the
+    number due and nothing is written.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or getattr(settings, "CERTIFICATE_EXPIRY_BATCH_SIZE", 1000)
+    due = Certificate.objects.due_for_expiry(now)
+
+    if dry_run:
+        return {"expired": due.count(), "now": now}
+
+    expired = 0
+    while True:
+        rows = list(
+            due.order_by("expiration_date", "pk").values_list("pk", "verification_token", "unique_id")[:batch_size]
+        )
+        if not rows:
+            break
+        with transaction.atomic():
+            # Re-check the condition: a reissue may have extended a row since it was read
+            updated = due.filter(pk__in=[row[0] for row in rows]).update(lifecycle=LIFECYCLE_EXPIRED)
+            # update() sends no signals
+            verification.invalidate_many(row[1:] for row in rows)
+        expired += updated
+        if progress:
+            progress(expired)
+        if len(rows) < batch_size:
+            break
+    return {"expired": expired, "now": now}
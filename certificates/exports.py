@@ -0,0 +1,150 @@
+# certificates/exports.py
+"""
+Streaming CSV and XLSX exports of certificates, reissues and activity logs.
+
+Rows are read with values_list(...).iterator(chunk_size=CHUNK_SIZE), which
+uses a server-side cursor where the database supports one and never
+instantiates model objects, so memory stays flat regardless of row count.
+
+CSV is produced row by row for StreamingHttpResponse. XLSX uses openpyxl's
+write-only mode into a temporary file, which is then streamed back; the
+workbook is never held in memory.
+"""
+import csv
+import tempfile
+from datetime import datetime
+
+from django.utils import timezone
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+from certificates.filters import filter_activity_logs, filter_certificates
+from certificates.models import ActivityLog, Certificate, ReissueLog
+
+CHUNK_SIZE = 2000
+# Text starting with these is read as a formula by spreadsheet applications
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+FORMATS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# dataset -> (title, [(header, values_list field)])
+DATASETS = {
+    "certificates": ("Certificates", [
+        ("ID", "id"),
+        ("Certificate No.", "unique_id"),
+        ("Full Name", "full_name"),
+        ("Address", "address"),
+        ("Age", "age"),
+        ("Occupation", "occupation"),
+        ("Purpose", "purpose"),
+        ("Resident Since", "resident_since"),
+        ("Document Type", "document_type"),
+        ("Status", "status"),
+        ("Created At", "created_at"),
+        ("Expiration Date", "expiration_date"),
+        ("Reissued", "reissued"),
+        ("Reissue Date", "reissue_date"),
+    ]),
+    "reissues": ("Reissues", [
+        ("ID", "id"),
+        ("Certificate No.", "certificate__unique_id"),
+        ("Full Name", "certificate__full_name"),
+        ("Document Type", "certificate__document_type"),
+        ("Reissued By", "reissued_by__username"),
+        ("Reissued At", "reissued_at"),
+        ("Remarks", "remarks"),
+    ]),
+    "activity_logs": ("Activity Logs", [
+        ("ID", "id"),
+        ("Date & Time", "created_at"),
+        ("User", "user__username"),
+        ("Type", "action_type"),
+        ("Action", "action"),
+    ]),
+}
+
+
+def queryset_for(dataset, params):
+    """The dataset's rows with the list page filters applied, newest first."""
+    if dataset == "certificates":
+        return filter_certificates(Certificate.objects.all(), params).order_by("-created_at", "-id")
+    if dataset == "reissues":
+        return filter_certificates(ReissueLog.objects.all(), params, prefix="certificate__").order_by("-reissued_at", "-id")
+    if dataset == "activity_logs":
+        return filter_activity_logs(ActivityLog.objects.all(), params).order_by("-created_at", "-id")
+    raise ValueError(f"Unknown export dataset '{dataset}'.")
+
+
+def _safe_text(value):
+    """
+    Text as a spreadsheet should show it: control characters XLSX cannot
+    store are dropped, and values that would be read as a formula (names,
+    addresses and usernames are user input) are quoted with a leading '.
+    """
+    value = ILLEGAL_CHARACTERS_RE.sub("", value)
+    return f"'{value}" if value.startswith(FORMULA_PREFIXES) else value
+
+
+def _cell(value):
+    # Local time without tzinfo: spreadsheets cannot store timezones
+    if isinstance(value, datetime):
+        return timezone.localtime(value).replace(tzinfo=None) if timezone.is_aware(value) else value
+    if isinstance(value, str):
+        return _safe_text(value)
+    return value
+
+
+def rows(dataset, params, chunk_size=CHUNK_SIZE):
+    """Header row, then one tuple per record, with text made safe for spreadsheets."""
+    _, columns = DATASETS[dataset]
+    yield tuple(header for header, _ in columns)
+    queryset = queryset_for(dataset, params).values_list(*(field for _, field in columns))
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield tuple(_cell(value) for value in row)
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ", timespec="seconds")
+    return value
+
+
+def iter_csv(dataset, params, chunk_size=CHUNK_SIZE):
+    """Encoded CSV lines, starting with a BOM so Excel detects UTF-8."""
+    writer = csv.writer(_Echo())
+    yield "\ufeff".encode("utf-8")
+    for row in rows(dataset, params, chunk_size):
+        yield writer.writerow([_csv_value(value) for value in row]).encode("utf-8")
+
+
+def write_xlsx(dataset, params, target, chunk_size=CHUNK_SIZE):
+    """Write an XLSX workbook to ``target`` (path or binary file) in write-only mode."""
+    title, _ = DATASETS[dataset]
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title)
+    for row in rows(dataset, params, chunk_size):
+        sheet.append(row)
+    workbook.save(target)
+
+
+def xlsx_file(dataset, params):
+    """Temporary file holding the XLSX export, positioned at the start."""
+    tmp = tempfile.TemporaryFile(suffix=".xlsx")
+    write_xlsx(dataset, params, tmp)
+    tmp.seek(0)
+    return tmp
+
+
+def filename(dataset, fmt):
+    return f"{dataset}_{timezone.localdate():%Y%m%d}.{fmt}"
@@ -0,0 +1,109 @@
+# certificates/filters.py
+"""
+Query filters shared by the list views and the exports.
+
+Each function takes a queryset and a mapping of request-style parameters
+(request.GET or a dict built from command options) and returns the filtered
+queryset, so a filtered list and its export always select the same rows.
+"""
+from datetime import date, datetime, time, timedelta
+
+from django.db.models import Case, CharField, Q, Value, When
+from django.utils import timezone
+
+from certificates import search as search_index
+from certificates.models import Certificate
+
+CERTIFICATE_PARAMS = ("search", "document_type", "status", "validity")
+VALIDITIES = ("active", "expired")
+ACTIVITY_PARAMS = ("search", "date", "type")
+LOG_KINDS = ("login", "logout", "failed", "create", "reissue", "other")
+
+
+def _param(params, name):
+    return (params.get(name) or "").strip()
+
+
+def filter_certificates(queryset, params, prefix="", rank=False):
+    """
+    list_certificates filters: ``search`` (full-text over name and address),
+    ``document_type``, ``status`` and ``validity`` ("active" or "expired",
+    see CertificateQuerySet). ``prefix`` applies them through a
+    relation, e.g. "certificate__" for ReissueLog. With ``rank``, searches are
+    ordered by relevance.
+    """
+    search = _param(params, "search")
+    document_type = _param(params, "document_type")
+    status = _param(params, "status")
+    validity = _param(params, "validity").lower()
+
+    if search and prefix:
+        matches = search_index.matching(Certificate.objects.all(), "certificate", search)
+        queryset = queryset.filter(**{f"{prefix}in": matches.values("pk")})
+    elif search:
+        queryset = search_index.matching(queryset, "certificate", search, rank=rank)
+    if document_type:
+        queryset = queryset.filter(**{f"{prefix}document_type__iexact": document_type})
+    if status:
+        queryset = queryset.filter(**{f"{prefix}status__iexact": status})
+    if validity in VALIDITIES:
+        if prefix:
+            queryset = queryset.filter(**{f"{prefix}in": getattr(Certificate.objects, validity)().values("pk")})
+        else:
+            queryset = getattr(queryset, validity)()
+    return queryset
+
+
+def _contains(*words):
+    q = Q()
+    for word in words:
+        q |= Q(action__icontains=word)
+    return q
+
+
+def log_kind():
+    """
+    SQL equivalent of models.classify_action(), used to backfill action_type
+    on logs written before it was set from the action text.
+    """
+    return Case(
+        When(_contains("failed login attempt"), then=Value("failed")),
+        When(_contains("logged out", "logout"), then=Value("logout")),
+        When(_contains("logged in", "login"), then=Value("login")),
+        When(_contains("reissued", "reissue"), then=Value("reissue")),
+        When(_contains("create", "created", "added", "generated", "new"), then=Value("create")),
+        default=Value("other"),
+        output_field=CharField(),
+    )
+
+
+def local_day_range(day):
+    """[start, end) of a local calendar day as aware datetimes, for index range scans."""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    end = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+    return start, end
+
+
+def filter_activity_logs(queryset, params):
+    """
+    activity_logs filters: ``type`` (action_type), ``search`` (a type keyword,
+    or full-text over the action and the user's username/first/last name) and ``date``
+    (YYYY-MM-DD, local time).
+    """
+    search = _param(params, "search").lower()
+    log_type = _param(params, "type").lower()
+    day = _param(params, "date")
+
+    if log_type:
+        queryset = queryset.filter(action_type=log_type)
+    if search in LOG_KINDS:
+        queryset = queryset.filter(action_type=search)
+    elif search:
+        queryset = search_index.matching(queryset, "activity_log", search)
+    if day:
+        try:
+            start, end = local_day_range(date.fromisoformat(day))
+        except ValueError:
+            return queryset.none()
+        queryset = queryset.filter(created_at__gte=start, created_at__lt=end)
+    return queryset
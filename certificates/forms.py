@@ -3,6 +3,7 @@ from django.utils import timezone
 from .models import Certificate, AdminSignature, CertificateTemplate
 from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
+from .signatures import store_derivative
 
 
 class CertificateForm(forms.ModelForm):
@@ -51,37 +52,8 @@ class CertificateForm(forms.ModelForm):
                 )
         return address
 
-    def clean(self):
-        cleaned_data = super().clean()
-        full_name = cleaned_data.get("full_name")
-        doc_type = cleaned_data.get("document_type")
-        purpose = cleaned_data.get("purpose")
-
-        if full_name and doc_type and purpose:
-            existing = Certificate.objects.filter(
-                full_name__iexact=full_name.strip(),
-                document_type=doc_type,
-                purpose__iexact=purpose.strip(),
-            ).exclude(pk=self.instance.pk)
-
-            conflict = next(
-                (
-                    cert for cert in existing
-                    if not cert.is_expired() and cert.status in ["PENDING", "COMPLETED"]
-                ),
-                None
-            )
-
-            if conflict:
-                self.add_error(
-                    None,
-                    f"A {conflict.get_document_type_display()} certificate for '{full_name}' "
-                    f"with purpose '{purpose}' already exists and is still active until "
-                    f"{conflict.expiration_date.strftime('%B %d, %Y')}."
-                )
-                raise forms.ValidationError("Duplicate certificate detected.")
-
-        return cleaned_data
+    # Duplicate active certificates are rejected by Certificate.clean(), which
+    # ModelForm validation runs after the field checks (one indexed query).
 
 
 class OCRUploadForm(forms.Form):
@@ -155,6 +127,15 @@ class DigitalSignatureForm(forms.ModelForm):
 
         return signature_image
 
+    def save(self, commit=True):
+        signature_image = self.cleaned_data.get("signature_image")
+        if isinstance(signature_image, UploadedFile):
+            # Prepare the image embedded in certificates once, at upload time
+            signature_image.seek(0)
+            store_derivative(self.instance.signature_derivative, signature_image)
+            signature_image.seek(0)
+        return super().save(commit=commit)
+
 
 
 class CertificateTemplateForm(forms.ModelForm):
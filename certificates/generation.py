@@ -0,0 +1,227 @@
+# certificates/generation.py
+"""
+Certificate document generation, independent of the HTTP request.
+
+Used by the generation job worker (see jobs.py) and, when background jobs are
+disabled, directly from the generate_certificate view.
+"""
+import io
+from pathlib import Path
+
+from django.conf import settings
+from docxtpl import InlineImage
+from docx.shared import Mm
+
+from certificates import artifact_store, claims, pdf_engine, qr_service, signatures, template_registry
+from certificates.instrumentation import generation, stage
+from certificates.pdf_conversion import convert_docx_to_pdf
+from certificates.utils import _ensure_dirs
+
+
+class GenerationError(Exception):
+    """Raised when a certificate cannot be generated (e.g. missing template)."""
+
+
+def resolve_signature_path(user):
+    """
+    Return the prepared signature image to embed for the given admin user, or
+    None. Falls back to MEDIA_ROOT/signatures/default_signature.png.
+    """
+    return signatures.get_signature_path(user)
+
+
+def build_verify_url(cert, base_url=None):
+    """
+    Absolute verification URL for a certificate (the QR code payload). With
+    QR_SIGNED_CLAIMS, its fragment carries the signed claim (see claims.py).
+    """
+    base_url = (base_url or getattr(settings, "SITE_URL", "")).rstrip("/")
+    url = f"{base_url}/certificates/verify/{cert.verification_token}/"
+    if claims.enabled() and cert.unique_id:
+        url += claims.qr_fragment(cert)
+    return url
+
+
+def certificate_values(cert):
+    """Plain text values shared by the DOCX templates and the PDF layouts."""
+    return {
+        "full_name": cert.full_name,
+        "age": cert.age or "",
+        "address": cert.address or "",
+        "occupation": cert.occupation or "",
+        "purpose": cert.purpose or "",
+        "resident_since": cert.resident_since or "",
+        "date_issued": cert.created_at.strftime("%B %d, %Y") if cert.created_at else "",
+        "date_reissued": cert.reissue_date.strftime("%B %d, %Y") if cert.reissue_date else None,
+        "unique_id": cert.unique_id or "",
+        "barangay": "Longos",
+        "barangay_upper": "LONGOS",
+        "city": "Malabon City",
+        "captain": "Maria Lourdes Casareo",
+        "postal": "1472",
+    }
+
+
+def build_context(cert, doc, signature, qr_image):
+    """
+    Template context shared by all certificate templates.
+    ``signature`` and ``qr_image`` are image paths or file-like objects
+    (``signature`` may be None).
+    """
+    signature_inline = None
+    if signature:
+        if isinstance(signature, Path):
+            signature = str(signature)
+        signature_inline = InlineImage(doc, signature, width=Mm(40), height=Mm(12))
+
+    context = {"cert": cert, **certificate_values(cert)}
+    context.update({
+        "signature": signature_inline,
+        "captain_signature": signature_inline,
+        "qr_code": InlineImage(doc, qr_image, width=Mm(30)),
+    })
+    return context
+
+
+def _signature_digest(signature):
+    if signature is None:
+        return None
+    if isinstance(signature, (bytes, bytearray)):
+        return artifact_store.bytes_digest(signature)
+    return artifact_store.file_digest(signature)
+
+
+def docx_artifact_name(cert, verify_url, signature=None):
+    """
+    Content-addressed name of the DOCX for these inputs, or None if the
+    template is missing.
+    """
+    template_version = template_registry.get_template_version(cert.document_type)
+    if template_version is None:
+        return None
+    key = artifact_store.artifact_key(
+        kind="docx",
+        document_type=cert.document_type,
+        template=template_version,
+        values=certificate_values(cert),
+        signature=_signature_digest(signature),
+        qr=verify_url,
+    )
+    return artifact_store.artifact_name("docx", key, "docx")
+
+
+def render_certificate_docx(cert, verify_url, signature=None, force=False):
+    """
+    Render the DOCX for a certificate to MEDIA_ROOT without touching the
+    database. Returns the generated file's name relative to MEDIA_ROOT.
+
+    ``signature`` is an image path or raw image bytes (or None). Nothing is
+    rendered when an artifact for identical inputs already exists, unless
+    ``force`` is set (used for profiling).
+    """
+    with generation("docx", certificate=cert.pk, document_type=cert.document_type):
+        with stage("template_lookup"):
+            docx_name = docx_artifact_name(cert, verify_url, signature)
+        if docx_name is None:
+            raise GenerationError(f"Template file missing for '{cert.document_type}'.")
+        if artifact_store.exists(docx_name) and not force:
+            return docx_name
+
+        with stage("template_load"):
+            doc = template_registry.get_template(cert.document_type)
+        if doc is None:
+            raise GenerationError(f"Template file missing for '{cert.document_type}'.")
+
+        # ---------------- Render and save document ----------------
+        with stage("qr"):
+            qr_image = io.BytesIO(qr_service.get_qr(verify_url))
+        with stage("signature"):
+            if isinstance(signature, (bytes, bytearray)):
+                signature = io.BytesIO(signature)
+            context = build_context(cert, doc, signature, qr_image)
+        with stage("render"):
+            doc.render(context)
+        with stage("save"):
+            return artifact_store.write(docx_name, writer=lambda tmp_path: doc.save(tmp_path))
+
+
+def generate_certificate_docx(cert, user, verify_url):
+    """
+    Render the DOCX for a certificate and mark it COMPLETED.
+
+    ``user`` is the admin whose signature is embedded; ``verify_url`` is the
+    absolute verification URL encoded in the QR code.
+    """
+    _ensure_dirs()
+
+    with generation("docx", certificate=cert.pk, document_type=cert.document_type):
+        with stage("signature_lookup"):
+            signature = resolve_signature_path(user)
+        docx_name = render_certificate_docx(cert, verify_url, signature)
+        with stage("model_update"):
+            if docx_name != cert.generated_docx.name:
+                cert.generated_pdf = None  # stale until converted again
+            cert.generated_docx.name = docx_name
+            cert.status = "COMPLETED"
+            cert.save(update_fields=["generated_docx", "generated_pdf", "status"])
+    return cert
+
+
+def is_up_to_date(cert, user, verify_url):
+    """True if the stored DOCX already matches what a new generation would produce."""
+    if cert.status != "COMPLETED" or not cert.generated_docx:
+        return False
+    expected = docx_artifact_name(cert, verify_url, resolve_signature_path(user))
+    return expected == cert.generated_docx.name and artifact_store.exists(expected)
+
+
+def render_certificate_pdf(cert, user=None, verify_url=None):
+    """Render a certificate straight to PDF bytes with the native engine."""
+    verify_url = verify_url or build_verify_url(cert)
+    with generation("pdf", certificate=cert.pk, document_type=cert.document_type):
+        with stage("signature_lookup"):
+            signature = resolve_signature_path(user) if user else None
+        with stage("render"):
+            return pdf_engine.render_certificate_pdf(cert, certificate_values(cert), verify_url, signature)
+
+
+def generate_certificate_pdf(cert, user=None, verify_url=None):
+    """
+    Produce the certificate PDF and store it in generated_pdf.
+
+    With CERTIFICATE_PDF_BACKEND = "reportlab" the PDF is drawn natively from
+    the layout in pdf_layouts.py; otherwise the generated DOCX is converted
+    through the converter pool. Existing artifacts for identical inputs are
+    reused.
+    """
+    with generation("pdf", certificate=cert.pk, document_type=cert.document_type):
+        if getattr(settings, "CERTIFICATE_PDF_BACKEND", "") == "reportlab":
+            verify_url = verify_url or build_verify_url(cert)
+            with stage("template_lookup"):
+                key = artifact_store.artifact_key(
+                    kind="pdf",
+                    document_type=cert.document_type,
+                    layout=pdf_engine.layout_version(cert.document_type),
+                    values=certificate_values(cert),
+                    signature=_signature_digest(resolve_signature_path(user) if user else None),
+                    qr=verify_url,
+                )
+                pdf_name = artifact_store.artifact_name("pdf", key, "pdf")
+            if not artifact_store.exists(pdf_name):
+                pdf_bytes = render_certificate_pdf(cert, user, verify_url)
+                with stage("save"):
+                    artifact_store.write(pdf_name, data=pdf_bytes)
+        else:
+            if not cert.generated_docx:
+                raise GenerationError("Generate the DOCX before converting it to PDF.")
+            # The DOCX name is already a content hash; the PDF shares it
+            docx_path = Path(cert.generated_docx.path)
+            pdf_name = artifact_store.artifact_name("pdf", docx_path.stem, "pdf")
+            if not artifact_store.exists(pdf_name):
+                with stage("convert"):
+                    artifact_store.write(pdf_name, writer=lambda tmp_path: convert_docx_to_pdf(docx_path, tmp_path))
+
+        with stage("model_update"):
+            cert.generated_pdf.name = pdf_name
+            cert.save(update_fields=["generated_pdf"])
+    return cert
@@ -0,0 +1,160 @@
+# certificates/instrumentation.py
+"""
+Per-stage timing and memory measurements for certificate generation.
+
+Generation code wraps its steps in ``stage("name")`` inside a
+``generation("docx")`` block. Each stage records wall time and, while
+tracemalloc is tracing, the peak memory allocated during the stage. Results
+go into a rolling window of the last WINDOW_SIZE samples per stage, kept per
+process, from which ``snapshot()`` reports percentiles and a histogram.
+
+Settings:
+    CERTIFICATE_PROFILING               record stage timings (default True)
+    CERTIFICATE_PROFILE_MEMORY          start tracemalloc in this process (default False)
+    CERTIFICATE_SLOW_GENERATION_MS      log generations slower than this as JSON
+                                        to the "certificates.generation" logger
+                                        (default None, disabled)
+
+tracemalloc peaks are process-wide, so with concurrent generations in one
+process they are an upper bound for each stage.
+"""
+import json
+import logging
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger("certificates.generation")
+
+WINDOW_SIZE = 500
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_lock = threading.Lock()
+_local = threading.local()
+_samples = defaultdict(lambda: deque(maxlen=WINDOW_SIZE))  # stage -> deque of (ms, peak bytes or None)
+
+
+def enabled():
+    return getattr(settings, "CERTIFICATE_PROFILING", True)
+
+
+def _ensure_tracing():
+    if getattr(settings, "CERTIFICATE_PROFILE_MEMORY", False) and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def _record(name, elapsed_ms, peak):
+    with _lock:
+        _samples[name].append((elapsed_ms, peak))
+
+
+@contextmanager
+def generation(kind, **fields):
+    """
+    Measure one generation of ``kind`` ("docx", "pdf", ...). Stages inside the
+    block are attributed to it; ``fields`` are included in the slow log. A
+    nested block joins the enclosing generation.
+    """
+    if not enabled():
+        yield None
+        return
+
+    outer = getattr(_local, "trace", None)
+    if outer is not None:
+        # Nested call (e.g. render_certificate_docx inside generate_certificate_docx)
+        outer.update(fields)
+        yield outer
+        return
+
+    _ensure_tracing()
+    trace = {"kind": kind, "stages": {}, **fields}
+    _local.trace = trace
+    start = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        _local.trace = None
+        total_ms = (time.perf_counter() - start) * 1000
+        _record(f"{kind}.total", total_ms, None)
+
+        threshold = getattr(settings, "CERTIFICATE_SLOW_GENERATION_MS", None)
+        if threshold is not None and total_ms >= threshold:
+            trace["total_ms"] = round(total_ms, 2)
+            logger.warning(json.dumps({"event": "slow_generation", **trace}, default=str))
+
+
+@contextmanager
+def stage(name):
+    """Measure one stage; recorded as "<kind>.<name>" inside a generation block."""
+    trace = getattr(_local, "trace", None) if enabled() else None
+    if trace is None:
+        yield
+        return
+
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        peak = tracemalloc.get_traced_memory()[1] - baseline if tracing else None
+        _record(f"{trace['kind']}.{name}", elapsed_ms, peak)
+        trace["stages"][name] = {"ms": round(elapsed_ms, 2), "peak_kb": round(peak / 1024, 1) if peak is not None else None}
+
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _summarize(samples):
+    times = sorted(ms for ms, _ in samples)
+    peaks = sorted(peak for _, peak in samples if peak is not None)
+
+    counts = [0] * (len(BUCKETS_MS) + 1)
+    for ms in times:
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    labels = [f"<={b}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+
+    return {
+        "count": len(times),
+        "mean_ms": round(sum(times) / len(times), 2),
+        "p50_ms": round(_percentile(times, 50), 2),
+        "p95_ms": round(_percentile(times, 95), 2),
+        "p99_ms": round(_percentile(times, 99), 2),
+        "max_ms": round(times[-1], 2),
+        "peak_kb_p95": round(_percentile(peaks, 95) / 1024, 1) if peaks else None,
+        "peak_kb_max": round(peaks[-1] / 1024, 1) if peaks else None,
+        "histogram": {label: n for label, n in zip(labels, counts) if n},
+    }
+
+
+def snapshot():
+    """Summary of the rolling window for every stage seen in this process."""
+    with _lock:
+        samples = {name: list(values) for name, values in _samples.items() if values}
+    return {
+        "window": WINDOW_SIZE,
+        "memory_tracing": tracemalloc.is_tracing(),
+        "stages": {name: _summarize(values) for name, values in sorted(samples.items())},
+    }
+
+
+def reset():
+    with _lock:
+        _samples.clear()
@@ -0,0 +1,155 @@
+# certificates/jobs.py
+"""
+Database-backed queue for certificate generation.
+
+Views enqueue a GenerationJob and return immediately; the
+``manage.py certificate_worker`` command claims jobs with a time-limited lease,
+runs them and retries failures with exponential backoff. A job whose worker
+died is picked up again once its lease expires.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from certificates import audit
+from certificates.generation import generate_certificate_docx, generate_certificate_pdf
+from certificates.models import GenerationJob
+from certificates.pdf_conversion import pdf_enabled
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEASE_SECONDS = 120
+DEFAULT_RETRY_DELAY_SECONDS = 10
+
+
+def _lease_seconds():
+    return getattr(settings, "CERTIFICATE_JOB_LEASE_SECONDS", DEFAULT_LEASE_SECONDS)
+
+
+def enqueue_generation(cert, user=None, verify_url="", skip_log=False):
+    """
+    Queue a generation job for a certificate.
+    Returns the already pending job instead if one exists (e.g. double clicks).
+    """
+    pending = cert.generation_jobs.filter(
+        status__in=[GenerationJob.STATUS_QUEUED, GenerationJob.STATUS_RUNNING]
+    ).order_by("-created_at").first()
+    if pending:
+        return pending
+
+    return GenerationJob.objects.create(
+        certificate=cert,
+        requested_by=user,
+        verify_url=verify_url,
+        skip_log=skip_log,
+        max_attempts=getattr(settings, "CERTIFICATE_JOB_MAX_ATTEMPTS", 3),
+    )
+
+
+def _claimable(now):
+    """Queued jobs that are due, plus running jobs whose lease has expired."""
+    return Q(status=GenerationJob.STATUS_QUEUED, available_at__lte=now) | Q(
+        status=GenerationJob.STATUS_RUNNING,
+        lease_expires_at__lt=now,
+        attempts__lt=F("max_attempts"),
+    )
+
+
+def reap_expired_jobs():
+    """Fail running jobs whose lease expired after their last allowed attempt."""
+    return GenerationJob.objects.filter(
+        status=GenerationJob.STATUS_RUNNING,
+        lease_expires_at__lt=timezone.now(),
+        attempts__gte=F("max_attempts"),
+    ).update(
+        status=GenerationJob.STATUS_FAILED,
+        last_error="Lease expired before the job finished.",
+        finished_at=timezone.now(),
+    )
+
+
+def claim_next_job(worker_id, lease_seconds=None):
+    """
+    Atomically lease the next runnable job for ``worker_id``.
+    Uses a conditional UPDATE so concurrent workers never claim the same job.
+    """
+    lease_seconds = lease_seconds or _lease_seconds()
+    now = timezone.now()
+    candidates = list(
+        GenerationJob.objects.filter(_claimable(now))
+        .order_by("available_at", "pk")
+        .values_list("pk", flat=True)[:10]
+    )
+    for pk in candidates:
+        claimed = GenerationJob.objects.filter(_claimable(now), pk=pk).update(
+            status=GenerationJob.STATUS_RUNNING,
+            attempts=F("attempts") + 1,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            locked_by=worker_id,
+        )
+        if claimed:
+            return GenerationJob.objects.select_related("certificate", "requested_by").get(pk=pk)
+    return None
+
+
+def run_job(job):
+    """
+    Execute a claimed job. Returns True on success.
+    Failures are rescheduled until max_attempts is reached.
+    """
+    cert = job.certificate
+    try:
+        generate_certificate_docx(cert, job.requested_by, job.verify_url)
+    except Exception as e:
+        logger.warning(f"Generation job {job.pk} failed (attempt {job.attempts}): {e}", exc_info=True)
+        job.last_error = str(e)
+        job.lease_expires_at = None
+        if job.attempts >= job.max_attempts:
+            job.status = GenerationJob.STATUS_FAILED
+            job.finished_at = timezone.now()
+        else:
+            delay = DEFAULT_RETRY_DELAY_SECONDS * (2 ** (job.attempts - 1))
+            job.status = GenerationJob.STATUS_QUEUED
+            job.available_at = timezone.now() + timedelta(seconds=delay)
+        job.save(update_fields=["status", "last_error", "lease_expires_at", "available_at", "finished_at"])
+        return False
+
+    # ---------------- PDF (optional, never fails the job) ----------------
+    pdf_error = ""
+    if pdf_enabled():
+        try:
+            generate_certificate_pdf(cert, job.requested_by, job.verify_url)
+        except Exception as e:
+            logger.warning(f"PDF conversion for certificate {cert.pk} failed: {e}")
+            pdf_error = f"PDF conversion failed: {e}"
+
+    job.status = GenerationJob.STATUS_DONE
+    job.last_error = pdf_error
+    job.lease_expires_at = None
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "last_error", "lease_expires_at", "finished_at"])
+
+    # ---------------- Log activity ----------------
+    if not job.skip_log:
+        try:
+            audit.log(job.requested_by, f"Created certificate {cert.id} - {cert.full_name}")
+        except Exception:
+            logger.exception("Could not log generation of certificate %s", cert.pk)
+    return True
+
+
+def run_inline(job, worker_id="inline"):
+    """Claim and run a job in the current process (used when async is disabled)."""
+    updated = GenerationJob.objects.filter(pk=job.pk, status=GenerationJob.STATUS_QUEUED).update(
+        status=GenerationJob.STATUS_RUNNING,
+        attempts=F("attempts") + 1,
+        lease_expires_at=timezone.now() + timedelta(seconds=_lease_seconds()),
+        locked_by=worker_id,
+    )
+    if not updated:
+        return False
+    job.refresh_from_db()
+    return run_job(job)
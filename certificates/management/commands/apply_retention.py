@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from certificates import retention
+
+
+class Command(BaseCommand):
+    help = "Archive rows past their retention period to compressed JSONL files, then delete them."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "policies", nargs="*", metavar="policy",
+            help=f"Policies to apply (default: all). Available: {', '.join(sorted(retention.POLICIES))}.",
+        )
+        parser.add_argument("--days", type=int, help="Keep this many days instead of the configured retention.")
+        parser.add_argument("--batch-size", type=int, help="Rows archived and deleted per batch.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many rows are due.")
+
+    def handle(self, *args, **options):
+        names = options["policies"] or sorted(retention.POLICIES)
+        unknown = [name for name in names if name not in retention.POLICIES]
+        if unknown:
+            raise CommandError(f"Unknown retention policy: {', '.join(unknown)}.")
+        if options["days"] is not None and options["days"] < 0:
+            raise CommandError("--days must not be negative.")
+        if options["batch_size"] is not None and options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        for name in names:
+            result = retention.apply(
+                retention.POLICIES[name],
+                days=options["days"],
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+            )
+            cutoff = result["cutoff"].strftime("%Y-%m-%d %H:%M")
+            if options["dry_run"]:
+                self.stdout.write(f"{name}: {result['archived']} rows older than {cutoff} would be archived.")
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{name}: archived {result['archived']} and deleted {result['deleted']} rows older than {cutoff}."
+                ))
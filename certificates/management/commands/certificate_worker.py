@@ -0,0 +1,75 @@
+import os
+import signal
+import socket
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from certificates import jobs
+
+
+class Command(BaseCommand):
+    help = "Process queued certificate generation jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=2, help="Number of jobs processed in parallel.")
+        parser.add_argument("--lease-seconds", type=int, default=None, help="How long a claimed job is reserved.")
+        parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds to sleep when the queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Drain the queue once and exit.")
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options["concurrency"])
+        self.lease_seconds = options["lease_seconds"]
+        self.poll_interval = options["poll_interval"]
+        self.once = options["once"]
+        self.stopping = threading.Event()
+        self.processed = 0
+        self.failed = 0
+        self.counter_lock = threading.Lock()
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        base_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stdout.write(f"Certificate worker {base_id} started with concurrency {concurrency}.")
+
+        threads = [
+            threading.Thread(target=self._loop, args=(f"{base_id}:{i}",), daemon=True)
+            for i in range(concurrency)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            while t.is_alive():
+                t.join(timeout=0.5)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Certificate worker stopped. Processed: {self.processed}, failed: {self.failed}."
+        ))
+
+    def _stop(self, signum, frame):
+        self.stdout.write("Stopping after current jobs finish...")
+        self.stopping.set()
+
+    def _loop(self, worker_id):
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                jobs.reap_expired_jobs()
+                job = jobs.claim_next_job(worker_id, lease_seconds=self.lease_seconds)
+                if job is None:
+                    if self.once:
+                        break
+                    self.stopping.wait(self.poll_interval)
+                    continue
+
+                ok = jobs.run_job(job)
+                with self.counter_lock:
+                    self.processed += 1
+                    if not ok:
+                        self.failed += 1
+                status = "done" if ok else f"failed ({job.last_error})"
+                self.stdout.write(f"[{worker_id}] job {job.pk} for certificate {job.certificate_id}: {status}")
+        finally:
+            connection.close()
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from certificates import expiry
+
+
+class Command(BaseCommand):
+    help = "Mark certificates past their expiration date as expired, in bounded batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, help="Certificates updated per batch.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many certificates are due.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] is not None and options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        result = expiry.sweep(
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+            progress=self._progress if options["verbosity"] > 1 else None,
+        )
+        now = timezone.localtime(result["now"]).strftime("%Y-%m-%d %H:%M")
+        if options["dry_run"]:
+            self.stdout.write(f"{result['expired']} certificates expired before {now} would be marked.")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Marked {result['expired']} certificates expired before {now}."))
+
+    def _progress(self, expired):
+        self.stdout.write(f"  {expired} marked so far")
@@ -0,0 +1,52 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from certificates import exports
+
+
+class Command(BaseCommand):
+    help = "Export certificates, reissues or activity logs to CSV or XLSX without loading them into memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=sorted(exports.DATASETS))
+        parser.add_argument("--format", dest="fmt", choices=sorted(exports.FORMATS), default="csv")
+        parser.add_argument("--output", "-o", help="File to write (default: stdout for CSV).")
+        parser.add_argument("--search", default="")
+        parser.add_argument("--document-type", default="")
+        parser.add_argument("--status", default="")
+        parser.add_argument("--validity", default="", help="Certificate validity (active or expired).")
+        parser.add_argument("--type", dest="log_type", default="", help="Activity log type (login, failed, ...).")
+        parser.add_argument("--date", default="", help="Activity log local date (YYYY-MM-DD).")
+        parser.add_argument("--chunk-size", type=int, default=exports.CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        dataset, fmt, output = options["dataset"], options["fmt"], options["output"]
+        if fmt == "xlsx" and not output:
+            raise CommandError("--output is required for XLSX exports.")
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+
+        params = {
+            "search": options["search"],
+            "document_type": options["document_type"],
+            "status": options["status"],
+            "validity": options["validity"],
+            "type": options["log_type"],
+            "date": options["date"],
+        }
+        chunk_size = options["chunk_size"]
+
+        if fmt == "xlsx":
+            exports.write_xlsx(dataset, params, output, chunk_size)
+        elif output:
+            with open(output, "wb") as handle:
+                for chunk in exports.iter_csv(dataset, params, chunk_size):
+                    handle.write(chunk)
+        else:
+            for chunk in exports.iter_csv(dataset, params, chunk_size):
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.flush()
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"Exported {dataset} to {output}."))
@@ -0,0 +1,80 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from certificates import batch
+from certificates.models import Certificate
+
+
+class Command(BaseCommand):
+    help = "Generate (or regenerate) certificate DOCX files in bulk across a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ids", help="Comma-separated certificate IDs.")
+        parser.add_argument(
+            "--filter", action="append", default=[], metavar="FIELD=VALUE",
+            help="Queryset filter, repeatable (e.g. --filter document_type=clearance --filter status=COMPLETED).",
+        )
+        parser.add_argument("--all", action="store_true", help="Regenerate every certificate.")
+        parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
+        parser.add_argument("--chunk-size", type=int, default=batch.DEFAULT_CHUNK_SIZE)
+        parser.add_argument("--signed-by", help="Username of the admin whose signature is embedded.")
+        parser.add_argument("--base-url", help="Base URL for QR verification links (default: SITE_URL).")
+
+    def handle(self, *args, **options):
+        queryset = self._build_queryset(options)
+
+        user = None
+        if options["signed_by"]:
+            try:
+                user = User.objects.get(username=options["signed_by"])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['signed_by']}' does not exist.")
+
+        total = queryset.count()
+        if not total:
+            self.stdout.write("No certificates matched.")
+            return
+        self.stdout.write(f"Generating {total} certificates...")
+
+        step = max(1, total // 20)
+
+        def progress(done, total, result):
+            if done % step == 0 or done == total:
+                self.stdout.write(f"  {done}/{total} processed, {result.failed} failed")
+
+        result = batch.generate_certificates(
+            queryset,
+            user=user,
+            base_url=options["base_url"],
+            workers=options["workers"],
+            chunk_size=options["chunk_size"],
+            progress=progress,
+        )
+
+        for pk, error in sorted(result.failures.items()):
+            self.stderr.write(f"  Certificate {pk}: {error}")
+        style = self.style.SUCCESS if not result.failed else self.style.WARNING
+        self.stdout.write(style(f"Done. Generated: {result.succeeded}, failed: {result.failed}."))
+
+    def _build_queryset(self, options):
+        if not (options["ids"] or options["filter"] or options["all"]):
+            raise CommandError("Specify --ids, --filter or --all.")
+
+        queryset = Certificate.objects.all()
+        if options["ids"]:
+            try:
+                ids = [int(i) for i in options["ids"].split(",") if i.strip()]
+            except ValueError:
+                raise CommandError("--ids must be a comma-separated list of integers.")
+            queryset = queryset.filter(pk__in=ids)
+
+        filters = {}
+        for item in options["filter"]:
+            if "=" not in item:
+                raise CommandError(f"Invalid filter '{item}', expected FIELD=VALUE.")
+            key, value = item.split("=", 1)
+            filters[key.strip()] = value.strip()
+        try:
+            return queryset.filter(**filters)
+        except Exception as e:
+            raise CommandError(f"Invalid filter: {e}")
@@ -0,0 +1,83 @@
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from certificates import instrumentation
+from certificates.generation import (
+    build_verify_url, render_certificate_docx, render_certificate_pdf, resolve_signature_path,
+)
+from certificates.models import Certificate
+
+
+class Command(BaseCommand):
+    help = (
+        "Profile certificate generation stage by stage (wall time and tracemalloc peak) "
+        "by rendering sample certificates in this process, then print the per-stage summary."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ids", help="Comma-separated certificate IDs (default: the latest per document type).")
+        parser.add_argument("--repeat", type=int, default=20, help="Renders per certificate (default 20).")
+        parser.add_argument("--pdf", action="store_true", help="Also render native PDFs.")
+        parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc (faster, timings only).")
+        parser.add_argument("--signed-by", help="Username of the admin whose signature is embedded.")
+        parser.add_argument("--json", action="store_true", help="Print the summary as JSON.")
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1.")
+        settings.CERTIFICATE_PROFILING = True
+        settings.CERTIFICATE_PROFILE_MEMORY = not options["no_memory"]
+
+        user = None
+        if options["signed_by"]:
+            try:
+                user = User.objects.get(username=options["signed_by"])
+            except User.DoesNotExist:
+                raise CommandError(f"User '{options['signed_by']}' does not exist.")
+        signature = resolve_signature_path(user) if user else None
+
+        certificates = self._certificates(options["ids"])
+        if not certificates:
+            raise CommandError("No certificates to profile.")
+
+        instrumentation.reset()
+        for cert in certificates:
+            verify_url = build_verify_url(cert)
+            try:
+                for _ in range(options["repeat"]):
+                    render_certificate_docx(cert, verify_url, signature, force=True)
+                    if options["pdf"]:
+                        render_certificate_pdf(cert, user, verify_url)
+            except Exception as e:
+                self.stderr.write(f"  Certificate {cert.pk} skipped: {e}")
+
+        data = instrumentation.snapshot()
+        if options["json"]:
+            self.stdout.write(json.dumps(data, indent=2))
+            return
+
+        self.stdout.write(f"{'stage':<26}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}{'peak KB':>10}")
+        for name, summary in data["stages"].items():
+            peak = summary["peak_kb_max"] if summary["peak_kb_max"] is not None else "-"
+            self.stdout.write(
+                f"{name:<26}{summary['count']:>7}{summary['p50_ms']:>10}{summary['p95_ms']:>10}"
+                f"{summary['p99_ms']:>10}{summary['max_ms']:>10}{peak:>10}"
+            )
+
+    def _certificates(self, ids):
+        if ids:
+            try:
+                pks = [int(i) for i in ids.split(",") if i.strip()]
+            except ValueError:
+                raise CommandError("--ids must be a comma-separated list of integers.")
+            return list(Certificate.objects.filter(pk__in=pks))
+
+        certificates = []
+        for document_type in Certificate.objects.values_list("document_type", flat=True).distinct():
+            latest = Certificate.objects.filter(document_type=document_type).order_by("-created_at").first()
+            if latest:
+                certificates.append(latest)
+        return certificates
@@ -0,0 +1,26 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from certificates import statistics
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily certificate statistics used by the dashboard and reports."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="start", help="First local date to rebuild (YYYY-MM-DD).")
+        parser.add_argument("--to", dest="end", help="Last local date to rebuild (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options["start"]) if options["start"] else None
+            end = date.fromisoformat(options["end"]) if options["end"] else None
+        except ValueError:
+            raise CommandError("Dates must be in YYYY-MM-DD format.")
+        if start and end and start > end:
+            raise CommandError("--from must not be after --to.")
+
+        rows = statistics.rebuild(start, end)
+        scope = f" for {start or 'the beginning'} to {end or 'today'}" if start or end else ""
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} statistics rows{scope}."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from certificates import search
+
+
+class Command(BaseCommand):
+    help = "Repopulate the full-text search indexes for certificates and activity logs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kinds", nargs="*", choices=sorted(search.KINDS), metavar="kind",
+                            help=f"Indexes to rebuild (default: all). Available: {', '.join(sorted(search.KINDS))}.")
+
+    def handle(self, *args, **options):
+        if search.get_backend() is None:
+            self.stdout.write("This database has no search index; searches use icontains.")
+            return
+        search.install()
+        counts = search.rebuild(options["kinds"] or None)
+        for kind, rows in counts.items():
+            self.stdout.write(self.style.SUCCESS(f"Indexed {rows} {kind} rows."))
@@ -0,0 +1,59 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import runner
+from benchmarks.scenarios import by_name
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a separate benchmark database at the given scale and time the hot paths "
+        "(generation, reports, dashboard, listing, activity logs, verification). Prints JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", default="1k", help="1k, 10k, 100k, 1m or a number of certificates (default 1k).")
+        parser.add_argument(
+            "--scenario", action="append", default=[],
+            help=f"Scenario to run, repeatable (default: all). Available: {', '.join(by_name())}.",
+        )
+        parser.add_argument("--iterations", type=int, help="Override the per-scenario iteration count.")
+        parser.add_argument("--keepdb", action="store_true", help="Keep the seeded benchmark database for later runs.")
+        parser.add_argument("--seed", type=int, default=1, help="Random seed for the synthetic data.")
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+        parser.add_argument("--compare", metavar="BASELINE", help="Print changes against a previous JSON report.")
+
+    def handle(self, *args, **options):
+        unknown = set(options["scenario"]) - set(by_name())
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(sorted(unknown))}.")
+        if options["iterations"] is not None and options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1.")
+        baseline = runner.load(options["compare"]) if options["compare"] else None
+
+        try:
+            report = runner.run(
+                options["scale"],
+                names=options["scenario"] or None,
+                iterations=options["iterations"],
+                keepdb=options["keepdb"],
+                seed_value=options["seed"],
+                log=lambda msg: self.stderr.write(msg),
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                f.write(output + "\n")
+            self.stderr.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+        if baseline:
+            self.stderr.write(f"\nAgainst {options['compare']} (commit {baseline.get('meta', {}).get('commit')}):")
+            for name, metric, old, new, change in runner.compare(report, baseline):
+                sign = "+" if change and change > 0 else ""
+                self.stderr.write(f"  {name:<28}{metric:<14}{old:>10} -> {new:<10} {sign}{change}%")
@@ -0,0 +1,51 @@
+import json
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from certificates import retention
+
+
+class Command(BaseCommand):
+    help = "Search rows archived by apply_retention."
+
+    def add_arguments(self, parser):
+        parser.add_argument("policy", choices=sorted(retention.POLICIES))
+        parser.add_argument("--from", dest="start", help="First local date to search (YYYY-MM-DD).")
+        parser.add_argument("--to", dest="end", help="Last local date to search (YYYY-MM-DD).")
+        parser.add_argument("--contains", default="", help="Case-insensitive text any field must contain.")
+        parser.add_argument(
+            "--field", action="append", default=[], metavar="NAME=VALUE",
+            help="Exact field match, e.g. --field action_type=failed. Repeatable.",
+        )
+        parser.add_argument("--limit", type=int, default=100, help="Stop after this many matches (0 for all).")
+        parser.add_argument("--manifest", action="store_true", help="Print the archive manifest instead.")
+
+    def handle(self, *args, **options):
+        policy = retention.POLICIES[options["policy"]]
+        if options["manifest"]:
+            self.stdout.write(json.dumps(retention.load_manifest(policy), indent=2))
+            return
+
+        try:
+            start = date.fromisoformat(options["start"]) if options["start"] else None
+            end = date.fromisoformat(options["end"]) if options["end"] else None
+        except ValueError:
+            raise CommandError("Dates must be in YYYY-MM-DD format.")
+        try:
+            exact = dict(item.split("=", 1) for item in options["field"])
+        except ValueError:
+            raise CommandError("--field must be NAME=VALUE.")
+        text = options["contains"].lower()
+
+        matches = 0
+        for row in retention.read(policy, start, end):
+            if any(str(row.get(name)) != value for name, value in exact.items()):
+                continue
+            if text and not any(text in str(value).lower() for value in row.values()):
+                continue
+            self.stdout.write(json.dumps(row, ensure_ascii=False))
+            matches += 1
+            if options["limit"] and matches >= options["limit"]:
+                break
+        self.stderr.write(f"{matches} matching rows.")
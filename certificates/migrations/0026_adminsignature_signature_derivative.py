@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 02:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0025_generationjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adminsignature',
+            name='signature_derivative',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='signatures/derived/'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.1.7 on 2026-10-18 02:10
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def rebuild_stats(apps):
+    # Frozen copy of certificates.statistics.rebuild:
+    # certificates count on their local creation date, type, purpose and
+    # status; reissues on their local reissue date and document type
+    Certificate = apps.get_model("certificates", "Certificate")
+    CertificateDailyStat = apps.get_model("certificates", "CertificateDailyStat")
+    ReissueLog = apps.get_model("certificates", "ReissueLog")
+
+    tz = timezone.get_current_timezone()
+    rows = defaultdict(lambda: {"certificates": 0, "reissued_certificates": 0, "reissues": 0})
+
+    certs = Certificate.objects.annotate(day=TruncDate("created_at", tzinfo=tz))
+    for row in certs.values("day", "document_type", "purpose", "status").annotate(
+        total=Count("id"),
+        reissued_total=Count("id", filter=Q(reissued=True)),
+    ).order_by():
+        key = (row["day"], row["document_type"], row["purpose"] or "", (row["status"] or "").upper())
+        rows[key]["certificates"] += row["total"]
+        rows[key]["reissued_certificates"] += row["reissued_total"]
+
+    logs = ReissueLog.objects.annotate(day=TruncDate("reissued_at", tzinfo=tz))
+    for row in logs.values("day", "certificate__document_type").annotate(total=Count("id")).order_by():
+        rows[(row["day"], row["certificate__document_type"], "", "")]["reissues"] += row["total"]
+
+    CertificateDailyStat.objects.all().delete()
+    CertificateDailyStat.objects.bulk_create(
+        [
+            CertificateDailyStat(date=date, document_type=document_type, purpose=purpose, status=status, **counters)
+            for (date, document_type, purpose, status), counters in rows.items()
+        ],
+        batch_size=1000,
+    )
+
+
+def build_stats(apps, schema_editor):
+    rebuild_stats(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0026_adminsignature_signature_derivative'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CertificateDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('document_type', models.CharField(choices=[('clearance', 'Clearance'), ('residency', 'Residency'), ('indigency', 'Indigency')], max_length=50)),
+                ('purpose', models.CharField(blank=True, default='', max_length=255)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('COMPLETED', 'Completed')], max_length=50)),
+                ('certificates', models.IntegerField(default=0)),
+                ('reissued_certificates', models.IntegerField(default=0)),
+                ('reissues', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('date', 'document_type', 'purpose', 'status'), name='certificate_daily_stat_key')],
+            },
+        ),
+        migrations.RunPython(build_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.7 on 2026-10-18 02:15
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, CharField, Q, Value, When
+
+
+def _contains(*words):
+    q = Q()
+    for word in words:
+        q |= Q(action__icontains=word)
+    return q
+
+
+def log_kind():
+    # Frozen copy of certificates.filters.log_kind
+    return Case(
+        When(_contains("failed login attempt"), then=Value("failed")),
+        When(_contains("logged out", "logout"), then=Value("logout")),
+        When(_contains("logged in", "login"), then=Value("login")),
+        When(_contains("reissued", "reissue"), then=Value("reissue")),
+        When(_contains("create", "created", "added", "generated", "new"), then=Value("create")),
+        default=Value("other"),
+        output_field=CharField(),
+    )
+
+
+def backfill_action_type(apps, schema_editor):
+    # Rows written before action_type was set from the action text
+    ActivityLog = apps.get_model("certificates", "ActivityLog")
+    ActivityLog.objects.filter(action_type="other").update(action_type=log_kind())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0028_dataversion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='activitylog',
+            name='action_type',
+            field=models.CharField(choices=[('login', 'Login'), ('logout', 'Logout'), ('failed', 'Failed'), ('create', 'Create'), ('reissue', 'Reissue'), ('other', 'Other')], default='other', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['-created_at', '-id'], name='activitylog_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['action_type', '-created_at', '-id'], name='activitylog_type_created_idx'),
+        ),
+        migrations.RunPython(backfill_action_type, migrations.RunPython.noop),
+    ]
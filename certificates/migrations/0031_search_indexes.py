@@ -0,0 +1,76 @@
+from django.db import migrations
+
+# Frozen copy of the index layout in certificates.search as of this migration:
+# (index table, source table, columns, source SELECT, PostgreSQL weight labels)
+KINDS = (
+    (
+        "certificates_certificate_search",
+        "certificates_certificate",
+        ("full_name", "address"),
+        "SELECT c.id, COALESCE(c.full_name, ''), COALESCE(c.address, '') FROM certificates_certificate c",
+        ("A", "B"),
+    ),
+    (
+        "certificates_activitylog_search",
+        "certificates_activitylog",
+        ("action", "username", "first_name", "last_name"),
+        "SELECT l.id, l.action, COALESCE(u.username, ''), COALESCE(u.first_name, ''), COALESCE(u.last_name, '') "
+        "FROM certificates_activitylog l LEFT JOIN auth_user u ON u.id = l.user_id",
+        ("D", "A", "B", "C"),
+    ),
+)
+
+
+def _sqlite_statements():
+    for table, _, columns, select, _ in KINDS:
+        yield (
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+            f"{', '.join(columns)}, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        yield f"DELETE FROM {table}"
+        yield f"INSERT INTO {table} (rowid, {', '.join(columns)}) {select}"
+
+
+def _postgres_statements():
+    for table, source_table, columns, select, labels in KINDS:
+        yield (
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            f"id bigint PRIMARY KEY REFERENCES {source_table} (id) ON DELETE CASCADE "
+            f"DEFERRABLE INITIALLY DEFERRED, document tsvector NOT NULL)"
+        )
+        yield f"CREATE INDEX IF NOT EXISTS {table}_gin ON {table} USING gin (document)"
+        document = " || ".join(
+            f"setweight(to_tsvector('simple', s.col{i}), '{label}')" for i, label in enumerate(labels, start=1)
+        )
+        names = ", ".join(["id"] + [f"col{i}" for i in range(1, len(columns) + 1)])
+        yield f"TRUNCATE {table}"
+        yield f"INSERT INTO {table} (id, document) SELECT s.id, {document} FROM ({select}) AS s ({names})"
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {"sqlite": _sqlite_statements, "postgresql": _postgres_statements}.get(vendor)
+    if statements is None:
+        return  # other databases search with icontains
+    with schema_editor.connection.cursor() as cursor:
+        for sql in statements():
+            cursor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor not in ("sqlite", "postgresql"):
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table, *_ in KINDS:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0030_activitylog_created_at_default'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.1.7 on 2026-10-18 02:21
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+PREFIX = "Failed login attempt for username: "
+
+
+def count_failed_logins(apps, schema_editor):
+    # Seed the counters from the failed-login activity logs written so far
+    ActivityLog = apps.get_model("certificates", "ActivityLog")
+    FailedLogin = apps.get_model("certificates", "FailedLogin")
+    rows = (
+        ActivityLog.objects.filter(action_type="failed", action__startswith=PREFIX)
+        .values("action")
+        .annotate(failures=Count("id"), last=Max("created_at"))
+        .order_by()
+    )
+    FailedLogin.objects.bulk_create(
+        [
+            FailedLogin(
+                username=row["action"][len(PREFIX):][:255], failures=row["failures"],
+                last_failed_at=row["last"], last_logged_at=row["last"],
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0031_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FailedLogin',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(max_length=255, unique=True)),
+                ('failures', models.PositiveIntegerField(default=0)),
+                ('last_failed_at', models.DateTimeField(db_index=True)),
+                ('last_logged_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='accessattempt',
+            name='username',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.RunPython(count_failed_logins, migrations.RunPython.noop),
+    ]
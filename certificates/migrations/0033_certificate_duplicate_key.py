@@ -0,0 +1,80 @@
+# Generated by Django 5.1.7 on 2026-10-18 02:23
+
+from django.db import migrations, models
+from django.utils import timezone
+
+BATCH_SIZE = 1000
+
+
+def normalize_key(value):
+    # Frozen copy of certificates.models.normalize_key
+    return " ".join((value or "").split()).casefold()[:255]
+
+
+def backfill_keys(apps, schema_editor):
+    Certificate = apps.get_model("certificates", "Certificate")
+    now = timezone.now()
+
+    batch = []
+    for cert in Certificate.objects.only("id", "full_name", "purpose", "expiration_date").iterator(chunk_size=BATCH_SIZE):
+        cert.full_name_key = normalize_key(cert.full_name)
+        cert.purpose_key = normalize_key(cert.purpose)
+        cert.lifecycle = "EXPIRED" if cert.expiration_date and cert.expiration_date < now else "ACTIVE"
+        batch.append(cert)
+        if len(batch) >= BATCH_SIZE:
+            Certificate.objects.bulk_update(batch, ["full_name_key", "purpose_key", "lifecycle"])
+            batch = []
+    if batch:
+        Certificate.objects.bulk_update(batch, ["full_name_key", "purpose_key", "lifecycle"])
+
+    # Active duplicates can only predate the constraint (concurrent creates).
+    # The newest keeps the slot; older ones stop holding it but keep their data.
+    active = Certificate.objects.filter(status__in=["PENDING", "COMPLETED"], lifecycle="ACTIVE").exclude(
+        full_name_key=""
+    ).exclude(purpose_key="")
+    groups = (
+        active.values("document_type", "full_name_key", "purpose_key")
+        .annotate(total=models.Count("id"), newest=models.Max("id"))
+        .filter(total__gt=1)
+        .order_by()
+    )
+    for group in groups:
+        active.filter(
+            document_type=group["document_type"],
+            full_name_key=group["full_name_key"],
+            purpose_key=group["purpose_key"],
+        ).exclude(id=group["newest"]).update(lifecycle="EXPIRED")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0032_failedlogin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='full_name_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='lifecycle',
+            field=models.CharField(choices=[('ACTIVE', 'Active'), ('EXPIRED', 'Expired')], default='ACTIVE', editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='certificate',
+            name='purpose_key',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['full_name_key', 'purpose_key', 'document_type'], name='certificate_duplicate_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='certificate',
+            constraint=models.UniqueConstraint(condition=models.Q(('lifecycle', 'ACTIVE'), ('status__in', ['PENDING', 'COMPLETED']), models.Q(('full_name_key', ''), _negated=True), models.Q(('purpose_key', ''), _negated=True)), fields=('document_type', 'full_name_key', 'purpose_key'), name='active_certificate_key', violation_error_message='An active certificate with this name, document type and purpose already exists.'),
+        ),
+    ]
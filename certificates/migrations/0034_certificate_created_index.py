@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-18 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0033_certificate_duplicate_key'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['-created_at', '-id'], name='certificate_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-18 02:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0034_certificate_created_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(fields=['lifecycle', 'expiration_date'], name='certificate_expiry_idx'),
+        ),
+    ]
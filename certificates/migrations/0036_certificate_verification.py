@@ -0,0 +1,46 @@
+# Generated by Django 5.1.7 on 2026-10-18 02:28
+
+import uuid
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Coalesce
+
+
+def backfill_updated_at(apps, schema_editor):
+    # Best known change time of existing rows
+    Certificate = apps.get_model("certificates", "Certificate")
+    Certificate.objects.update(updated_at=Coalesce("reissue_date", "created_at"))
+
+
+def fresh_verification_tokens(apps, schema_editor):
+    # 0008 added the column with a default evaluated once, so rows created
+    # before it share one token; give each of those its own
+    Certificate = apps.get_model("certificates", "Certificate")
+    shared = (
+        Certificate.objects.values("verification_token").annotate(rows=Count("id")).filter(rows__gt=1)
+        .values_list("verification_token", flat=True)
+    )
+    for pk in Certificate.objects.filter(verification_token__in=list(shared)).values_list("pk", flat=True).iterator():
+        Certificate.objects.filter(pk=pk).update(verification_token=uuid.uuid4())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0035_certificate_expiry_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.RunPython(fresh_verification_tokens, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='certificate',
+            name='verification_token',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+        ),
+    ]
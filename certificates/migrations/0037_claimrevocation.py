@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-18 02:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificates', '0036_certificate_verification'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClaimRevocation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('unique_id', models.CharField(max_length=20, unique=True)),
+                ('revoked_before', models.DateTimeField(blank=True, null=True)),
+                ('reason', models.CharField(choices=[('reissued', 'Reissued'), ('deleted', 'Deleted'), ('invalidated', 'Invalidated')], default='invalidated', max_length=20)),
+                ('updated_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
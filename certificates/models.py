@@ -1,6 +1,6 @@
 import uuid
 import os
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 from datetime import timedelta
 from django.core.exceptions import ValidationError
@@ -61,6 +61,56 @@ STATUS_CHOICES = [
 ]
 
 
+# Statuses that hold a name/type/purpose slot until the certificate expires
+ACTIVE_STATUSES = ["PENDING", "COMPLETED"]
+
+LIFECYCLE_ACTIVE = "ACTIVE"
+LIFECYCLE_EXPIRED = "EXPIRED"
+LIFECYCLE_CHOICES = [
+    (LIFECYCLE_ACTIVE, "Active"),
+    (LIFECYCLE_EXPIRED, "Expired"),
+]
+
+
+DUPLICATE_MESSAGE = "An active certificate with this name, document type and purpose already exists."
+
+
+def normalize_key(value):
+    """Comparison form of a name or purpose: trimmed, single-spaced, case-folded."""
+    return " ".join((value or "").split()).casefold()[:255]
+
+
+class CertificateQuerySet(models.QuerySet):
+    """
+    Expiry in SQL. ``lifecycle`` is set to EXPIRED by ``manage.py
+    expire_certificates``; until the sweep has run, the expiration date
+    decides, so these filters are exact at any time.
+    """
+
+    def active(self, now=None):
+        now = now or timezone.now()
+        return self.filter(lifecycle=LIFECYCLE_ACTIVE).filter(
+            models.Q(expiration_date__isnull=True) | models.Q(expiration_date__gte=now)
+        )
+
+    def expired(self, now=None):
+        now = now or timezone.now()
+        return self.filter(models.Q(lifecycle=LIFECYCLE_EXPIRED) | models.Q(expiration_date__lt=now))
+
+    def due_for_expiry(self, now=None):
+        """Past their expiration date but not yet marked EXPIRED."""
+        return self.filter(lifecycle=LIFECYCLE_ACTIVE, expiration_date__lt=now or timezone.now())
+
+    def with_expiry(self, now=None):
+        """Annotate ``expired`` (bool) so callers need not call is_expired() per row."""
+        return self.annotate(expired=models.Case(
+            models.When(models.Q(lifecycle=LIFECYCLE_EXPIRED) | models.Q(expiration_date__lt=now or timezone.now()),
+                        then=models.Value(True)),
+            default=models.Value(False),
+            output_field=models.BooleanField(),
+        ))
+
+
 # -------------------------------------------------
 # CERTIFICATE MODEL
 # -------------------------------------------------
@@ -80,34 +130,105 @@ class Certificate(models.Model):
     generated_docx = models.FileField(upload_to="generated/docx/", blank=True, null=True)
     generated_pdf = models.FileField(upload_to="generated/pdf/", blank=True, null=True)
 
-    verification_token = models.UUIDField(default=uuid.uuid4, editable=False)
+    # Public verification URL / QR payload; unique, so lookups use its index
+    verification_token = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     expiration_date = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Last-Modified of the verification responses
+    updated_at = models.DateTimeField(auto_now=True)
 
     # ✅ NEW FIELD (for reissued certificates)
     reissue_date = models.DateTimeField(blank=True, null=True)
     reissued = models.BooleanField(default=False)
 
+    # Normalized full_name / purpose for the duplicate check (set in save())
+    full_name_key = models.CharField(max_length=255, blank=True, default="", editable=False)
+    purpose_key = models.CharField(max_length=255, blank=True, default="", editable=False)
+    # EXPIRED once expiration_date has passed; only ACTIVE certificates hold a
+    # slot in the active_certificate_key constraint
+    lifecycle = models.CharField(max_length=10, choices=LIFECYCLE_CHOICES, default=LIFECYCLE_ACTIVE, editable=False)
+
+    objects = CertificateQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["full_name_key", "purpose_key", "document_type"], name="certificate_duplicate_idx"),
+            # Newest-first listing and keyset pagination (see pagination.py)
+            models.Index(fields=["-created_at", "-id"], name="certificate_created_idx"),
+            # Expiry sweep and active()/expired() filters
+            models.Index(fields=["lifecycle", "expiration_date"], name="certificate_expiry_idx"),
+        ]
+        constraints = [
+            # One active certificate per name, document type and purpose.
+            # Enforced by the database on SQLite and PostgreSQL (partial index).
+            models.UniqueConstraint(
+                fields=["document_type", "full_name_key", "purpose_key"],
+                condition=(
+                    models.Q(status__in=ACTIVE_STATUSES, lifecycle=LIFECYCLE_ACTIVE)
+                    & ~models.Q(full_name_key="")
+                    & ~models.Q(purpose_key="")
+                ),
+                name="active_certificate_key",
+                violation_error_message=DUPLICATE_MESSAGE,
+            ),
+        ]
+
     def is_expired(self):
-        return self.expiration_date and timezone.now() > self.expiration_date
+        # For a loaded instance; querysets use active() / expired() / with_expiry()
+        return self.lifecycle == LIFECYCLE_EXPIRED or bool(self.expiration_date and timezone.now() > self.expiration_date)
+
+    def _duplicate_key(self):
+        return (self.document_type, normalize_key(self.full_name), normalize_key(self.purpose))
+
+    def active_duplicates(self):
+        """Other certificates with this name, type and purpose that are active and unexpired."""
+        document_type, full_name_key, purpose_key = self._duplicate_key()
+        return Certificate.objects.active().filter(
+            document_type=document_type,
+            full_name_key=full_name_key,
+            purpose_key=purpose_key,
+            status__in=ACTIVE_STATUSES,
+        ).exclude(pk=self.pk)
 
     def clean(self):
         """
         Prevent duplicate active certificates for the same name, document type, and purpose.
         """
-        if self.full_name and self.document_type and self.purpose:
-            existing = Certificate.objects.filter(
-                full_name__iexact=self.full_name.strip(),
-                document_type=self.document_type,
-                purpose__iexact=self.purpose.strip(),
-            ).exclude(pk=self.pk)
-
-            for cert in existing:
-                if not cert.is_expired() and cert.status in ["PENDING", "COMPLETED"]:
-                    raise ValidationError(
-                        f"A {self.get_document_type_display()} certificate for '{self.full_name}' "
-                        f"with purpose '{self.purpose}' already exists and is still active."
-                    )
+        if not (self.full_name and self.document_type and self.purpose):
+            return
+        key = self._duplicate_key()
+        # ModelForm validation and save() both call full_clean(); check each key once
+        if getattr(self, "_checked_duplicate_key", None) == key:
+            return
+        duplicates = self.active_duplicates()
+        if duplicates.exists():
+            until = duplicates.values_list("expiration_date", flat=True).first()
+            raise ValidationError(
+                f"A {self.get_document_type_display()} certificate for '{self.full_name}' "
+                f"with purpose '{self.purpose}' already exists and is still active"
+                + (f" until {timezone.localtime(until).strftime('%B %d, %Y')}." if until else ".")
+            )
+        self._checked_duplicate_key = key
+
+    def validate_constraints(self, exclude=None):
+        # active_certificate_key is checked by clean(), which also honours
+        # expiration dates that have passed since the last lifecycle update
+        super().validate_constraints(exclude={*(exclude or ()), "full_name_key"})
+
+    def _expire_stale_duplicates(self):
+        """Release the constraint slot held by expired certificates with this key."""
+        from certificates import verification
+
+        document_type, full_name_key, purpose_key = self._duplicate_key()
+        stale = Certificate.objects.due_for_expiry().filter(
+            document_type=document_type,
+            full_name_key=full_name_key,
+            purpose_key=purpose_key,
+        ).exclude(pk=self.pk)
+        rows = list(stale.values_list("verification_token", "unique_id"))
+        if rows:
+            stale.update(lifecycle=LIFECYCLE_EXPIRED)
+            verification.invalidate_many(rows)
 
     def save(self, *args, **kwargs):
         if not self.unique_id:
@@ -125,9 +246,26 @@ class Certificate(models.Model):
                 else:
                     raise
 
+        self.full_name_key = normalize_key(self.full_name)
+        self.purpose_key = normalize_key(self.purpose)
+        if self.expiration_date and self.expiration_date >= timezone.now():
+            self.lifecycle = LIFECYCLE_ACTIVE
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "full_name_key", "purpose_key", "lifecycle", "updated_at"}
+
         with transaction.atomic():
             self.full_clean()
-            super().save(*args, **kwargs)
+            if update_fields is None and self.full_name_key and self.purpose_key:
+                self._expire_stale_duplicates()
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+            except IntegrityError:
+                if self.active_duplicates().exists():
+                    # Lost a race with a concurrent issue of the same certificate
+                    raise ValidationError(DUPLICATE_MESSAGE)
+                raise
 
     def reissue(self):
         """
@@ -168,22 +306,121 @@ class ReissueLog(models.Model):
         return f"Reissue of {self.certificate.unique_id} by {self.reissued_by or 'System'} on {self.reissued_at.strftime('%Y-%m-%d %H:%M')}"
 
 
+class ClaimRevocation(models.Model):
+    """
+    Revoked signed QR claims (see claims.py), served in bulk to offline
+    verifiers. Claims for ``unique_id`` issued before ``revoked_before`` are
+    revoked; every claim is when it is null.
+    """
+    REASON_CHOICES = [
+        ("reissued", "Reissued"),
+        ("deleted", "Deleted"),
+        ("invalidated", "Invalidated"),
+    ]
+
+    unique_id = models.CharField(max_length=20, unique=True)
+    revoked_before = models.DateTimeField(blank=True, null=True)
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES, default="invalidated")
+    # Verifiers fetch the changes since their last sync
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.unique_id} revoked ({self.reason})"
+
+
+# -------------------------------------------------
+# DAILY STATISTICS
+# -------------------------------------------------
+class CertificateDailyStat(models.Model):
+    """
+    Certificate counts pre-aggregated per local day, document type, purpose
+    and status for the dashboard and reports. Maintained by
+    certificates/statistics.py; rebuild with `manage.py rebuild_certificate_stats`.
+    """
+    date = models.DateField()
+    document_type = models.CharField(max_length=50, choices=DOCUMENT_CHOICES)
+    purpose = models.CharField(max_length=255, blank=True, default="")
+    status = models.CharField(max_length=50, choices=STATUS_CHOICES)
+
+    certificates = models.IntegerField(default=0)            # created on this day, currently in this status
+    reissued_certificates = models.IntegerField(default=0)   # of those, reissued at least once
+    reissues = models.IntegerField(default=0)                # ReissueLog entries dated this day
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "document_type", "purpose", "status"], name="certificate_daily_stat_key"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.document_type} {self.purpose or '-'} {self.status}"
+
+
+class DataVersion(models.Model):
+    """
+    Counter bumped whenever the data behind a cached view changes (e.g.
+    "reports"). Cached results are keyed on it, so every process sees
+    invalidations without a shared cache backend.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
 # -------------------------------------------------
 # ACTIVITY LOG
 # -------------------------------------------------
+def classify_action(action):
+    """
+    Log type implied by an action's text, for logs created without an explicit
+    action_type. certificates.filters.log_kind() is the SQL equivalent used to
+    backfill existing rows; keep the two in step.
+    """
+    text = (action or "").lower()
+    if "failed login attempt" in text:
+        return "failed"
+    if "logged out" in text or "logout" in text:
+        return "logout"
+    if "logged in" in text or "login" in text:
+        return "login"
+    if "reissued" in text or "reissue" in text:
+        return "reissue"
+    if any(k in text for k in ["create", "created", "added", "generated", "new"]):
+        return "create"
+    return "other"
+
+
 class ActivityLog(models.Model):
     ACTION_TYPES = [
         ('login', 'Login'),
         ('logout', 'Logout'),
         ('failed', 'Failed'),
         ('create', 'Create'),
+        ('reissue', 'Reissue'),
         ('other', 'Other'),
     ]
 
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     action_type = models.CharField(max_length=20, choices=ACTION_TYPES, default='other')
     action = models.CharField(max_length=255)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the event happens, not when a buffered batch is written (see audit.py)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        indexes = [
+            # Newest-first listing and keyset pagination, optionally by type
+            models.Index(fields=["-created_at", "-id"], name="activitylog_created_idx"),
+            models.Index(fields=["action_type", "-created_at", "-id"], name="activitylog_type_created_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self.action_type or self.action_type == 'other':
+            self.action_type = classify_action(self.action)
+        super().save(*args, **kwargs)
 
     @property
     def simple_type(self):
@@ -202,6 +439,8 @@ class ActivityLog(models.Model):
 class AdminSignature(models.Model):
     admin_user = models.OneToOneField(User, on_delete=models.CASCADE)
     signature_image = models.ImageField(upload_to="signatures/", null=True, blank=True)
+    # Trimmed, downscaled copy embedded in certificates (see signatures.py)
+    signature_derivative = models.ImageField(upload_to="signatures/derived/", null=True, blank=True, editable=False)
     bypass_digital_signature = models.BooleanField(default=False, help_text="If true, certificates will leave space for manual signing.")
 
     def __str__(self):
@@ -241,9 +480,93 @@ class CertificateTemplate(models.Model):
 # ACCESS ATTEMPT (for login failure tracking)
 # -------------------------------------------------
 class AccessAttempt(models.Model):
-    username = models.CharField(max_length=255)
+    username = models.CharField(max_length=255, db_index=True)
     failures_since_start = models.IntegerField(default=0)
     timestamp = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"{self.username} - {self.failures_since_start} failures"
\ No newline at end of file
+        return f"{self.username} - {self.failures_since_start} failures"
+
+
+class FailedLogin(models.Model):
+    """
+    Running count of failed logins per attempted username, kept by
+    signals.log_failed_login. Unlike AccessAttempt it is never reset, and it
+    debounces the "Failed login attempt" activity log: each attempt costs two
+    single-row updates on the username index, however long the history.
+    """
+    DEBOUNCE_SECONDS = 5
+
+    username = models.CharField(max_length=255, unique=True)
+    failures = models.PositiveIntegerField(default=0)
+    last_failed_at = models.DateTimeField(db_index=True)
+    last_logged_at = models.DateTimeField(blank=True, null=True)
+
+    @classmethod
+    def record(cls, username, now=None):
+        """
+        Count a failed attempt for ``username``. Returns True when it should be
+        logged, i.e. none was logged for this username in the last
+        DEBOUNCE_SECONDS (decided atomically, so concurrent workers agree).
+        """
+        now = now or timezone.now()
+        username = username[:255]
+        rows = cls.objects.filter(username=username)
+        if not rows.update(failures=models.F("failures") + 1, last_failed_at=now):
+            try:
+                with transaction.atomic():
+                    cls.objects.create(username=username, failures=1, last_failed_at=now, last_logged_at=now)
+                return True
+            except IntegrityError:
+                # Another worker created the row first
+                rows.update(failures=models.F("failures") + 1, last_failed_at=now)
+        window_start = now - timedelta(seconds=cls.DEBOUNCE_SECONDS)
+        due = rows.filter(models.Q(last_logged_at__isnull=True) | models.Q(last_logged_at__lte=window_start))
+        return bool(due.update(last_logged_at=now))
+
+    def __str__(self):
+        return f"{self.username} - {self.failures} failed logins"
+
+
+# -------------------------------------------------
+# GENERATION JOB (background certificate generation)
+# -------------------------------------------------
+class GenerationJob(models.Model):
+    STATUS_QUEUED = "QUEUED"
+    STATUS_RUNNING = "RUNNING"
+    STATUS_DONE = "DONE"
+    STATUS_FAILED = "FAILED"
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "Queued"),
+        (STATUS_RUNNING, "Running"),
+        (STATUS_DONE, "Done"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    certificate = models.ForeignKey('Certificate', on_delete=models.CASCADE, related_name='generation_jobs')
+    requested_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
+    verify_url = models.CharField(max_length=500)
+    skip_log = models.BooleanField(default=False)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    available_at = models.DateTimeField(default=timezone.now)
+    lease_expires_at = models.DateTimeField(blank=True, null=True)
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    last_error = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "available_at"], name="genjob_status_available_idx"),
+        ]
+
+    @property
+    def is_pending(self):
+        return self.status in (self.STATUS_QUEUED, self.STATUS_RUNNING)
+
+    def __str__(self):
+        return f"Generation of {self.certificate_id} ({self.status})"
@@ -0,0 +1,130 @@
+# certificates/pagination.py
+"""
+Keyset (cursor) pagination.
+
+Pages are ordered descending on a tuple of keys ending in the primary key,
+e.g. ("created_at", "pk"). Instead of COUNT(*) and OFFSET, each page
+continues from the last row shown, so the database seeks straight into an
+index on those keys and page 5,000 costs the same as page 1. Cursors are
+signed, opaque tokens that encode the boundary row and the direction; a
+tampered or stale token starts again from the first page.
+
+Totals are not needed to paginate. Views that show one pass ``total``,
+usually from a cache (see report_cache.get_or_build).
+"""
+from datetime import date, datetime
+
+from django.core import signing
+from django.db.models import Q
+
+SALT = "certificates.pagination"
+NEXT = "n"
+PREVIOUS = "p"
+
+
+class KeysetPage:
+    """One page of rows plus the cursors for its neighbours."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None, total=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.total = total
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def _dump(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _load(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        return date.fromisoformat(value["d"])
+    return value
+
+
+def _attr(obj, key):
+    return obj.pk if key == "pk" else getattr(obj, key)
+
+
+def _encode(obj, keys, direction):
+    return signing.dumps(
+        {"k": list(keys), "v": [_dump(_attr(obj, key)) for key in keys], "d": direction},
+        salt=SALT, compress=True,
+    )
+
+
+def _decode(token, keys):
+    if not token:
+        return None
+    try:
+        data = signing.loads(token, salt=SALT)
+        if data["k"] != list(keys) or data["d"] not in (NEXT, PREVIOUS):
+            return None
+        return [_load(value) for value in data["v"]], data["d"]
+    except (signing.BadSignature, KeyError, TypeError, ValueError):
+        return None
+
+
+def _beyond(keys, values, lookup):
+    """Rows after ``values`` in lexicographic order: k1 <op> v1, or k1 = v1 and k2 <op> v2, ..."""
+    condition = Q()
+    for i, key in enumerate(keys):
+        equal = {keys[j]: values[j] for j in range(i)}
+        condition |= Q(**equal, **{f"{key}__{lookup}": values[i]})
+    return condition
+
+
+def paginate(queryset, cursor=None, per_page=9, keys=("created_at", "pk"), total=None):
+    """
+    Return the KeysetPage of ``queryset`` at ``cursor`` (None for the first
+    page), ordered by ``keys`` descending. Fetches one extra row to know
+    whether there is a further page, and never counts the queryset.
+    """
+    position = _decode(cursor, keys)
+    newest_first = queryset.order_by(*(f"-{key}" for key in keys))
+
+    if position is None:
+        rows = list(newest_first[:per_page + 1])
+        more = len(rows) > per_page
+        rows = rows[:per_page]
+        has_next, has_previous = more, False
+    elif position[1] == PREVIOUS:
+        rows = list(queryset.filter(_beyond(keys, position[0], "gt")).order_by(*keys)[:per_page + 1])
+        more = len(rows) > per_page
+        rows = rows[:per_page][::-1]
+        has_next, has_previous = True, more
+    else:
+        rows = list(newest_first.filter(_beyond(keys, position[0], "lt"))[:per_page + 1])
+        more = len(rows) > per_page
+        rows = rows[:per_page]
+        has_next, has_previous = more, True
+
+    return KeysetPage(
+        rows,
+        next_cursor=_encode(rows[-1], keys, NEXT) if has_next and rows else None,
+        previous_cursor=_encode(rows[0], keys, PREVIOUS) if has_previous and rows else None,
+        total=total,
+    )
@@ -0,0 +1,278 @@
+# certificates/pdf_conversion.py
+"""
+DOCX to PDF conversion through a pool of long-lived converter processes.
+
+Starting LibreOffice costs seconds, so instead of one cold start per document
+the pool keeps CERTIFICATE_PDF_POOL_SIZE headless LibreOffice instances
+running (through ``unoserver``, which keeps soffice in listener mode and
+exposes an XML-RPC API) and hands each conversion to an idle one.
+
+Conversions wait in a queue for a free process, are bounded by a timeout, and
+a process that crashed or hung is restarted before it is used again.
+
+Backends (setting CERTIFICATE_PDF_BACKEND):
+    "reportlab"  no conversion; PDFs are drawn natively (see pdf_engine.py)
+    "unoserver"  LibreOffice via unoserver
+    "fake"       pure-Python ReportLab output, for tests and development
+    ""           PDF conversion disabled
+"""
+import atexit
+import logging
+import queue
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import xmlrpc.client
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ConverterUnavailable(Exception):
+    """The configured converter cannot be started on this host."""
+
+
+class ConversionError(Exception):
+    """A document could not be converted."""
+
+
+# -------------------------------------------------
+# BACKENDS
+# -------------------------------------------------
+class _TimeoutTransport(xmlrpc.client.Transport):
+    def __init__(self, timeout):
+        super().__init__()
+        self.timeout = timeout
+
+    def make_connection(self, host):
+        conn = super().make_connection(host)
+        conn.timeout = self.timeout
+        return conn
+
+
+class UnoserverProcess:
+    """One long-lived LibreOffice instance managed through unoserver."""
+
+    def __init__(self, index, executable="unoserver", base_port=2003, startup_timeout=30):
+        self.index = index
+        self.executable = executable
+        self.port = base_port + index * 2
+        self.uno_port = self.port + 1
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.profile_dir = None
+
+    def start(self):
+        if not shutil.which(self.executable):
+            raise ConverterUnavailable(f"'{self.executable}' was not found; install LibreOffice and unoserver.")
+
+        # Each instance needs its own LibreOffice profile to run side by side
+        self.profile_dir = tempfile.mkdtemp(prefix=f"lo_profile_{self.index}_")
+        self.process = subprocess.Popen(
+            [
+                self.executable,
+                "--interface", "127.0.0.1",
+                "--port", str(self.port),
+                "--uno-port", str(self.uno_port),
+                "--user-installation", Path(self.profile_dir).as_uri(),
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise ConverterUnavailable(f"unoserver exited with code {self.process.returncode} on startup.")
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=1):
+                    return
+            except OSError:
+                time.sleep(0.25)
+        self.stop()
+        raise ConverterUnavailable(f"unoserver did not start within {self.startup_timeout}s.")
+
+    def is_alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def convert(self, docx_path, pdf_path, timeout):
+        proxy = xmlrpc.client.ServerProxy(
+            f"http://127.0.0.1:{self.port}", transport=_TimeoutTransport(timeout), allow_none=True
+        )
+        proxy.convert(str(docx_path), None, str(pdf_path), None)
+
+    def stop(self):
+        if self.process is not None and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.process = None
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+
+
+class FakeConverterProcess:
+    """
+    Stand-in converter that writes a plain ReportLab PDF of the document text.
+    ``delay`` and ``crash`` let tests simulate slow or dying converters.
+    """
+
+    def __init__(self, index, delay=0, crash=False):
+        self.index = index
+        self.delay = delay
+        self.crash = crash
+        self.alive = False
+        self.starts = 0
+        self.conversions = 0
+
+    def start(self):
+        self.alive = True
+        self.starts += 1
+
+    def is_alive(self):
+        return self.alive
+
+    def convert(self, docx_path, pdf_path, timeout):
+        from docx import Document
+        from reportlab.lib.pagesizes import A4
+        from reportlab.pdfgen import canvas
+
+        if self.crash:
+            self.alive = False
+            raise ConnectionRefusedError("fake converter crashed")
+        if self.delay:
+            if self.delay > timeout:
+                raise socket.timeout("fake converter timed out")
+            time.sleep(self.delay)
+
+        c = canvas.Canvas(str(pdf_path), pagesize=A4)
+        y = 800
+        c.setFont("Helvetica", 11)
+        for para in Document(str(docx_path)).paragraphs:
+            if para.text.strip():
+                c.drawString(60, y, para.text.strip()[:100])
+                y -= 16
+                if y < 60:
+                    c.showPage()
+                    c.setFont("Helvetica", 11)
+                    y = 800
+        c.showPage()
+        c.save()
+        self.conversions += 1
+
+    def stop(self):
+        self.alive = False
+
+
+# -------------------------------------------------
+# POOL
+# -------------------------------------------------
+class ConverterPool:
+    """
+    Fixed-size pool of converter processes. Conversions queue for an idle
+    process; a process that died or failed is restarted before it is reused,
+    and a crashed conversion is retried once on the fresh process.
+    """
+
+    def __init__(self, processes, timeout=60, queue_timeout=120):
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.processes = list(processes)
+        self._idle = queue.Queue()
+        for proc in self.processes:
+            self._idle.put(proc)
+
+    def _ensure_started(self, proc):
+        if not proc.is_alive():
+            proc.stop()
+            proc.start()
+
+    def convert(self, docx_path, pdf_path, timeout=None):
+        timeout = timeout or self.timeout
+        try:
+            proc = self._idle.get(timeout=self.queue_timeout)
+        except queue.Empty:
+            raise ConversionError(f"No converter became available within {self.queue_timeout}s.")
+
+        try:
+            for attempt in (1, 2):
+                self._ensure_started(proc)
+                try:
+                    proc.convert(docx_path, pdf_path, timeout)
+                    return Path(pdf_path)
+                except (socket.timeout, TimeoutError) as e:
+                    # A hung converter is killed so the next job gets a fresh one
+                    proc.stop()
+                    raise ConversionError(f"Conversion timed out after {timeout}s.") from e
+                except (ConnectionError, OSError, xmlrpc.client.ProtocolError) as e:
+                    logger.warning(f"Converter {proc.index} failed (attempt {attempt}): {e}")
+                    proc.stop()
+                    if attempt == 2:
+                        raise ConversionError(f"Converter crashed: {e}") from e
+                except xmlrpc.client.Fault as e:
+                    raise ConversionError(f"Converter rejected the document: {e.faultString}") from e
+        finally:
+            self._idle.put(proc)
+
+    def close(self):
+        for proc in self.processes:
+            proc.stop()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _build_pool():
+    backend = getattr(settings, "CERTIFICATE_PDF_BACKEND", "")
+    size = getattr(settings, "CERTIFICATE_PDF_POOL_SIZE", 2)
+    timeout = getattr(settings, "CERTIFICATE_PDF_TIMEOUT", 60)
+
+    if backend == "unoserver":
+        executable = getattr(settings, "CERTIFICATE_PDF_UNOSERVER", "unoserver")
+        base_port = getattr(settings, "CERTIFICATE_PDF_BASE_PORT", 2003)
+        processes = [UnoserverProcess(i, executable=executable, base_port=base_port) for i in range(size)]
+    elif backend == "fake":
+        processes = [FakeConverterProcess(i) for i in range(size)]
+    else:
+        raise ConverterUnavailable(f"Unknown PDF backend '{backend}'.")
+    return ConverterPool(processes, timeout=timeout)
+
+
+def pdf_enabled():
+    return bool(getattr(settings, "CERTIFICATE_PDF_BACKEND", ""))
+
+
+def get_pool():
+    """Process-wide converter pool, created on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _build_pool()
+                atexit.register(_pool.close)
+    return _pool
+
+
+def reset_pool():
+    """Stop all converter processes (e.g. after changing settings in tests)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = None
+
+
+def convert_docx_to_pdf(docx_path, pdf_path):
+    """Convert a DOCX file to PDF using the shared converter pool."""
+    Path(pdf_path).parent.mkdir(parents=True, exist_ok=True)
+    return get_pool().convert(docx_path, pdf_path)
@@ -0,0 +1,201 @@
+# certificates/pdf_engine.py
+"""
+Native PDF rendering of certificates with ReportLab.
+
+Draws a certificate straight to PDF from its declarative layout in
+pdf_layouts.py, so no DOCX rendering or external converter is involved.
+Fonts, static images, signature images and paragraph styles are loaded once
+per process and reused across renders.
+"""
+import io
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from PIL import Image
+from reportlab import rl_config
+from reportlab.lib import pagesizes
+from reportlab.lib.enums import TA_JUSTIFY
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Paragraph
+
+from certificates import qr_service
+from certificates.artifact_store import artifact_key
+from certificates.pdf_layouts import FONTS, LAYOUTS
+
+# Bump when rendering changes in a way that should invalidate stored PDFs
+ENGINE_VERSION = 2
+IMAGE_CACHE_SIZE = 32
+IMAGE_DPI = 300
+
+# Without reportlab's optional C accelerator, ASCII85-encoding image streams
+# in pure Python dominates render time; plain Flate streams are valid PDF and smaller.
+rl_config.useA85 = 0
+
+_lock = threading.Lock()
+_registered_fonts = set()
+_images = OrderedDict()  # (path, mtime_ns, width_mm, height_mm) -> ImageReader
+_styles = {}             # (font, size, leading) -> ParagraphStyle
+
+
+class LayoutMissing(Exception):
+    """No PDF layout exists for a document type."""
+
+
+def layout_version(document_type):
+    """Hash of a document type's layout and fonts, for artifact keys."""
+    return artifact_key(engine=ENGINE_VERSION, layout=LAYOUTS.get(document_type), fonts=FONTS)
+
+
+def _font(name):
+    """Return a usable font name, registering custom TrueType fonts once."""
+    if name in _registered_fonts or name not in FONTS:
+        return name
+    with _lock:
+        if name not in _registered_fonts:
+            pdfmetrics.registerFont(TTFont(name, str(Path(settings.BASE_DIR) / FONTS[name])))
+            _registered_fonts.add(name)
+    return name
+
+
+def _to_reader(image, width_mm, height_mm):
+    """Downscale a PIL image to IMAGE_DPI at its printed size."""
+    max_px = (int(width_mm / 25.4 * IMAGE_DPI), int(height_mm / 25.4 * IMAGE_DPI))
+    if image.mode == "P":
+        # ReportLab cannot read palette transparency (e.g. prepared signatures)
+        image = image.convert("RGBA")
+    image.thumbnail(max_px)
+    return ImageReader(image)
+
+
+def _image(path, width_mm, height_mm):
+    """
+    Downscaled ImageReader for a file, cached by path, modification time and
+    printed size.
+    """
+    path = Path(path)
+    key = (str(path), path.stat().st_mtime_ns, width_mm, height_mm)
+    with _lock:
+        reader = _images.get(key)
+        if reader is not None:
+            _images.move_to_end(key)
+            return reader
+
+    with Image.open(path) as im:
+        im.load()
+        reader = _to_reader(im.copy(), width_mm, height_mm)
+    with _lock:
+        _images[key] = reader
+        while len(_images) > IMAGE_CACHE_SIZE:
+            _images.popitem(last=False)
+    return reader
+
+
+def _style(font, size, leading):
+    key = (font, size, leading)
+    style = _styles.get(key)
+    if style is None:
+        style = ParagraphStyle(
+            name=f"{font}-{size}-{leading}", fontName=_font(font), fontSize=size,
+            leading=leading, alignment=TA_JUSTIFY,
+        )
+        _styles[key] = style
+    return style
+
+
+def _draw_text(c, block, text, page_height):
+    font, size = _font(block.get("font", "Times-Roman")), block.get("size", 12)
+    x, y = block["x"] * mm, page_height - block["y"] * mm
+    c.setFont(font, size)
+    align = block.get("align", "left")
+    if align == "center":
+        c.drawCentredString(x, y, text)
+    elif align == "right":
+        c.drawRightString(x, y, text)
+    else:
+        c.drawString(x, y, text)
+    return block["y"]
+
+
+def _draw_paragraph(c, block, text, page_height, flow_y):
+    size = block.get("size", 12)
+    style = _style(block.get("font", "Times-Roman"), size, block.get("leading", size * 1.4))
+    para = Paragraph(text, style)
+    width = block["width"] * mm
+    _, height = para.wrapOn(c, width, page_height)
+
+    top = block["y"] if "y" in block else flow_y + block.get("space_before", 0)
+    para.drawOn(c, block["x"] * mm, page_height - top * mm - height)
+    return top + height / mm
+
+
+def _draw_image(c, reader, x, y, width, height, page_height):
+    c.drawImage(
+        reader, x * mm, page_height - (y + height) * mm, width * mm, height * mm,
+        preserveAspectRatio=True, mask="auto",
+    )
+
+
+def render_certificate_pdf(cert, values, verify_url, signature=None):
+    """
+    Render a certificate to PDF bytes.
+
+    ``values`` are the template values from generation.certificate_values();
+    ``signature`` is an image path, raw image bytes, or None.
+    """
+    layout = LAYOUTS.get(cert.document_type)
+    if layout is None:
+        raise LayoutMissing(f"No PDF layout for '{cert.document_type}'.")
+
+    page_size = getattr(pagesizes, layout.get("page_size", "A4"))
+    page_height = page_size[1]
+    # Paragraphs are parsed as markup, so their values are escaped;
+    # text blocks go straight to drawString and take the raw values.
+    raw_values = {k: str(v) if v is not None else "" for k, v in values.items()}
+    markup_values = {k: escape(v) for k, v in raw_values.items()}
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=page_size)
+    c.setTitle(f"{cert.get_document_type_display()} - {cert.unique_id}")
+
+    flow_y = 0
+    for block in layout["blocks"]:
+        if block.get("when") and not values.get(block["when"]):
+            continue
+        kind = block["type"]
+        if kind == "image":
+            static_path = Path(settings.BASE_DIR) / "certificates" / "static" / block["src"]
+            if static_path.exists():
+                reader = _image(static_path, block["width"], block["height"])
+                _draw_image(c, reader, block["x"], block["y"], block["width"], block["height"], page_height)
+            continue
+        if kind == "text":
+            flow_y = _draw_text(c, block, block["text"].format(**raw_values), page_height)
+        elif kind == "paragraph":
+            flow_y = _draw_paragraph(c, block, block["text"].format(**markup_values), page_height, flow_y)
+
+    # ---------------- QR code ----------------
+    qr = layout.get("qr")
+    if qr and verify_url:
+        qr_image = ImageReader(io.BytesIO(qr_service.get_qr(verify_url)))
+        _draw_image(c, qr_image, qr["x"], qr["y"], qr["size"], qr["size"], page_height)
+
+    # ---------------- Signature ----------------
+    box = layout.get("signature")
+    if box and signature:
+        if isinstance(signature, (bytes, bytearray)):
+            reader = _to_reader(Image.open(io.BytesIO(signature)), box["width"], box["height"])
+        else:
+            reader = _image(signature, box["width"], box["height"])
+        _draw_image(c, reader, box["x"], box["y"], box["width"], box["height"], page_height)
+
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
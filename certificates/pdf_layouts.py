@@ -0,0 +1,100 @@
+# certificates/pdf_layouts.py
+"""
+Declarative page layouts for the native PDF engine (pdf_engine.py).
+
+All coordinates are in millimetres from the top-left corner of the page.
+Text is formatted with str.format() against the values from
+generation.certificate_values(); values are escaped before use.
+
+Block types:
+    text       single line; "align" is left, center or right (x is the anchor)
+    paragraph  wrapped text of "width" mm; supports <b>/<i> markup in the
+               layout string. Without "y" it flows below the previous block
+               after "space_before" mm.
+    image      static file under certificates/static ("src")
+
+Any block may set "when": a value name that must be non-empty for the block
+to be drawn (e.g. reissue lines).
+
+Custom TrueType fonts can be listed in FONTS as {name: path relative to
+BASE_DIR}; otherwise the standard PDF fonts (Times-Roman, Helvetica, ...) are
+used.
+"""
+
+FONTS = {}
+
+_HEADER = [
+    {"type": "image", "src": "images/logo.png", "x": 95, "y": 12, "width": 20, "height": 20},
+    {"type": "text", "text": "Republic of the Philippines", "x": 105, "y": 38, "align": "center",
+     "font": "Times-Roman", "size": 11},
+    {"type": "text", "text": "{city}", "x": 105, "y": 43, "align": "center", "font": "Times-Roman", "size": 11},
+    {"type": "text", "text": "BARANGAY {barangay_upper}", "x": 105, "y": 50, "align": "center",
+     "font": "Times-Bold", "size": 14},
+    {"type": "text", "text": "OFFICE OF THE BARANGAY CHAIRMAN", "x": 105, "y": 56, "align": "center",
+     "font": "Times-Bold", "size": 11},
+    {"type": "text", "text": "TO WHOM IT MAY CONCERN:", "x": 25, "y": 95, "font": "Times-Bold", "size": 12},
+]
+
+_FOOTER = [
+    {"type": "paragraph", "text": "Reissued on <b>{date_reissued}</b>.", "x": 25, "width": 160,
+     "space_before": 6, "when": "date_reissued"},
+    {"type": "text", "text": "Certified by:", "x": 125, "y": 185, "font": "Times-Roman", "size": 12},
+    {"type": "text", "text": "Hon. {captain}", "x": 145, "y": 210, "align": "center", "font": "Times-Bold", "size": 12},
+    {"type": "text", "text": "Barangay Captain", "x": 145, "y": 215, "align": "center", "font": "Times-Roman", "size": 11},
+    {"type": "text", "text": "Certificate No: {unique_id}", "x": 25, "y": 225, "font": "Helvetica", "size": 9},
+]
+
+_BODY_STYLE = {"font": "Times-Roman", "size": 12, "leading": 18, "x": 25, "width": 160}
+
+LAYOUTS = {
+    "clearance": {
+        "page_size": "A4",
+        "blocks": _HEADER + [
+            {"type": "text", "text": "BARANGAY CLEARANCE", "x": 105, "y": 75, "align": "center",
+             "font": "Times-Bold", "size": 20},
+            {"type": "paragraph", "y": 103, **_BODY_STYLE,
+             "text": "This is to certify that <b>{full_name}</b> is a Bonafide Filipino Citizen and a resident of "
+                     "{address}. He/she has been residing in this barangay since {resident_since} up to present."},
+            {"type": "paragraph", "space_before": 6, **_BODY_STYLE,
+             "text": "This certification is being issued upon the request of the named person for <b>{purpose}</b>."},
+            {"type": "paragraph", "space_before": 6, **_BODY_STYLE,
+             "text": "Issued this on {date_issued} at the office of Barangay Chairman."},
+        ] + _FOOTER,
+        "qr": {"x": 25, "y": 190, "size": 30},
+        "signature": {"x": 125, "y": 192, "width": 40, "height": 12},
+    },
+    "residency": {
+        "page_size": "A4",
+        "blocks": _HEADER + [
+            {"type": "text", "text": "CERTIFICATE OF RESIDENCY", "x": 105, "y": 75, "align": "center",
+             "font": "Times-Bold", "size": 20},
+            {"type": "paragraph", "y": 103, **_BODY_STYLE,
+             "text": "This is to certify that <b>{full_name}</b> is a Bonafide Filipino Citizen and a resident of "
+                     "{address}, He/she has been residing in this barangay since {resident_since} up to present."},
+            {"type": "paragraph", "space_before": 6, **_BODY_STYLE,
+             "text": "This certification is being issued upon the request of the named person for <b>{purpose}</b>."},
+            {"type": "paragraph", "space_before": 6, **_BODY_STYLE,
+             "text": "Issued this {date_issued} at the office of Barangay Chairman."},
+        ] + _FOOTER,
+        "qr": {"x": 25, "y": 190, "size": 30},
+        "signature": {"x": 125, "y": 192, "width": 40, "height": 12},
+    },
+    "indigency": {
+        "page_size": "A4",
+        "blocks": _HEADER + [
+            {"type": "text", "text": "CERTIFICATE OF INDIGENCY", "x": 105, "y": 75, "align": "center",
+             "font": "Times-Bold", "size": 20},
+            {"type": "paragraph", "y": 103, **_BODY_STYLE,
+             "text": "This is to certify that <b>{full_name}</b> of {address} with postal address at {postal} "
+                     "Longos Malabon City is a Bonafide resident in this Barangay."},
+            {"type": "paragraph", "space_before": 6, **_BODY_STYLE,
+             "text": "This Further certifies that this person belongs to an indigent family who has no capacity "
+                     "to shoulder the expenses."},
+            {"type": "paragraph", "space_before": 6, **_BODY_STYLE, "text": "Purpose: <b>{purpose}</b>"},
+            {"type": "paragraph", "space_before": 6, **_BODY_STYLE,
+             "text": "Issued this {date_issued} at the office of the Barangay Chairman."},
+        ] + _FOOTER,
+        "qr": {"x": 25, "y": 190, "size": 30},
+        "signature": {"x": 125, "y": 192, "width": 40, "height": 12},
+    },
+}
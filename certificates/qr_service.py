@@ -0,0 +1,87 @@
+# certificates/qr_service.py
+"""
+Encoded QR code images, memoized by payload (the verification URL).
+
+Lookups go through an in-process LRU, then MEDIA_ROOT/qrcodes/<hash>.<fmt>
+on disk, and only encode when neither has the image. The same payload always
+produces the same bytes, so the hash doubles as a strong ETag and responses
+can be cached indefinitely.
+"""
+import io
+import threading
+from collections import OrderedDict
+
+import qrcode
+import qrcode.image.svg
+
+from certificates import artifact_store
+
+# Bump when the QR rendering options below change
+QR_VERSION = 1
+LRU_SIZE = 512
+FORMATS = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+
+_lock = threading.Lock()
+_lru = OrderedDict()  # (fmt, payload) -> bytes
+
+
+def qr_key(payload, fmt="png"):
+    return artifact_store.artifact_key(kind="qr", version=QR_VERSION, fmt=fmt, payload=payload)
+
+
+def etag(payload, fmt="png"):
+    return f'"{qr_key(payload, fmt)}"'
+
+
+def _encode(payload, fmt):
+    qr = qrcode.QRCode(version=1, box_size=10, border=4)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    buffer = io.BytesIO()
+    if fmt == "svg":
+        qr.make_image(image_factory=qrcode.image.svg.SvgPathImage).save(buffer)
+    else:
+        qr.make_image(fill_color="black", back_color="white").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _remember(cache_key, data):
+    with _lock:
+        _lru[cache_key] = data
+        _lru.move_to_end(cache_key)
+        while len(_lru) > LRU_SIZE:
+            _lru.popitem(last=False)
+
+
+def get_qr(payload, fmt="png"):
+    """Return the encoded QR image bytes for a payload."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported QR format '{fmt}'.")
+
+    cache_key = (fmt, payload)
+    with _lock:
+        data = _lru.get(cache_key)
+        if data is not None:
+            _lru.move_to_end(cache_key)
+            return data
+
+    key = qr_key(payload, fmt)
+    name = f"qrcodes/{key[:2]}/{key}.{fmt}"
+    path = artifact_store.artifact_path(name)
+    if path.exists():
+        data = path.read_bytes()
+    else:
+        data = _encode(payload, fmt)
+        artifact_store.write(name, data=data)
+
+    _remember(cache_key, data)
+    return data
+
+
+def prerender(payload):
+    """Encode and store every format for a payload ahead of the first request."""
+    for fmt in FORMATS:
+        get_qr(payload, fmt)
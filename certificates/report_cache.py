@@ -0,0 +1,138 @@
+# certificates/report_cache.py
+"""
+Versioned caching of report data and the reports PDF.
+
+A DataVersion row ("reports") is bumped after every change to the daily
+statistics (see statistics.py), i.e. whenever a Certificate or ReissueLog
+change affects the reports. Bumps wait for the surrounding transaction to
+commit and are merged, so a transaction touching many rows writes each
+version once. Cached report data and
+PDF bytes are stored under that version (and the local date, which appears
+on the PDF), so a new version simply misses the cache and is rebuilt once;
+old entries expire on their own.
+
+A second version ("certificates") is bumped by every Certificate write:
+saves and deletes through signals (see signals.py), while batch generation,
+which bypasses them, calls bump(CERTIFICATES) itself. It keys the filtered
+certificate counts of list_certificates, which depend on fields the
+statistics do not track. Being stored in the database, a bump made by the
+generation worker is seen by every web process.
+
+The version also gives reports and reports_pdf their ETag and Last-Modified
+headers, so repeated refreshes are answered with 304 Not Modified. Both
+validators of the PDF also change with the local date it prints.
+"""
+from datetime import datetime, time
+
+from django.contrib import messages
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from certificates.artifact_store import bytes_digest
+
+REPORTS = "reports"
+CERTIFICATES = "certificates"
+CACHE_SECONDS = 60 * 60 * 24
+
+
+def _row(name):
+    from certificates.models import DataVersion
+
+    row = DataVersion.objects.filter(name=name).first()
+    if row is None:
+        try:
+            with transaction.atomic():
+                row = DataVersion.objects.create(name=name)
+        except IntegrityError:
+            row = DataVersion.objects.get(name=name)
+    return row
+
+
+def _bump_now(name):
+    from certificates.models import DataVersion
+
+    if not DataVersion.objects.filter(name=name).update(version=F("version") + 1, updated_at=timezone.now()):
+        _row(name)
+        DataVersion.objects.filter(name=name).update(version=F("version") + 1, updated_at=timezone.now())
+
+
+class _PendingBump:
+    """on_commit callback for one version; recognizable so later bumps can merge into it."""
+
+    def __init__(self, name):
+        self.name = name
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        _bump_now(self.name)
+
+
+def _is_pending(callback, name):
+    return isinstance(callback, _PendingBump) and callback.name == name and not callback.done
+
+
+def bump(name=REPORTS):
+    """
+    Invalidate everything cached under ``name`` once the current transaction
+    commits (immediately outside one). Repeated bumps in a transaction are
+    merged; a rolled back savepoint drops its bump along with its changes.
+    """
+    connection = transaction.get_connection()
+    if any(_is_pending(callback, name) for _, callback, _ in connection.run_on_commit):
+        return
+    transaction.on_commit(_PendingBump(name))
+
+
+def state(request=None, name=REPORTS):
+    """
+    (version, last_modified) for ``name``, read once per request.
+    Stored on the request so the ETag, Last-Modified and view share one query.
+    """
+    attr = f"_data_version_{name}"
+    if request is not None and hasattr(request, attr):
+        return getattr(request, attr)
+    row = _row(name)
+    result = (row.version, row.updated_at)
+    if request is not None:
+        setattr(request, attr, result)
+    return result
+
+
+def etag(request, kind, per_session=False, name=REPORTS):
+    """
+    Strong validator for a cached response. Pages rendered with the session's
+    CSRF token and messages set ``per_session``; they are not validated while
+    messages are waiting to be shown.
+    """
+    version, _ = state(request, name)
+    tag = f"{name}-{kind}-{version}-{timezone.localdate().isoformat()}"
+    if per_session:
+        if len(messages.get_messages(request)):
+            return None
+        tag += f"-{bytes_digest((request.session.session_key or '').encode())[:12]}"
+    return f'"{tag}"'
+
+
+def last_modified(request, name=REPORTS, dated=False):
+    """
+    When ``name`` last changed. Responses that print the local date set
+    ``dated``; they are never older than the start of the local day.
+    """
+    updated_at = state(request, name)[1]
+    if dated:
+        return max(updated_at, timezone.make_aware(datetime.combine(timezone.localdate(), time.min)))
+    return updated_at
+
+
+def get_or_build(request, key, builder, name=REPORTS):
+    """Return the cached value for ``key`` at the current version, building it once."""
+    version, _ = state(request, name)
+    cache_key = f"certificates:{name}:{version}:{timezone.localdate().isoformat()}:{key}"
+    value = cache.get(cache_key)
+    if value is None:
+        value = builder()
+        cache.set(cache_key, value, CACHE_SECONDS)
+    return value
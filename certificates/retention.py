@@ -0,0 +1,218 @@
+# certificates/retention.py
+"""
+Time-based retention for tables that only grow (activity logs, sessions).
+
+Each policy names a model, the datetime field that ages its rows and how
+many days to keep. ``apply(policy)`` moves older rows out of the database:
+
+1. Rows past the cutoff are read in (date, pk) order, BATCH_SIZE at a time.
+2. Each batch is appended, as JSON lines, to gzip files partitioned by local
+   date: ``<RETENTION_ARCHIVE_DIR>/<policy>/<YYYY>/<MM>/<YYYY-MM-DD>.jsonl.gz``.
+   Appending adds a gzip member, which gzip readers treat as one stream.
+3. manifest.json in the policy directory is updated with each file's row
+   count, date and checksum, and with the (date, pk) of the last archived row.
+4. Only then is the batch deleted, in its own short transaction.
+
+If a run stops between steps 3 and 4, the next run skips rows at or before
+the manifest's watermark instead of archiving them twice.
+
+Settings:
+    RETENTION_ARCHIVE_DIR    where archives are written (default BASE_DIR/archives)
+    RETENTION_DAYS           {policy: days} overriding the defaults below
+    RETENTION_BATCH_SIZE     rows archived and deleted per batch (default 1000)
+
+Run ``manage.py apply_retention`` from cron; ``manage.py search_archive``
+reads the archives back.
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+
+from certificates import search
+
+MANIFEST = "manifest.json"
+
+
+@dataclass(frozen=True)
+class Policy:
+    name: str
+    model: str          # "app_label.ModelName"
+    date_field: str     # rows are aged and partitioned by this field
+    days: int           # default days to keep
+    fields: tuple       # values() fields written to the archive
+    search_kind: str = None  # full-text index to remove deleted rows from
+
+    def get_model(self):
+        return apps.get_model(self.model)
+
+    @property
+    def keep_days(self):
+        return getattr(settings, "RETENTION_DAYS", {}).get(self.name, self.days)
+
+
+POLICIES = {
+    policy.name: policy
+    for policy in (
+        Policy(
+            name="activity_logs",
+            model="certificates.ActivityLog",
+            date_field="created_at",
+            days=365,
+            fields=("id", "created_at", "user_id", "user__username", "action_type", "action"),
+            search_kind="activity_log",
+        ),
+        # Session payloads hold authentication hashes, so only the key and
+        # expiry are archived
+        Policy(
+            name="sessions",
+            model="sessions.Session",
+            date_field="expire_date",
+            days=7,
+            fields=("session_key", "expire_date"),
+        ),
+    )
+}
+
+
+def archive_root():
+    return Path(getattr(settings, "RETENTION_ARCHIVE_DIR", Path(settings.BASE_DIR) / "archives"))
+
+
+def policy_dir(policy):
+    return archive_root() / policy.name
+
+
+def load_manifest(policy):
+    path = policy_dir(policy) / MANIFEST
+    if not path.exists():
+        return {"policy": policy.name, "files": {}, "watermark": None}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _save_manifest(policy, manifest):
+    directory = policy_dir(policy)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    os.replace(tmp, directory / MANIFEST)
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _partition(policy, day):
+    return Path(f"{day:%Y}") / f"{day:%m}" / f"{day.isoformat()}.jsonl.gz"
+
+
+def _local_day(value):
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+
+
+def cutoff_for(policy, days=None, now=None):
+    return (now or timezone.now()) - timedelta(days=policy.keep_days if days is None else days)
+
+
+def _after_watermark(row, pk_name, date_field, watermark):
+    if watermark is None:
+        return True
+    value, pk = datetime.fromisoformat(watermark[0]), watermark[1]
+    return (row[date_field], row[pk_name]) > (value, pk)
+
+
+def _archive(policy, manifest, rows, pk_name):
+    """Append ``rows`` to their date partitions and record them in the manifest."""
+    directory = policy_dir(policy)
+    by_day = {}
+    for row in rows:
+        by_day.setdefault(_local_day(row[policy.date_field]), []).append(row)
+
+    for day, day_rows in sorted(by_day.items()):
+        relative = _partition(policy, day)
+        path = directory / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "at", encoding="utf-8") as handle:
+            for row in day_rows:
+                handle.write(json.dumps(row, cls=DjangoJSONEncoder, separators=(",", ":")) + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+        entry = manifest["files"].setdefault(str(relative), {"date": day.isoformat(), "rows": 0})
+        entry["rows"] += len(day_rows)
+        entry["bytes"] = path.stat().st_size
+        entry["sha256"] = _sha256(path)
+        entry["updated_at"] = timezone.now().isoformat()
+
+    last = rows[-1]
+    manifest["watermark"] = [last[policy.date_field].isoformat(), last[pk_name]]
+    _save_manifest(policy, manifest)
+
+
+def apply(policy, days=None, batch_size=None, dry_run=False, progress=None):
+    """
+    Archive and delete ``policy``'s rows older than ``days`` (default: its
+    configured retention). Returns {"archived": n, "deleted": n, "cutoff": dt}.
+    With ``dry_run`` nothing is written; "archived" is the number of rows due.
+    """
+    model = policy.get_model()
+    pk_name = model._meta.pk.name
+    batch_size = batch_size or getattr(settings, "RETENTION_BATCH_SIZE", 1000)
+    cutoff = cutoff_for(policy, days)
+    due = model.objects.filter(**{f"{policy.date_field}__lt": cutoff})
+
+    if dry_run:
+        return {"archived": due.count(), "deleted": 0, "cutoff": cutoff}
+
+    policy_dir(policy).mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(policy)
+    fields = policy.fields if pk_name in policy.fields else (pk_name, *policy.fields)
+    archived = deleted = 0
+
+    while True:
+        rows = list(due.order_by(policy.date_field, pk_name).values(*fields)[:batch_size])
+        if not rows:
+            break
+        fresh = [row for row in rows if _after_watermark(row, pk_name, policy.date_field, manifest["watermark"])]
+        if fresh:
+            _archive(policy, manifest, fresh, pk_name)
+            archived += len(fresh)
+        ids = [row[pk_name] for row in rows]
+        with transaction.atomic():
+            count, _ = model.objects.filter(pk__in=ids).delete()
+            if policy.search_kind:
+                search.remove(policy.search_kind, ids)
+        deleted += count
+        if progress:
+            progress(archived, deleted)
+
+    return {"archived": archived, "deleted": deleted, "cutoff": cutoff}
+
+
+def read(policy, start=None, end=None):
+    """Yield archived rows (dicts) of ``policy`` for local dates in [start, end]."""
+    manifest = load_manifest(policy)
+    for relative, entry in sorted(manifest["files"].items(), key=lambda item: item[1]["date"]):
+        day = entry["date"]
+        if (start and day < start.isoformat()) or (end and day > end.isoformat()):
+            continue
+        path = policy_dir(policy) / relative
+        if not path.exists():
+            continue
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                yield json.loads(line)
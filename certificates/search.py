@@ -0,0 +1,293 @@
+# certificates/search.py
+"""
+Full-text search over certificates (name, address) and activity logs
+(action, username, first and last name).
+
+Each searchable kind has a side index keyed by the source row's id:
+
+- SQLite: an FTS5 virtual table ranked with bm25().
+- PostgreSQL: a table of weighted tsvectors with a GIN index, ranked with
+  ts_rank().
+- Other databases fall back to icontains, without an index.
+
+Searches match every word of the query as a prefix of a word in the indexed
+text ("jua dela" finds "Juan Dela Cruz"), in any column.
+
+The indexes are created by migration 0031 and kept in sync by signals
+(Certificate save/delete, ActivityLog save, name changes on User). Code that
+writes rows without signals (bulk_create, raw deletes) calls update() and
+remove() itself. ``manage.py rebuild_search_index`` repopulates them.
+"""
+import re
+from dataclasses import dataclass
+
+from django.db import connection as default_connection
+from django.db.models.expressions import RawSQL
+
+
+@dataclass(frozen=True)
+class Kind:
+    table: str            # side index table
+    source_table: str     # table whose ids index rows refer to
+    columns: tuple        # indexed columns, in order
+    weights: tuple        # relative column weights for ranking
+    select: str           # SELECT id, <columns...> over the source rows
+    alias: str            # alias of the source table in ``select``
+
+
+KINDS = {
+    "certificate": Kind(
+        table="certificates_certificate_search",
+        source_table="certificates_certificate",
+        columns=("full_name", "address"),
+        weights=(10.0, 4.0),
+        select=(
+            "SELECT c.id, COALESCE(c.full_name, ''), COALESCE(c.address, '') "
+            "FROM certificates_certificate c"
+        ),
+        alias="c",
+    ),
+    "activity_log": Kind(
+        table="certificates_activitylog_search",
+        source_table="certificates_activitylog",
+        columns=("action", "username", "first_name", "last_name"),
+        weights=(1.0, 4.0, 4.0, 4.0),
+        select=(
+            "SELECT l.id, l.action, COALESCE(u.username, ''), COALESCE(u.first_name, ''), COALESCE(u.last_name, '') "
+            "FROM certificates_activitylog l LEFT JOIN auth_user u ON u.id = l.user_id"
+        ),
+        alias="l",
+    ),
+}
+
+# Rows re-indexed per statement
+CHUNK_SIZE = 500
+
+
+def terms(text):
+    """Lower-case words of a query; punctuation and underscores separate words."""
+    return re.findall(r"[^\W_]+", (text or "").lower())
+
+
+class SqliteBackend:
+    """FTS5 virtual tables (rowid = source id) with prefix indexes for 2-3 characters."""
+
+    def install(self, cursor):
+        for kind in KINDS.values():
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {kind.table} USING fts5("
+                f"{', '.join(kind.columns)}, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+
+    def uninstall(self, cursor):
+        for kind in KINDS.values():
+            cursor.execute(f"DROP TABLE IF EXISTS {kind.table}")
+
+    def insert_sql(self, kind, where=""):
+        return f"INSERT INTO {kind.table} (rowid, {', '.join(kind.columns)}) {kind.select} {where}"
+
+    def delete_sql(self, kind, placeholders):
+        return f"DELETE FROM {kind.table} WHERE rowid IN ({placeholders})"
+
+    def update_sql(self, kind, placeholders):
+        # FTS5 has no upsert; SQLite serializes writers, so delete and re-insert
+        where = f"WHERE {kind.alias}.id IN ({placeholders})"
+        return [self.delete_sql(kind, placeholders), self.insert_sql(kind, where)]
+
+    def clear_sql(self, kind):
+        return f"DELETE FROM {kind.table}"
+
+    def query(self, words):
+        return " ".join(f'"{word}"*' for word in words)
+
+    def ids_sql(self, kind):
+        return f"SELECT rowid FROM {kind.table} WHERE {kind.table} MATCH %s"
+
+    def rank_sql(self, kind):
+        # bm25() is lower for better matches
+        weights = ", ".join(str(w) for w in kind.weights)
+        return (
+            f"SELECT -bm25({kind.table}, {weights}) FROM {kind.table} "
+            f"WHERE {kind.table} MATCH %s AND rowid = {kind.source_table}.id"
+        )
+
+
+class PostgresBackend:
+    """Weighted tsvectors ('simple' configuration, no stemming) with a GIN index."""
+
+    LABELS = "ABCD"
+
+    def install(self, cursor):
+        for kind in KINDS.values():
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {kind.table} ("
+                f"id bigint PRIMARY KEY REFERENCES {kind.source_table} (id) ON DELETE CASCADE "
+                f"DEFERRABLE INITIALLY DEFERRED, document tsvector NOT NULL)"
+            )
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {kind.table}_gin ON {kind.table} USING gin (document)")
+
+    def uninstall(self, cursor):
+        for kind in KINDS.values():
+            cursor.execute(f"DROP TABLE IF EXISTS {kind.table}")
+
+    def _labels(self, kind):
+        # Heaviest column gets weight A
+        order = sorted(range(len(kind.columns)), key=lambda i: -kind.weights[i])
+        labels = [""] * len(kind.columns)
+        for rank, index in enumerate(order):
+            labels[index] = self.LABELS[min(rank, 3)]
+        return labels
+
+    def insert_sql(self, kind, where=""):
+        document = " || ".join(
+            f"setweight(to_tsvector('simple', s.col{i}), '{label}')"
+            for i, label in enumerate(self._labels(kind), start=1)
+        )
+        names = ", ".join(["id"] + [f"col{i}" for i in range(1, len(kind.columns) + 1)])
+        return (
+            f"INSERT INTO {kind.table} (id, document) "
+            f"SELECT s.id, {document} FROM ({kind.select} {where}) AS s ({names})"
+        )
+
+    def delete_sql(self, kind, placeholders):
+        return f"DELETE FROM {kind.table} WHERE id IN ({placeholders})"
+
+    def update_sql(self, kind, placeholders):
+        # Upsert, so concurrent updates of one row cannot both insert it;
+        # then drop index rows whose source row is gone
+        where = f"WHERE {kind.alias}.id IN ({placeholders})"
+        return [
+            f"{self.insert_sql(kind, where)} ON CONFLICT (id) DO UPDATE SET document = EXCLUDED.document",
+            f"DELETE FROM {kind.table} WHERE id IN ({placeholders}) AND NOT EXISTS "
+            f"(SELECT 1 FROM {kind.source_table} WHERE {kind.source_table}.id = {kind.table}.id)",
+        ]
+
+    def clear_sql(self, kind):
+        return f"TRUNCATE {kind.table}"
+
+    def query(self, words):
+        return " & ".join(f"{word}:*" for word in words)
+
+    def ids_sql(self, kind):
+        return f"SELECT id FROM {kind.table} WHERE document @@ to_tsquery('simple', %s)"
+
+    def rank_sql(self, kind):
+        return (
+            f"SELECT ts_rank(document, to_tsquery('simple', %s)) FROM {kind.table} "
+            f"WHERE id = {kind.source_table}.id"
+        )
+
+
+def get_backend(connection=None):
+    """Index backend for the connection's database, or None to search with icontains."""
+    vendor = (connection or default_connection).vendor
+    if vendor == "sqlite":
+        return SqliteBackend()
+    if vendor == "postgresql":
+        return PostgresBackend()
+    return None
+
+
+# -------------------------------------------------
+# INDEX MAINTENANCE
+# -------------------------------------------------
+def install(connection=None):
+    connection = connection or default_connection
+    backend = get_backend(connection)
+    if backend:
+        with connection.cursor() as cursor:
+            backend.install(cursor)
+
+
+def uninstall(connection=None):
+    connection = connection or default_connection
+    backend = get_backend(connection)
+    if backend:
+        with connection.cursor() as cursor:
+            backend.uninstall(cursor)
+
+
+def update(kind_name, ids, connection=None):
+    """(Re-)index the source rows with these ids; ids that no longer exist are dropped."""
+    connection = connection or default_connection
+    backend = get_backend(connection)
+    ids = list(ids)
+    if backend is None or not ids:
+        return
+    kind = KINDS[kind_name]
+    with connection.cursor() as cursor:
+        for start in range(0, len(ids), CHUNK_SIZE):
+            chunk = ids[start:start + CHUNK_SIZE]
+            for sql in backend.update_sql(kind, ", ".join(["%s"] * len(chunk))):
+                cursor.execute(sql, chunk)
+
+
+def remove(kind_name, ids, connection=None):
+    connection = connection or default_connection
+    backend = get_backend(connection)
+    ids = list(ids)
+    if backend is None or not ids:
+        return
+    kind = KINDS[kind_name]
+    with connection.cursor() as cursor:
+        for start in range(0, len(ids), CHUNK_SIZE):
+            chunk = ids[start:start + CHUNK_SIZE]
+            cursor.execute(backend.delete_sql(kind, ", ".join(["%s"] * len(chunk))), chunk)
+
+
+def rebuild(kind_names=None, connection=None):
+    """Repopulate the indexes from their source tables. Returns {kind: rows}."""
+    connection = connection or default_connection
+    backend = get_backend(connection)
+    counts = {}
+    if backend is None:
+        return counts
+    with connection.cursor() as cursor:
+        for name in kind_names or KINDS:
+            kind = KINDS[name]
+            cursor.execute(backend.clear_sql(kind))
+            cursor.execute(backend.insert_sql(kind))
+            cursor.execute(f"SELECT COUNT(*) FROM {kind.table}")
+            counts[name] = cursor.fetchone()[0]
+    return counts
+
+
+# -------------------------------------------------
+# QUERYING
+# -------------------------------------------------
+def _fallback(queryset, kind_name, words):
+    from django.db.models import Q
+
+    lookups = {
+        "certificate": ("full_name", "address"),
+        "activity_log": ("action", "user__username", "user__first_name", "user__last_name"),
+    }[kind_name]
+    for word in words:
+        q = Q()
+        for lookup in lookups:
+            q |= Q(**{f"{lookup}__icontains": word})
+        queryset = queryset.filter(q)
+    return queryset
+
+
+def matching(queryset, kind_name, text, rank=False):
+    """
+    Restrict ``queryset`` (of the kind's model) to rows matching ``text``.
+    With ``rank``, annotate ``search_rank`` (higher is better) and order by it.
+    """
+    words = terms(text)
+    if not words:
+        return queryset.none()
+
+    backend = get_backend()
+    if backend is None:
+        return _fallback(queryset, kind_name, words)
+
+    kind = KINDS[kind_name]
+    query = backend.query(words)
+    queryset = queryset.filter(pk__in=RawSQL(backend.ids_sql(kind), [query]))
+    if rank:
+        queryset = queryset.annotate(search_rank=RawSQL(backend.rank_sql(kind), [query])).order_by(
+            "-search_rank", "-pk"
+        )
+    return queryset
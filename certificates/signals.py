@@ -1,57 +1,149 @@
 from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
+from django.db.models.signals import post_init, post_save, post_delete, pre_save
 from django.dispatch import receiver
-from django.utils import timezone
 from django.contrib.auth.models import User
-from .models import ActivityLog
+from .models import ActivityLog, AdminSignature, Certificate, CertificateTemplate, FailedLogin, ReissueLog
+from . import audit, claims, report_cache, search, signatures, statistics, template_registry, verification
 
 # ---------------- LOGIN ----------------
 @receiver(user_logged_in)
 def log_user_login(sender, request, user, **kwargs):
     """Logs successful user login"""
     if user and user.is_authenticated:
-        ActivityLog.objects.create(
-            user=user,
-            action_type='login',
-            action=f"{user.username} logged in"
-        )
+        audit.log(user, f"{user.username} logged in", action_type='login')
 
 # ---------------- LOGOUT ----------------
 @receiver(user_logged_out)
 def log_user_logout(sender, request, user, **kwargs):
     """Logs user logout"""
     if user and user.is_authenticated:
-        ActivityLog.objects.create(
-            user=user,
-            action_type='logout',
-            action=f"{user.username} logged out"
-        )
+        audit.log(user, f"{user.username} logged out", action_type='logout')
 
 # ---------------- FAILED LOGIN ----------------
 @receiver(user_login_failed)
 def log_failed_login(sender, credentials, request, **kwargs):
     """
-    Logs failed login attempts (prevents duplicates within 5 seconds)
+    Counts failed login attempts per username and logs them (at most one log
+    per username within FailedLogin.DEBOUNCE_SECONDS)
     """
     username = credentials.get('username', None)
     if not username:
         return
 
-    # Avoid duplicate logs within 5 seconds
-    last_log = ActivityLog.objects.filter(
-        action__icontains=f"Failed login attempt for username: {username}"
-    ).order_by('-created_at').first()
+    if not FailedLogin.record(username):
+        return
+
+    # Associate the User if it exists (unique username index)
+    user = User.objects.filter(username=username).first()
+
+    # Security event: written immediately rather than buffered
+    audit.log(user, f"Failed login attempt for username: {username}", action_type='failed', critical=True)
+
+# ---------------- TEMPLATE REGISTRY ----------------
+@receiver(post_save, sender=CertificateTemplate)
+@receiver(post_delete, sender=CertificateTemplate)
+def invalidate_certificate_template(sender, instance, **kwargs):
+    """Drops the cached parsed template when a template is uploaded or removed"""
+    template_registry.invalidate(instance.template_type)
+
+# ---------------- SIGNATURE CACHE ----------------
+@receiver(post_save, sender=AdminSignature)
+@receiver(post_delete, sender=AdminSignature)
+def invalidate_admin_signature(sender, instance, **kwargs):
+    """Drops the cached signature when an admin's signature settings change"""
+    signatures.invalidate(instance.admin_user_id)
 
-    if last_log and (timezone.now() - last_log.created_at).total_seconds() < 5:
+# ---------------- CERTIFICATE STATISTICS ----------------
+@receiver(post_init, sender=Certificate)
+def remember_certificate_stats_state(sender, instance, **kwargs):
+    """Keeps the loaded state so a save can move the certificate between stats rows"""
+    instance._stats_state = statistics.snapshot(instance)
+
+@receiver(pre_save, sender=Certificate)
+def load_certificate_stats_state(sender, instance, raw=False, **kwargs):
+    """Reads the stored state when the instance was loaded with deferred fields"""
+    if raw or instance._state.adding or instance._stats_state is not None:
+        return
+    stored = Certificate.objects.filter(pk=instance.pk).only(*statistics.TRACKED_FIELDS).first()
+    instance._stats_state = stored._stats_state if stored else None
+
+@receiver(post_save, sender=Certificate)
+def update_certificate_stats(sender, instance, created, raw=False, **kwargs):
+    """Moves the certificate's counts to the stats row matching its new state"""
+    if raw:
         return
+    statistics.record_certificate(instance, old=None if created else instance._stats_state)
+
+@receiver(post_delete, sender=Certificate)
+def remove_certificate_stats(sender, instance, **kwargs):
+    """Removes a deleted certificate's counts"""
+    statistics.record_certificate(instance, old=instance._stats_state or statistics.snapshot(instance), deleted=True)
+
+@receiver(post_save, sender=ReissueLog)
+def count_reissue(sender, instance, created, raw=False, **kwargs):
+    """Counts a reissue on its day"""
+    if created and not raw:
+        statistics.record_reissue(instance)
 
-    # Try to associate the User if it exists
+@receiver(post_delete, sender=ReissueLog)
+def uncount_reissue(sender, instance, **kwargs):
+    """Removes a deleted reissue from its day"""
     try:
-        user = User.objects.get(username=username)
-    except User.DoesNotExist:
-        user = None
-
-    ActivityLog.objects.create(
-        user=user,
-        action_type='failed',
-        action=f"Failed login attempt for username: {username}"
-    )
+        statistics.record_reissue(instance, delta=-1)
+    except Certificate.DoesNotExist:
+        # Cascade from a deleted certificate; its rows are adjusted separately
+        pass
+
+# ---------------- SEARCH INDEX ----------------
+def _touches(update_fields, names):
+    return update_fields is None or bool(set(update_fields) & set(names))
+
+@receiver(post_save, sender=Certificate)
+def index_certificate(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Re-indexes a certificate's name and address"""
+    if not raw and _touches(update_fields, ("full_name", "address")):
+        search.update("certificate", [instance.pk])
+
+@receiver(post_delete, sender=Certificate)
+def unindex_certificate(sender, instance, **kwargs):
+    search.remove("certificate", [instance.pk])
+
+@receiver(post_save, sender=ActivityLog)
+def index_activity_log(sender, instance, created, raw=False, **kwargs):
+    """Indexes logs saved one at a time (buffered logs are indexed by audit.flush)"""
+    if not raw:
+        search.update("activity_log", [instance.pk])
+
+@receiver(post_save, sender=User)
+def reindex_user_activity(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """Keeps a user's logs findable by their current name"""
+    if raw or created or not _touches(update_fields, ("username", "first_name", "last_name")):
+        return
+    search.update("activity_log", ActivityLog.objects.filter(user=instance).values_list("pk", flat=True).iterator())
+
+# ---------------- VERIFICATION CACHE ----------------
+@receiver(post_save, sender=Certificate)
+@receiver(post_delete, sender=Certificate)
+def invalidate_verification(sender, instance, **kwargs):
+    """Drops the cached verification result when a certificate is reissued, changed or removed"""
+    verification.invalidate(instance.verification_token, instance.unique_id)
+
+# ---------------- CERTIFICATE DATA VERSION ----------------
+@receiver(post_save, sender=Certificate)
+@receiver(post_delete, sender=Certificate)
+def bump_certificate_version(sender, instance, **kwargs):
+    """Invalidates the cached certificate list counts in every process"""
+    report_cache.bump(report_cache.CERTIFICATES)
+
+# ---------------- CLAIM REVOCATION ----------------
+@receiver(post_save, sender=ReissueLog)
+def revoke_reissued_claims(sender, instance, created, raw=False, **kwargs):
+    """Revokes signed QR claims printed before the reissue"""
+    if created and not raw:
+        cert = instance.certificate
+        claims.revoke(cert.unique_id, before=cert.reissue_date or instance.reissued_at, reason="reissued")
+
+@receiver(post_delete, sender=Certificate)
+def revoke_deleted_claims(sender, instance, **kwargs):
+    """Revokes every signed QR claim of a deleted certificate"""
+    claims.revoke(instance.unique_id, reason="deleted")
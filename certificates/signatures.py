@@ -0,0 +1,145 @@
+# certificates/signatures.py
+"""
+Prepared signature images for certificate rendering.
+
+Uploaded signatures can be large photos or scans, but they are printed at
+40x12mm. DigitalSignatureForm stores a derivative alongside the original:
+margins trimmed, downscaled to DERIVATIVE_DPI at the printed size, and saved
+as an optimized palette PNG. Renders embed that derivative.
+
+The signature to use for each admin is resolved once per worker and kept for
+CACHE_SECONDS, so generation does not query AdminSignature every time. Saves
+and deletes invalidate the entry explicitly (see signals.py).
+"""
+import io
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageChops, ImageOps
+
+from certificates import artifact_store
+
+WIDTH_MM = 40
+HEIGHT_MM = 12
+DERIVATIVE_DPI = 300
+# Bump when make_derivative() changes so the default signature is prepared again
+DERIVATIVE_VERSION = 1
+# How long a resolved signature is trusted before AdminSignature is queried
+# again. Covers uploads handled by another worker process.
+CACHE_SECONDS = 300
+
+_lock = threading.Lock()
+_by_user = {}  # user id -> (derivative Path or None, resolved_at)
+
+
+def _content_box(image):
+    """Bounding box of the ink: opaque pixels, or non-white ones without alpha."""
+    if image.mode == "RGBA" and image.getextrema()[3][0] < 255:
+        return image.getchannel("A").point(lambda a: 255 if a > 16 else 0).getbbox()
+    gray = ImageOps.grayscale(image)
+    return ImageChops.invert(gray).point(lambda v: 255 if v > 16 else 0).getbbox()
+
+
+def make_derivative(source):
+    """
+    Return PNG bytes of a normalized signature for embedding.
+    ``source`` is a path or file-like object.
+    """
+    with Image.open(source) as im:
+        im = ImageOps.exif_transpose(im).convert("RGBA")
+
+    box = _content_box(im)
+    if box:
+        pad = max(2, (box[3] - box[1]) // 20)
+        im = im.crop((
+            max(0, box[0] - pad), max(0, box[1] - pad),
+            min(im.width, box[2] + pad), min(im.height, box[3] + pad),
+        ))
+
+    max_px = (round(WIDTH_MM / 25.4 * DERIVATIVE_DPI), round(HEIGHT_MM / 25.4 * DERIVATIVE_DPI))
+    im.thumbnail(max_px, Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    im.quantize(colors=256, method=Image.Quantize.FASTOCTREE).save(buffer, format="PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def store_derivative(field_file, source):
+    """
+    Prepare ``source`` and point ``field_file`` (an unsaved model's
+    signature_derivative) at it. Files are named after their content, so an
+    identical derivative is reused rather than stored again.
+    """
+    data = make_derivative(source)
+    name = f"{artifact_store.bytes_digest(data)[:16]}.png"
+    stored_name = field_file.field.generate_filename(field_file.instance, name)
+    if field_file.storage.exists(stored_name):
+        field_file.name = stored_name
+    else:
+        field_file.save(name, ContentFile(data), save=False)
+
+
+def _default_derivative():
+    """Derivative of MEDIA_ROOT/signatures/default_signature.png, stored once per version."""
+    default_path = Path(settings.MEDIA_ROOT) / "signatures" / "default_signature.png"
+    if not default_path.exists():
+        return None
+    key = artifact_store.artifact_key(
+        kind="signature", version=DERIVATIVE_VERSION, source=artifact_store.file_digest(default_path)
+    )
+    name = f"signatures/derived/default_{key[:16]}.png"
+    if not artifact_store.exists(name):
+        artifact_store.write(name, data=make_derivative(default_path))
+    return artifact_store.artifact_path(name)
+
+
+def _resolve(user):
+    from certificates.models import AdminSignature
+
+    try:
+        admin_signature = AdminSignature.objects.get(admin_user=user)
+    except AdminSignature.DoesNotExist:
+        return _default_derivative()
+
+    if admin_signature.bypass_digital_signature:
+        return None
+    if not (admin_signature.signature_image and admin_signature.signature_image.name):
+        return _default_derivative()
+
+    original = Path(settings.MEDIA_ROOT) / admin_signature.signature_image.name
+    if not original.exists():
+        return None
+    derivative = admin_signature.signature_derivative
+    if not (derivative and derivative.name and Path(derivative.path).exists()):
+        # Signatures uploaded before derivatives existed are prepared on first use
+        store_derivative(admin_signature.signature_derivative, original)
+        admin_signature.save(update_fields=["signature_derivative"])
+        derivative = admin_signature.signature_derivative
+    return Path(derivative.path)
+
+
+def get_signature_path(user):
+    """Prepared signature image for ``user``, or None to leave space for manual signing."""
+    if user is None:
+        return None
+    now = time.monotonic()
+    entry = _by_user.get(user.pk)
+    if entry is not None and now - entry[1] < CACHE_SECONDS and (entry[0] is None or entry[0].exists()):
+        return entry[0]
+
+    path = _resolve(user)
+    with _lock:
+        _by_user[user.pk] = (path, now)
+    return path
+
+
+def invalidate(user_id=None):
+    """Forget the cached signature for one admin, or for everyone."""
+    with _lock:
+        if user_id is None:
+            _by_user.clear()
+        else:
+            _by_user.pop(user_id, None)
@@ -0,0 +1,224 @@
+# certificates/statistics.py
+"""
+Pre-aggregated certificate statistics (CertificateDailyStat).
+
+Each certificate contributes to one row keyed by its local creation date,
+document type, purpose and status: ``certificates`` counts it, and
+``reissued_certificates`` counts it if it has been reissued. Each ReissueLog
+adds to ``reissues`` on the row for its local reissue date and document
+type, with an empty purpose and status. A reissue is not tied to the
+certificate's later status, so live updates and rebuild() always agree.
+
+Rows are kept current by signals (see signals.py). A change moves the
+certificate's contribution from its old key to its new one, inside the
+transaction that saves it. Code that bypasses signals (bulk_update) calls
+record_changes() itself. ``manage.py rebuild_certificate_stats`` recomputes
+rows from scratch for backfills or repairs.
+"""
+from collections import defaultdict
+
+from django.apps import apps as django_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Q, Sum, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from certificates import report_cache
+
+COUNTERS = ("certificates", "reissued_certificates", "reissues")
+TRACKED_FIELDS = ("created_at", "document_type", "purpose", "status", "reissued")
+
+
+def _local_date(value):
+    if value is None:
+        value = timezone.now()
+    return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+
+
+def snapshot(cert):
+    """
+    The statistics key and reissued flag of a certificate as loaded, or None
+    when any tracked field was deferred (never triggers a query).
+    """
+    if cert.pk is None or any(name not in cert.__dict__ for name in TRACKED_FIELDS):
+        return None
+    return _state(cert)
+
+
+def _state(cert):
+    key = (_local_date(cert.created_at), cert.document_type, cert.purpose or "", (cert.status or "").upper())
+    return key, bool(cert.reissued)
+
+
+def _apply(deltas):
+    """Add ``{key: {counter: delta}}`` to the stats rows, creating missing rows."""
+    from certificates.models import CertificateDailyStat
+
+    changed = False
+    for (date, document_type, purpose, status), counters in deltas.items():
+        counters = {name: value for name, value in counters.items() if value}
+        if not counters:
+            continue
+        changed = True
+        lookup = {"date": date, "document_type": document_type, "purpose": purpose, "status": status}
+        updates = {name: F(name) + value for name, value in counters.items()}
+        if CertificateDailyStat.objects.filter(**lookup).update(**updates):
+            continue
+        try:
+            with transaction.atomic():
+                CertificateDailyStat.objects.create(**lookup, **counters)
+        except IntegrityError:
+            # Another transaction created the row first
+            CertificateDailyStat.objects.filter(**lookup).update(**updates)
+    if changed:
+        report_cache.bump()
+
+
+def _certificate_deltas(deltas, old, new):
+    if old == new:
+        return
+    if old is not None:
+        key, reissued = old
+        deltas[key]["certificates"] -= 1
+        deltas[key]["reissued_certificates"] -= int(reissued)
+    if new is not None:
+        key, reissued = new
+        deltas[key]["certificates"] += 1
+        deltas[key]["reissued_certificates"] += int(reissued)
+
+
+def record_certificate(cert, old=None, deleted=False):
+    """Move ``cert``'s contribution from its previous state ``old`` to its current one."""
+    deltas = defaultdict(lambda: defaultdict(int))
+    _certificate_deltas(deltas, old, None if deleted else _state(cert))
+    _apply(deltas)
+    cert._stats_state = None if deleted else _state(cert)
+
+
+def record_changes(certs):
+    """Apply changes made to loaded certificates without signals (e.g. bulk_update)."""
+    deltas = defaultdict(lambda: defaultdict(int))
+    for cert in certs:
+        new = _state(cert)
+        _certificate_deltas(deltas, getattr(cert, "_stats_state", None), new)
+        cert._stats_state = new
+    _apply(deltas)
+
+
+def _reissue_key(day, document_type):
+    return (day, document_type, "", "")
+
+
+def record_reissue(log, delta=1):
+    _apply({_reissue_key(_local_date(log.reissued_at), log.certificate.document_type): {"reissues": delta}})
+
+
+# -------------------------------------------------
+# REBUILD
+# -------------------------------------------------
+def rebuild(start=None, end=None, apps=None):
+    """
+    Recompute stats rows from Certificate and ReissueLog, optionally only for
+    local dates in [start, end]. Returns the number of rows written.
+    ``apps`` is the historical app registry when called from a migration.
+    """
+    if apps is None:
+        apps = django_apps
+    Certificate = apps.get_model("certificates", "Certificate")
+    CertificateDailyStat = apps.get_model("certificates", "CertificateDailyStat")
+    ReissueLog = apps.get_model("certificates", "ReissueLog")
+
+    tz = timezone.get_current_timezone()
+    rows = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+    certs = Certificate.objects.annotate(day=TruncDate("created_at", tzinfo=tz))
+    logs = ReissueLog.objects.annotate(day=TruncDate("reissued_at", tzinfo=tz))
+    stats = CertificateDailyStat.objects.all()
+    if start:
+        certs, logs, stats = certs.filter(day__gte=start), logs.filter(day__gte=start), stats.filter(date__gte=start)
+    if end:
+        certs, logs, stats = certs.filter(day__lte=end), logs.filter(day__lte=end), stats.filter(date__lte=end)
+
+    for row in certs.values("day", "document_type", "purpose", "status").annotate(
+        total=Count("id"),
+        reissued_total=Count("id", filter=Q(reissued=True)),
+    ).order_by():
+        key = (row["day"], row["document_type"], row["purpose"] or "", (row["status"] or "").upper())
+        rows[key]["certificates"] += row["total"]
+        rows[key]["reissued_certificates"] += row["reissued_total"]
+
+    for row in logs.values("day", "certificate__document_type").annotate(total=Count("id")).order_by():
+        rows[_reissue_key(row["day"], row["certificate__document_type"])]["reissues"] += row["total"]
+
+    with transaction.atomic():
+        stats.delete()
+        CertificateDailyStat.objects.bulk_create(
+            [
+                CertificateDailyStat(date=date, document_type=document_type, purpose=purpose, status=status, **counters)
+                for (date, document_type, purpose, status), counters in rows.items()
+            ],
+            batch_size=1000,
+        )
+        if apps is django_apps:
+            report_cache.bump()
+    return len(rows)
+
+
+# -------------------------------------------------
+# READ API (dashboard and reports)
+# -------------------------------------------------
+# A certificate counts toward the "generated + reissued" breakdowns when it is
+# completed, or when it was reissued in any other status.
+_COMPLETED_OR_REISSUED = Sum(Case(
+    When(status="COMPLETED", then=F("certificates")),
+    default=F("reissued_certificates"),
+))
+
+
+def totals():
+    """Generated (completed), pending and reissued counts."""
+    from certificates.models import CertificateDailyStat
+
+    result = CertificateDailyStat.objects.aggregate(
+        generated=Sum("certificates", filter=Q(status="COMPLETED")),
+        pending=Sum("certificates", filter=Q(status="PENDING")),
+        reissued=Sum("reissues"),
+    )
+    result = {name: value or 0 for name, value in result.items()}
+    result["total"] = result["generated"] + result["reissued"]
+    return result
+
+
+def certificate_count():
+    """Number of certificates, without counting the certificate table."""
+    from certificates.models import CertificateDailyStat
+
+    return CertificateDailyStat.objects.aggregate(total=Sum("certificates"))["total"] or 0
+
+
+def counts_by_type():
+    """[{document_type, total}] of completed-or-reissued certificates plus reissues."""
+    from certificates.models import CertificateDailyStat
+
+    rows = (
+        CertificateDailyStat.objects.values("document_type")
+        .annotate(certs=_COMPLETED_OR_REISSUED, reissue_total=Sum("reissues"))
+        .order_by("document_type")
+    )
+    return [
+        {"document_type": r["document_type"], "total": r["certs"] + r["reissue_total"]}
+        for r in rows if r["certs"]
+    ]
+
+
+def counts_by_purpose():
+    """[{purpose, total}] of completed-or-reissued certificates."""
+    from certificates.models import CertificateDailyStat
+
+    rows = (
+        CertificateDailyStat.objects.values("purpose")
+        .annotate(total=_COMPLETED_OR_REISSUED)
+        .order_by("purpose")
+    )
+    return [{"purpose": r["purpose"] or None, "total": r["total"]} for r in rows if r["total"]]
+
@@ -0,0 +1,125 @@
+# certificates/template_registry.py
+"""
+Process-wide registry of parsed certificate templates.
+
+Each DOCX template is parsed once per worker and kept as a pristine
+python-docx ``Document``. Renders receive a ``DocxTemplate`` wrapping a deep
+copy of that document, which is several times cheaper than re-reading and
+re-parsing the zip archive on every request.
+
+Entries are keyed on the template type plus the file's path, mtime and size,
+so a replaced file is picked up on the next render. Uploads through
+``CertificateTemplate`` also invalidate the entry explicitly (see signals.py).
+"""
+import copy
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from docx import Document
+from docxtpl import DocxTemplate
+
+from certificates.artifact_store import file_digest
+from certificates.utils import TEMPLATE_MAP
+
+# How long a resolved template path is trusted before CertificateTemplate is
+# queried again. Covers uploads handled by another worker process.
+PATH_CACHE_SECONDS = 300
+
+_lock = threading.Lock()
+_paths = {}      # document_type -> (resolved Path or None, resolved_at)
+_templates = {}  # document_type -> (path, mtime_ns, size, Document)
+
+
+def _resolve_template_path(document_type):
+    """
+    Uploaded CertificateTemplate first, then the default file from TEMPLATE_MAP.
+    """
+    from certificates.models import CertificateTemplate
+
+    uploaded_template = CertificateTemplate.objects.filter(template_type=document_type).first()
+    if uploaded_template and uploaded_template.file:
+        return Path(uploaded_template.file.path)
+
+    tpl_filename = TEMPLATE_MAP.get(document_type)
+    if tpl_filename:
+        return Path(settings.MEDIA_ROOT) / "certificate_templates" / tpl_filename
+    return None
+
+
+def get_template_path(document_type):
+    """Return the cached template path for a document type (may be None)."""
+    cached = _paths.get(document_type)
+    if cached and time.monotonic() - cached[1] < PATH_CACHE_SECONDS:
+        return cached[0]
+
+    tpl_path = _resolve_template_path(document_type)
+    with _lock:
+        _paths[document_type] = (tpl_path, time.monotonic())
+    return tpl_path
+
+
+def _load_document(document_type):
+    """Return the pristine parsed Document for a type, re-parsing only on change."""
+    tpl_path = get_template_path(document_type)
+    if not tpl_path:
+        return None, None
+
+    try:
+        stat = tpl_path.stat()
+    except OSError:
+        return tpl_path, None
+
+    cached = _templates.get(document_type)
+    if cached and cached[0] == tpl_path and cached[1] == stat.st_mtime_ns and cached[2] == stat.st_size:
+        return tpl_path, cached[3]
+
+    document = Document(str(tpl_path))
+    with _lock:
+        _templates[document_type] = (tpl_path, stat.st_mtime_ns, stat.st_size, document)
+    return tpl_path, document
+
+
+def get_template(document_type):
+    """
+    Return a fresh DocxTemplate ready for rendering, or None if the template
+    file for this document type is missing.
+    """
+    tpl_path, document = _load_document(document_type)
+    if document is None:
+        return None
+
+    doc = DocxTemplate(str(tpl_path))
+    doc.docx = copy.deepcopy(document)
+    return doc
+
+
+def get_template_version(document_type):
+    """Content hash of the current template file, or None if it is missing."""
+    tpl_path = get_template_path(document_type)
+    if not tpl_path or not tpl_path.exists():
+        return None
+    return file_digest(tpl_path)
+
+
+def prime_paths(paths):
+    """
+    Seed resolved template paths ({document_type: Path}) without querying the
+    database, e.g. in batch worker processes.
+    """
+    now = time.monotonic()
+    with _lock:
+        for document_type, tpl_path in paths.items():
+            _paths[document_type] = (tpl_path, now)
+
+
+def invalidate(document_type=None):
+    """Drop cached entries for one document type, or all of them."""
+    with _lock:
+        if document_type is None:
+            _paths.clear()
+            _templates.clear()
+        else:
+            _paths.pop(document_type, None)
+            _templates.pop(document_type, None)
@@ -0,0 +1,22 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from certificates.models import ActivityLog, FailedLogin
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class ActivityLogPageTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser("admin", password="pw"))
+        ActivityLog.objects.create(action="Failed login attempt for username: juan", action_type="failed")
+        ActivityLog.objects.create(action="Generated clearance", action_type="create")
+        FailedLogin.record("juan")
+
+    def test_filters_by_type_without_reading_failed_login_counters(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("certificates:activity_logs"), {"type": "failed"})
+        self.assertEqual([log.action_type for log in response.context["logs"]], ["failed"])
+        self.assertFalse(any("certificates_failedlogin" in query["sql"] for query in queries.captured_queries))
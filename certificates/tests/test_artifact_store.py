@@ -0,0 +1,66 @@
+import os
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+
+from certificates import artifact_store, generation, template_registry
+from certificates.models import Certificate
+from certificates.tests.utils import TempMediaMixin
+
+VERIFY_URL = "http://testserver/certificates/verify/00000000-0000-0000-0000-000000000000/"
+
+
+class ArtifactStoreTests(TempMediaMixin, TestCase):
+    def test_key_ignores_input_order(self):
+        self.assertEqual(artifact_store.artifact_key(a=1, b=[2]), artifact_store.artifact_key(b=[2], a=1))
+        self.assertNotEqual(artifact_store.artifact_key(a=1), artifact_store.artifact_key(a=2))
+
+    def test_failed_write_leaves_nothing_behind(self):
+        name = artifact_store.artifact_name("docx", "ab" * 32, "docx")
+
+        def writer(tmp_path):
+            raise OSError("disk full")
+
+        with self.assertRaises(OSError):
+            artifact_store.write(name, writer=writer)
+        self.assertFalse(artifact_store.exists(name))
+        self.assertEqual(os.listdir(artifact_store.artifact_path(name).parent), [])
+
+    def test_file_digest_follows_content(self):
+        path = self.media_root / "signature.png"
+        path.write_bytes(b"first")
+        first = artifact_store.file_digest(path)
+        path.write_bytes(b"second!")
+        self.assertNotEqual(artifact_store.file_digest(path), first)
+        self.assertEqual(artifact_store.file_digest(path), artifact_store.bytes_digest(b"second!"))
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class GenerationReuseTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_user("admin")
+        self.cert = Certificate.objects.create(full_name="Juan Dela Cruz", document_type="clearance", purpose="Work")
+
+    def test_unchanged_certificate_is_not_rendered_again(self):
+        with mock.patch.object(template_registry, "get_template", wraps=template_registry.get_template) as load:
+            generation.generate_certificate_docx(self.cert, self.admin, VERIFY_URL)
+            name = self.cert.generated_docx.name
+            self.assertTrue(generation.is_up_to_date(self.cert, self.admin, VERIFY_URL))
+            generation.generate_certificate_docx(self.cert, self.admin, VERIFY_URL)
+        self.assertEqual(load.call_count, 1)
+        self.assertEqual(self.cert.generated_docx.name, name)
+        self.assertTrue(name.startswith("generated/docx/"))
+
+    def test_changed_inputs_get_a_new_artifact(self):
+        generation.generate_certificate_docx(self.cert, self.admin, VERIFY_URL)
+        old_name = self.cert.generated_docx.name
+
+        self.cert.full_name = "Juan P. Dela Cruz"
+        self.assertFalse(generation.is_up_to_date(self.cert, self.admin, VERIFY_URL))
+        generation.generate_certificate_docx(self.cert, self.admin, VERIFY_URL)
+        self.assertNotEqual(self.cert.generated_docx.name, old_name)
+        # The earlier file is left for anything still pointing at it
+        self.assertTrue(artifact_store.exists(old_name))
+        self.assertFalse(generation.is_up_to_date(self.cert, self.admin, VERIFY_URL + "?v=2"))
@@ -0,0 +1,82 @@
+import importlib.util
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from certificates import audit
+from certificates.models import ActivityLog
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=True, ACTIVITY_LOG_BUFFER_SIZE=3)
+class BufferedAuditLogTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("juan")
+        # The flusher thread would write on its own connection, outside the test transaction
+        patcher = mock.patch.object(audit, "_ensure_flusher")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(audit._buffer.clear)
+        audit.flush()
+
+    def log(self, action, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            audit.log(self.user, action, **kwargs)
+
+    def test_events_wait_in_the_buffer_until_flushed(self):
+        self.log("Created certificate 1 - Juan")
+        self.log("Created certificate 2 - Ana")
+        self.assertEqual((audit.pending(), ActivityLog.objects.count()), (2, 0))
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(audit.flush(), 2)
+        inserts = [q["sql"] for q in queries if q["sql"].startswith('INSERT INTO "certificates_activitylog"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(audit.pending(), 0)
+        self.assertEqual(
+            list(ActivityLog.objects.order_by("pk").values_list("user__username", "action_type")),
+            [("juan", "create"), ("juan", "create")],
+        )
+
+    def test_full_buffer_is_flushed(self):
+        for i in range(3):
+            self.log(f"Created certificate {i} - Juan")
+        self.assertEqual((audit.pending(), ActivityLog.objects.count()), (0, 3))
+
+    def test_rolled_back_action_is_not_logged(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                audit.log(self.user, "Created certificate 1 - Juan")
+                transaction.set_rollback(True)
+        self.assertEqual(audit.pending(), 0)
+
+    def test_critical_events_are_written_immediately(self):
+        audit.log(None, "Failed login attempt for username: juan", critical=True)
+        self.assertEqual(audit.pending(), 0)
+        self.assertTrue(ActivityLog.objects.filter(action_type="failed").exists())
+
+    def test_failed_flush_keeps_the_events(self):
+        self.log("Created certificate 1 - Juan")
+        with mock.patch.object(ActivityLog.objects, "bulk_create", side_effect=RuntimeError("database is locked")), \
+                self.assertLogs("certificates.audit", "ERROR"):
+            self.assertEqual(audit.flush(), 0)
+        self.assertEqual(audit.pending(), 1)
+        self.assertEqual(audit.flush(), 1)
+        self.assertEqual(ActivityLog.objects.count(), 1)
+
+    def test_old_events_are_due_for_the_background_flush(self):
+        with mock.patch.object(audit.time, "monotonic", return_value=100.0):
+            self.log("Created certificate 1 - Juan")
+        with mock.patch.object(audit.time, "monotonic", return_value=101.0):
+            self.assertFalse(audit._due())
+        with mock.patch.object(audit.time, "monotonic", return_value=102.0):
+            self.assertTrue(audit._due())
+
+    def test_buffer_is_flushed_at_exit(self):
+        spec = importlib.util.spec_from_file_location("audit_copy", audit.__file__)
+        module = importlib.util.module_from_spec(spec)
+        with mock.patch("atexit.register") as register:
+            spec.loader.exec_module(module)
+        register.assert_called_once_with(module.flush)
@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from certificates.models import ActivityLog, FailedLogin
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class AuthActivityLogTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("juan", password="secret-pw")
+
+    def _logs(self, action_type):
+        return list(ActivityLog.objects.filter(action_type=action_type).values_list("user__username", "action"))
+
+    def test_login_and_logout_are_logged(self):
+        self.assertTrue(self.client.login(username="juan", password="secret-pw"))
+        self.client.logout()
+
+        self.assertEqual(self._logs("login"), [("juan", "juan logged in")])
+        self.assertEqual(self._logs("logout"), [("juan", "juan logged out")])
+
+    def test_failed_logins_are_counted_and_logged_once_per_window(self):
+        for _ in range(3):
+            self.assertFalse(self.client.login(username="juan", password="wrong"))
+
+        self.assertEqual(self._logs("failed"), [("juan", "Failed login attempt for username: juan")])
+        self.assertEqual(FailedLogin.objects.get(username="juan").failures, 3)
+
+    def test_failed_login_for_unknown_username_has_no_user(self):
+        self.client.login(username="nobody", password="wrong")
+        self.assertEqual(self._logs("failed"), [(None, "Failed login attempt for username: nobody")])
+
+
+class FailedLoginCounterTests(TestCase):
+    def test_first_attempt_in_each_window_is_logged(self):
+        start = timezone.now()
+        outcomes = [
+            FailedLogin.record("juan", now=start + timedelta(seconds=offset))
+            for offset in (0, 1, FailedLogin.DEBOUNCE_SECONDS, FailedLogin.DEBOUNCE_SECONDS + 1)
+        ]
+        self.assertEqual(outcomes, [True, False, True, False])
+        row = FailedLogin.objects.get(username="juan")
+        self.assertEqual((row.failures, row.last_failed_at), (4, start + timedelta(seconds=FailedLogin.DEBOUNCE_SECONDS + 1)))
+
+    def test_usernames_are_counted_separately(self):
+        FailedLogin.record("juan")
+        self.assertTrue(FailedLogin.record("ana"))
+        self.assertEqual(dict(FailedLogin.objects.values_list("username", "failures")), {"juan": 1, "ana": 1})
+
+    def test_repeat_attempt_costs_two_single_row_updates(self):
+        FailedLogin.record("juan")
+        with self.assertNumQueries(2):
+            FailedLogin.record("juan")
+
+    def test_long_usernames_are_truncated(self):
+        FailedLogin.record("x" * 300)
+        self.assertEqual(FailedLogin.objects.get().username, "x" * 255)
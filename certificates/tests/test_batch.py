@@ -0,0 +1,44 @@
+from django.test import TestCase, override_settings
+
+from certificates import batch
+from certificates.models import Certificate
+
+from .utils import TempMediaMixin
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class BatchGenerationTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.certs = [
+            Certificate.objects.create(full_name=f"Batch Person {i}", document_type=document_type, purpose="Work")
+            for i, document_type in enumerate(["clearance", "residency", "indigency", "clearance"])
+        ]
+
+    def test_generates_every_certificate_over_the_pool(self):
+        seen = []
+        result = batch.generate_certificates(
+            Certificate.objects.all(), workers=2, chunk_size=3, progress=lambda done, total, _: seen.append(done),
+        )
+        self.assertEqual((result.total, result.succeeded, result.failed), (4, 4, 0))
+        self.assertEqual(seen, [1, 2, 3, 4])
+        for cert in Certificate.objects.all():
+            self.assertEqual(cert.status, "COMPLETED")
+            self.assertTrue((self.media_root / cert.generated_docx.name).exists())
+
+    def test_missing_template_fails_only_that_certificate(self):
+        (self.media_root / "certificate_templates" / "indigency.docx").unlink()
+        result = batch.generate_certificates([cert.pk for cert in self.certs], workers=1)
+
+        self.assertEqual(result.succeeded, 3)
+        self.assertEqual(list(result.failures), [self.certs[2].pk])
+        self.assertEqual(Certificate.objects.get(pk=self.certs[2].pk).status, "PENDING")
+
+    def test_certificates_deleted_while_rendering_are_skipped(self):
+        gone, kept = self.certs[0], self.certs[1]
+        Certificate.objects.filter(pk=gone.pk).delete()
+
+        saved = batch._save_results({gone.pk: "generated/docx/a.docx", kept.pk: "generated/docx/b.docx"})
+        self.assertEqual(saved, {kept.pk})
+        kept.refresh_from_db()
+        self.assertEqual((kept.status, kept.generated_docx.name), ("COMPLETED", "generated/docx/b.docx"))
@@ -0,0 +1,82 @@
+import random
+
+from django.core.management import CommandError, call_command
+from django.test import Client, TestCase, override_settings
+
+from benchmarks import runner, seed
+from benchmarks.scenarios import Scenario, by_name
+from certificates.models import ActivityLog, Certificate
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+# Seeding sets passwords for the benchmark users
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class BenchmarkTests(TestCase):
+    def test_parse_scale(self):
+        self.assertEqual(seed.parse_scale("100k"), 100_000)
+        self.assertEqual(seed.parse_scale("2_500"), 2_500)
+        for value in ("huge", "0"):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                seed.parse_scale(value)
+
+    def test_seed_is_reproducible(self):
+        first = [seed._certificate(random.Random(7), i, seed.timezone.now()).full_name for i in range(5)]
+        second = [seed._certificate(random.Random(7), i, seed.timezone.now()).full_name for i in range(5)]
+        self.assertEqual(first, second)
+
+        created = seed.seed(12, seed_value=7)
+        self.assertEqual(created["certificates"], Certificate.objects.count())
+        self.assertEqual(created["activity_logs"], ActivityLog.objects.count())
+        self.assertEqual(Certificate.objects.values("document_type").distinct().count(), 3)
+
+    def test_measure_reports_latency_queries_and_errors(self):
+        statuses = iter([200, 200, 200, 500, 200])
+
+        def run(client, state, i):
+            list(Certificate.objects.all())
+            return FakeResponse(next(statuses))
+
+        result = runner.measure(Scenario("fake", run, iterations=3), None, {})
+        self.assertEqual((result["iterations"], result["errors"], result["queries_max"]), (3, 1, 1))
+        self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+
+    def test_measure_stops_when_sample_data_runs_out(self):
+        def run(client, state, i):
+            return state["pending"].pop()
+
+        self.assertEqual(runner.measure(Scenario("fake", run), None, {"pending": []})["iterations"], 0)
+
+    @override_settings(
+        ACTIVITY_LOG_BUFFERED=False,
+        CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "verification": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "bench-tests"},
+        },
+    )
+    def test_verification_scenario_runs_against_seeded_data(self):
+        seed.seed(9)
+        state = runner._sample_state(random.Random(1), [by_name()["verify_certificate"]])
+        result = runner.measure(by_name()["verify_certificate"], Client(), state, iterations=5)
+        self.assertEqual((result["iterations"], result["errors"]), (5, 0))
+
+    def test_compare_against_a_baseline(self):
+        baseline = {"scenarios": {"reports": {"iterations": 5, "p50_ms": 10.0, "p95_ms": 20.0, "queries_mean": 4}}}
+        current = {"scenarios": {
+            "reports": {"iterations": 5, "p50_ms": 5.0, "p95_ms": 30.0, "queries_mean": 4},
+            "dashboard": {"iterations": 5, "p50_ms": 1.0, "p95_ms": 1.0, "queries_mean": 1},
+        }}
+        self.assertEqual(runner.compare(current, baseline), [
+            ("reports", "p50_ms", 10.0, 5.0, -50.0),
+            ("reports", "p95_ms", 20.0, 30.0, 50.0),
+            ("reports", "queries_mean", 4, 4, 0.0),
+        ])
+
+    def test_command_rejects_bad_options(self):
+        with self.assertRaisesMessage(CommandError, "Unknown scenario(s): nope."):
+            call_command("run_benchmarks", scenario=["nope"])
+        with self.assertRaisesMessage(CommandError, "--iterations must be at least 1."):
+            call_command("run_benchmarks", iterations=0)
@@ -0,0 +1,62 @@
+import json
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from certificates.models import Certificate
+
+
+@override_settings(
+    ACTIVITY_LOG_BUFFERED=False,
+    VERIFICATION_BULK_MAX=3,
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "verification": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "verification"},
+    },
+)
+class BulkVerificationTests(TestCase):
+    def setUp(self):
+        self.url = reverse("certificates:verify_certificates_bulk")
+        self.cert = Certificate.objects.create(
+            full_name="Juan Dela Cruz", document_type="clearance", purpose="Work", status="COMPLETED",
+        )
+
+    def _post(self, body):
+        return self.client.post(self.url, body if isinstance(body, str) else json.dumps(body),
+                                content_type="application/json")
+
+    def _results(self, body):
+        response = self._post(body)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(b"".join(response.streaming_content))["results"]
+
+    def test_rejects_other_methods_and_malformed_bodies(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+        for body in ("not json", "[]", '"tokens"', {"tokens": "abc"}, {"ids": {"a": 1}}):
+            response = self._post(body)
+            self.assertEqual(response.status_code, 400, body)
+            self.assertFalse(response.json()["ok"])
+
+    def test_rejects_more_than_the_limit(self):
+        response = self._post({"tokens": ["a", "b"], "ids": ["c", "d"]})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("At most 3", response.json()["error"])
+
+    def test_invalid_values_are_reported_per_item_in_order(self):
+        token = str(self.cert.verification_token)
+        results = self._results({"tokens": ["not-a-uuid", 42, token]})
+        self.assertEqual([item["query"] for item in results], ["not-a-uuid", 42, token])
+        self.assertEqual([item["found"] for item in results], [False, False, True])
+        self.assertEqual(results[2]["name"], "Juan Dela Cruz")
+        self.assertTrue(results[2]["valid"])
+
+    def test_ids_match_case_insensitively_without_holder_details(self):
+        results = self._results({"ids": [f" {self.cert.unique_id.lower()} ", None, "NOPE"]})
+        self.assertEqual([item["found"] for item in results], [True, False, False])
+        self.assertEqual(results[0]["id"], self.cert.unique_id)
+        self.assertNotIn("name", results[0])
+        self.assertNotIn("purpose", results[0])
+
+    def test_responses_are_not_stored(self):
+        response = self._post({"tokens": [str(self.cert.verification_token)]})
+        self.assertIn("no-store", response["Cache-Control"])
@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from certificates import claims
+from certificates.models import Certificate, ClaimRevocation, ReissueLog
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False, QR_CLAIM_KEYS={"k1": "first-secret", "k2": "second-secret"},
+                   QR_CLAIM_KEY_ID="k2")
+class SignedClaimTests(TestCase):
+    def setUp(self):
+        self.cert = Certificate.objects.create(full_name="Juan  Dela Cruz", document_type="clearance", purpose="Work")
+
+    def revocations(self, since=None):
+        return {row["id"]: row["before"] for row in claims.revocation_list(since)["revocations"]}
+
+    def test_signed_claim_verifies_offline(self):
+        text = claims.sign(claims.claim_for(self.cert))
+        self.assertTrue(text.startswith("BC1.k2."))
+        claim, outcome = claims.verify(text, full_name="juan dela cruz")
+        self.assertEqual((claim["i"], outcome), (self.cert.unique_id, claims.VALID))
+        self.assertEqual(claims.verify(text, full_name="Ana Santos")[1], claims.NAME_MISMATCH)
+
+    def test_claim_signed_with_a_rotated_key_still_verifies(self):
+        text = claims.sign(claims.claim_for(self.cert), kid="k1")
+        self.assertEqual(claims.verify(text)[1], claims.VALID)
+
+    def test_tampered_or_unknown_claims_are_rejected(self):
+        prefix, kid, body, signature = claims.sign(claims.claim_for(self.cert)).split(".")
+        forged = claims.claim_for(self.cert) | {"e": None, "i": "BC-FORGED"}
+        forged_body = claims.sign(forged, kid=kid).split(".")[2]
+        for text, message in [
+            (f"{prefix}.{kid}.{forged_body}.{signature}", "Bad signature."),
+            (f"{prefix}.{kid}.{body}.{signature[:-1]}A", "Bad signature."),
+            (f"{prefix}.k9.{body}.{signature}", "Unknown claim version or key."),
+            (f"BC2.{kid}.{body}.{signature}", "Unknown claim version or key."),
+            ("not a claim", "Not a certificate claim."),
+        ]:
+            with self.subTest(text=text), self.assertRaisesMessage(claims.InvalidClaim, message):
+                claims.verify(text)
+
+    def test_expired_claim(self):
+        self.cert.expiration_date = timezone.now() - timedelta(days=1)
+        text = claims.sign(claims.claim_for(self.cert))
+        self.assertEqual(claims.verify(text)[1], claims.EXPIRED)
+
+    def test_reissue_revokes_only_the_earlier_claims(self):
+        old = claims.sign(claims.claim_for(self.cert))
+        self.cert.reissue_date = self.cert.created_at + timedelta(seconds=5)
+        self.cert.save()
+        ReissueLog.objects.create(certificate=self.cert)
+        new = claims.sign(claims.claim_for(self.cert))
+
+        revocations = self.revocations()
+        self.assertEqual(claims.verify(old, revocations)[1], claims.REVOKED)
+        self.assertEqual(claims.verify(new, revocations)[1], claims.VALID)
+
+    def test_deleting_a_certificate_revokes_every_claim(self):
+        text = claims.sign(claims.claim_for(self.cert))
+        self.cert.delete()
+        self.assertEqual(ClaimRevocation.objects.get().reason, "deleted")
+        self.assertEqual(claims.verify(text, self.revocations())[1], claims.REVOKED)
+
+    def test_revocation_list_endpoint_returns_changes_since(self):
+        url = reverse("certificates:claim_revocations")
+        claims.revoke("BC-0001", reason="invalidated")
+        first = self.client.get(url).json()
+        self.assertEqual([row["id"] for row in first["revocations"]], ["BC-0001"])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=self.client.get(url)["ETag"]).status_code, 304)
+
+        ClaimRevocation.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        claims.revoke("BC-0002", reason="invalidated")
+        since = self.client.get(url, {"since": first["generated"]}).json()
+        self.assertEqual([row["id"] for row in since["revocations"]], ["BC-0002"])
+        self.assertEqual(self.client.get(url, {"since": "yesterday"}).status_code, 400)
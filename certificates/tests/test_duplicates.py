@@ -0,0 +1,48 @@
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from certificates.models import LIFECYCLE_ACTIVE, LIFECYCLE_EXPIRED, Certificate
+
+
+def _issue(full_name="Juan Dela Cruz", purpose="Employment", **fields):
+    return Certificate.objects.create(full_name=full_name, document_type="clearance", purpose=purpose, **fields)
+
+
+def _backdate(cert, **delta):
+    Certificate.objects.filter(pk=cert.pk).update(expiration_date=timezone.now() - timedelta(**delta))
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class DuplicateCertificateTests(TestCase):
+    def test_normalized_duplicate_is_rejected(self):
+        _issue()
+        with self.assertRaisesMessage(ValidationError, "already exists and is still active"):
+            _issue(full_name="  juan   DELA cruz ", purpose="EMPLOYMENT")
+
+    def test_other_purpose_or_type_is_allowed(self):
+        _issue()
+        _issue(purpose="Scholarship")
+        Certificate.objects.create(full_name="Juan Dela Cruz", document_type="residency", purpose="Employment")
+        self.assertEqual(Certificate.objects.count(), 3)
+
+    def test_database_constraint_catches_writes_that_skip_clean(self):
+        cert = _issue()
+        duplicate = Certificate(
+            full_name=cert.full_name, document_type=cert.document_type, purpose=cert.purpose,
+            full_name_key=cert.full_name_key, purpose_key=cert.purpose_key, unique_id="DUP-1",
+        )
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Certificate.objects.bulk_create([duplicate])
+
+    def test_expired_predecessor_frees_the_slot_before_the_sweep(self):
+        old = _issue()
+        _backdate(old, days=1)
+
+        new = _issue()
+        old.refresh_from_db()
+        self.assertEqual(old.lifecycle, LIFECYCLE_EXPIRED)
+        self.assertEqual(new.lifecycle, LIFECYCLE_ACTIVE)
@@ -0,0 +1,57 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from certificates import expiry
+from certificates.models import LIFECYCLE_ACTIVE, LIFECYCLE_EXPIRED, Certificate
+
+
+def _issue(full_name="Juan Dela Cruz", purpose="Employment", **fields):
+    return Certificate.objects.create(full_name=full_name, document_type="clearance", purpose=purpose, **fields)
+
+
+def _backdate(cert, **delta):
+    Certificate.objects.filter(pk=cert.pk).update(expiration_date=timezone.now() - timedelta(**delta))
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class ExpirySweepTests(TestCase):
+    def setUp(self):
+        self.current = _issue(full_name="Current")
+        self.lapsed = [_issue(full_name=f"Lapsed {i}") for i in range(5)]
+        for cert in self.lapsed:
+            _backdate(cert, minutes=5)
+
+    def test_filters_are_exact_before_the_sweep(self):
+        self.assertEqual(list(Certificate.objects.active()), [self.current])
+        self.assertEqual(Certificate.objects.expired().count(), 5)
+        self.assertEqual(Certificate.objects.filter(lifecycle=LIFECYCLE_EXPIRED).count(), 0)
+
+    def test_sweep_marks_due_certificates_in_batches(self):
+        marked = []
+        result = expiry.sweep(batch_size=2, progress=marked.append)
+
+        self.assertEqual(result["expired"], 5)
+        self.assertEqual(marked, [2, 4, 5])
+        self.assertEqual(Certificate.objects.filter(lifecycle=LIFECYCLE_EXPIRED).count(), 5)
+        self.assertEqual(list(Certificate.objects.active()), [self.current])
+        self.assertEqual(expiry.sweep()["expired"], 0)
+
+    def test_dry_run_writes_nothing(self):
+        out = StringIO()
+        call_command("expire_certificates", "--dry-run", stdout=out)
+        self.assertIn("5 certificates expired before", out.getvalue())
+        self.assertFalse(Certificate.objects.filter(lifecycle=LIFECYCLE_EXPIRED).exists())
+
+    def test_reissue_extends_an_expired_certificate(self):
+        cert = self.lapsed[0]
+        expiry.sweep()
+        cert.refresh_from_db()
+
+        cert.reissue()
+        cert.refresh_from_db()
+        self.assertEqual(cert.lifecycle, LIFECYCLE_ACTIVE)
+        self.assertGreater(cert.expiration_date, timezone.now())
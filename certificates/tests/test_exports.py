@@ -0,0 +1,43 @@
+import csv
+import io
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from certificates import exports
+from certificates.models import ActivityLog
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class ExportSanitizationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", password="pw")
+        ActivityLog.objects.create(action="Failed login attempt for username: evil\x0bname", action_type="failed")
+        ActivityLog.objects.create(action="=1+1", action_type="other")
+        self.client.force_login(self.user)
+
+    def test_xlsx_drops_control_characters_and_quotes_formulas(self):
+        response = self.client.get(reverse("certificates:export_data", args=["activity_logs", "xlsx"]))
+        self.assertEqual(response.status_code, 200)
+
+        sheet = load_workbook(io.BytesIO(b"".join(response.streaming_content))).active
+        actions = [row[4] for row in sheet.iter_rows(min_row=2, values_only=True)]
+        self.assertIn("Failed login attempt for username: evilname", actions)
+        self.assertIn("'=1+1", actions)
+        for row in sheet.iter_rows(min_row=2):
+            self.assertNotEqual(row[4].data_type, "f")
+
+    def test_csv_quotes_formulas(self):
+        response = self.client.get(reverse("certificates:export_data", args=["activity_logs", "csv"]))
+        text = b"".join(response.streaming_content).decode("utf-8-sig")
+        actions = [row[4] for row in list(csv.reader(io.StringIO(text)))[1:]]
+        self.assertIn("'=1+1", actions)
+        self.assertIn("Failed login attempt for username: evilname", actions)
+
+    def test_formula_prefixes(self):
+        for text in ("+SUM(A1)", "-2+3", "@cmd", "\tx", "\rx"):
+            self.assertEqual(exports._cell(text), "'" + text)
+        self.assertEqual(exports._cell("Juan Dela Cruz"), "Juan Dela Cruz")
+        self.assertEqual(exports._cell(-5), -5)
@@ -0,0 +1,40 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from certificates import instrumentation
+from certificates.models import UserProfile
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False, CERTIFICATE_PROFILING=True)
+class GenerationMetricsTests(TestCase):
+    def setUp(self):
+        instrumentation.reset()
+        with instrumentation.generation("docx", certificate=1, document_type="clearance"):
+            with instrumentation.stage("render"):
+                pass
+        self.url = reverse("certificates:generation_metrics")
+        self.reset_url = reverse("certificates:reset_generation_metrics")
+
+    def _login(self, is_staff, role="staff"):
+        user = User.objects.create_user("user", password="pw", is_staff=is_staff)
+        UserProfile.objects.update_or_create(user=user, defaults={"role": role})
+        self.client.force_login(user)
+
+    def test_app_staff_role_without_django_staff_flag_is_refused(self):
+        self._login(is_staff=False, role="admin")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_staff_can_read_without_clearing(self):
+        self._login(is_staff=True)
+        first = self.client.get(self.url).json()
+        second = self.client.get(self.url, {"reset": "1"}).json()
+        self.assertEqual(first["stages"]["docx.total"]["count"], 1)
+        self.assertEqual(second["stages"]["docx.total"]["count"], 1)
+
+    def test_reset_requires_post(self):
+        self._login(is_staff=True)
+        self.assertEqual(self.client.get(self.reset_url).status_code, 405)
+        self.assertEqual(self.client.post(self.reset_url).json()["stages"]["docx.total"]["count"], 1)
+        self.assertEqual(self.client.get(self.url).json()["stages"], {})
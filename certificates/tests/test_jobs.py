@@ -0,0 +1,72 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from certificates import jobs
+from certificates.models import Certificate, GenerationJob
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class GenerationJobTests(TestCase):
+    def setUp(self):
+        cert = Certificate.objects.create(full_name="Juan Dela Cruz", document_type="clearance", purpose="Work")
+        self.job = jobs.enqueue_generation(cert, verify_url="http://testserver/verify/", skip_log=True)
+
+    def expire_lease(self):
+        GenerationJob.objects.filter(pk=self.job.pk).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+
+    def test_enqueue_returns_the_pending_job(self):
+        self.assertEqual(jobs.enqueue_generation(self.job.certificate), self.job)
+
+    def test_leased_job_is_not_claimed_twice(self):
+        self.assertEqual(jobs.claim_next_job("worker-1"), self.job)
+        self.assertIsNone(jobs.claim_next_job("worker-2"))
+
+    def test_expired_lease_is_reclaimed_by_another_worker(self):
+        jobs.claim_next_job("worker-1")
+        self.expire_lease()
+        job = jobs.claim_next_job("worker-2")
+        self.assertEqual((job.pk, job.locked_by, job.attempts), (self.job.pk, "worker-2", 2))
+        self.assertGreater(job.lease_expires_at, timezone.now())
+
+    def test_expired_lease_after_last_attempt_is_failed(self):
+        GenerationJob.objects.filter(pk=self.job.pk).update(max_attempts=1)
+        jobs.claim_next_job("worker-1")
+        self.expire_lease()
+        self.assertIsNone(jobs.claim_next_job("worker-2"))
+        self.assertEqual(jobs.reap_expired_jobs(), 1)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, GenerationJob.STATUS_FAILED)
+        self.assertEqual(self.job.last_error, "Lease expired before the job finished.")
+
+    @mock.patch.object(jobs, "generate_certificate_docx", side_effect=RuntimeError("template missing"))
+    def test_failure_is_retried_with_backoff_until_the_limit(self, generate):
+        for attempt in range(1, self.job.max_attempts + 1):
+            job = jobs.claim_next_job("worker-1")
+            self.assertEqual(job.attempts, attempt)
+            with self.assertLogs("certificates.jobs", "WARNING"):
+                self.assertFalse(jobs.run_job(job))
+            job.refresh_from_db()
+            if attempt < job.max_attempts:
+                self.assertEqual(job.status, GenerationJob.STATUS_QUEUED)
+                self.assertGreater(job.available_at, timezone.now())
+                # Not due yet, so nothing is claimable until the backoff passes
+                self.assertIsNone(jobs.claim_next_job("worker-1"))
+                GenerationJob.objects.filter(pk=job.pk).update(available_at=timezone.now())
+
+        self.assertEqual(job.status, GenerationJob.STATUS_FAILED)
+        self.assertEqual(job.last_error, "template missing")
+        self.assertIsNotNone(job.finished_at)
+        self.assertIsNone(jobs.claim_next_job("worker-1"))
+        self.assertEqual(generate.call_count, 3)
+
+    @mock.patch.object(jobs, "pdf_enabled", return_value=False)
+    @mock.patch.object(jobs, "generate_certificate_docx")
+    def test_successful_job_is_done(self, generate, pdf_enabled):
+        self.assertTrue(jobs.run_inline(self.job))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, GenerationJob.STATUS_DONE)
+        self.assertIsNone(self.job.lease_expires_at)
+        self.assertFalse(jobs.run_inline(self.job))
@@ -0,0 +1,120 @@
+import uuid
+from unittest import skipUnless
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+
+class MigrationTestCase(TransactionTestCase):
+    """Migrates back to ``migrate_from``, then runs setUpBeforeMigration and migrates to ``migrate_to``."""
+
+    migrate_from = None
+    migrate_to = None
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        latest = executor.loader.graph.leaf_nodes("certificates")
+        self.addCleanup(self._migrate, latest)
+        self.old_apps = self._migrate([("certificates", self.migrate_from)])
+        self.setUpBeforeMigration(self.old_apps)
+        self.apps = self._migrate([("certificates", self.migrate_to)])
+
+    def _migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def setUpBeforeMigration(self, apps):
+        pass
+
+
+class VerificationTokenMigrationTests(MigrationTestCase):
+    migrate_from = "0035_certificate_expiry_index"
+    migrate_to = "0036_certificate_verification"
+
+    def setUpBeforeMigration(self, apps):
+        Certificate = apps.get_model("certificates", "Certificate")
+        shared = uuid.uuid4()
+        for i in range(3):
+            Certificate.objects.create(full_name=f"Old {i}", unique_id=f"OLD-{i}", verification_token=shared)
+        self.kept = Certificate.objects.create(full_name="New", unique_id="NEW-1", verification_token=uuid.uuid4())
+        self.shared = shared
+
+    def test_rows_sharing_the_backfilled_token_get_their_own(self):
+        Certificate = self.apps.get_model("certificates", "Certificate")
+        tokens = list(Certificate.objects.values_list("verification_token", flat=True))
+        self.assertEqual(len(tokens), len(set(tokens)))
+        self.assertNotIn(self.shared, tokens)
+        self.assertEqual(Certificate.objects.get(pk=self.kept.pk).verification_token, self.kept.verification_token)
+
+
+@skipUnless(connection.vendor == "sqlite", "FTS5 query")
+class SearchIndexMigrationTests(MigrationTestCase):
+    migrate_from = "0030_activitylog_created_at_default"
+    migrate_to = "0031_search_indexes"
+
+    def setUpBeforeMigration(self, apps):
+        Certificate = apps.get_model("certificates", "Certificate")
+        self.cert = Certificate.objects.create(full_name="Juan Dela Cruz", address="Longos", unique_id="OLD-1")
+
+    def test_existing_rows_are_indexed(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT rowid FROM certificates_certificate_search WHERE certificates_certificate_search MATCH %s",
+                ['"dela"*'],
+            )
+            self.assertEqual(cursor.fetchall(), [(self.cert.pk,)])
+
+
+class ActionTypeMigrationTests(MigrationTestCase):
+    migrate_from = "0028_dataversion"
+    migrate_to = "0029_activitylog_action_type"
+
+    def setUpBeforeMigration(self, apps):
+        ActivityLog = apps.get_model("certificates", "ActivityLog")
+        for action in ("juan logged in", "Failed login attempt for username: juan", "Reissued clearance", "Viewed"):
+            ActivityLog.objects.create(action=action, action_type="other")
+
+    def test_action_type_is_backfilled_from_the_text(self):
+        ActivityLog = self.apps.get_model("certificates", "ActivityLog")
+        self.assertEqual(
+            dict(ActivityLog.objects.values_list("action", "action_type")),
+            {
+                "juan logged in": "login",
+                "Failed login attempt for username: juan": "failed",
+                "Reissued clearance": "reissue",
+                "Viewed": "other",
+            },
+        )
+
+
+class ReissueStatsMigrationTests(MigrationTestCase):
+    migrate_from = "0037_claimrevocation"
+    migrate_to = "0038_reissue_stats_by_type"
+
+    def setUpBeforeMigration(self, apps):
+        Certificate = apps.get_model("certificates", "Certificate")
+        ReissueLog = apps.get_model("certificates", "ReissueLog")
+        cert = Certificate.objects.create(
+            full_name="Juan", document_type="clearance", purpose="Work", status="PENDING",
+            reissued=True, unique_id="OLD-1",
+        )
+        ReissueLog.objects.create(certificate=cert)
+        self.day = timezone.localdate(cert.created_at)
+        # As counted before: the reissue on the certificate's status and purpose
+        apps.get_model("certificates", "CertificateDailyStat").objects.create(
+            date=self.day, document_type="clearance", purpose="Work", status="PENDING",
+            certificates=1, reissued_certificates=1, reissues=1,
+        )
+
+    def test_reissues_are_keyed_on_date_and_type(self):
+        CertificateDailyStat = self.apps.get_model("certificates", "CertificateDailyStat")
+        self.assertEqual(
+            sorted(CertificateDailyStat.objects.values_list(
+                "document_type", "purpose", "status", "certificates", "reissued_certificates", "reissues",
+            )),
+            [("clearance", "", "", 0, 0, 1), ("clearance", "Work", "PENDING", 1, 1, 0)],
+        )
@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from certificates.models import Certificate
+from certificates.pagination import paginate
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        for i in range(20):
+            cert = Certificate.objects.create(full_name=f"Resident {i}", purpose=f"Purpose {i}")
+            # Pairs share a timestamp, so the pk breaks ties
+            Certificate.objects.filter(pk=cert.pk).update(created_at=now - timedelta(minutes=i // 2))
+        self.newest_first = list(Certificate.objects.order_by("-created_at", "-pk"))
+
+    def _forward(self):
+        pages, cursor = [], None
+        while True:
+            page = paginate(Certificate.objects.all(), cursor, per_page=6)
+            pages.append(page)
+            if not page.has_next:
+                return pages
+            cursor = page.next_cursor
+
+    def test_next_cursors_visit_every_row_once_in_order(self):
+        pages = self._forward()
+        self.assertEqual([len(page) for page in pages], [6, 6, 6, 2])
+        self.assertEqual([cert for page in pages for cert in page], self.newest_first)
+        self.assertFalse(pages[0].has_previous)
+        self.assertTrue(all(page.has_previous for page in pages[1:]))
+
+    def test_previous_cursors_return_the_same_pages(self):
+        pages = self._forward()
+        for before, page in zip(pages, pages[1:]):
+            back = paginate(Certificate.objects.all(), page.previous_cursor, per_page=6)
+            self.assertEqual(list(back), list(before))
+            self.assertEqual(back.has_previous, before.has_previous)
+            self.assertTrue(back.has_next)
+
+    def test_tampered_or_foreign_cursor_starts_over(self):
+        cursor = self._forward()[1].next_cursor
+        for bad in (cursor[:-2] + "xx", "garbage"):
+            self.assertEqual(list(paginate(Certificate.objects.all(), bad, per_page=6)), self.newest_first[:6])
+        # A cursor made for other keys is not applied
+        foreign = paginate(Certificate.objects.all(), cursor, per_page=6, keys=("updated_at", "pk"))
+        self.assertFalse(foreign.has_previous)
+
+    def test_ranked_search_pages_round_trip(self):
+        self.client.force_login(User.objects.create_superuser("admin", password="pw"))
+        url = reverse("certificates:list_certificates")
+        seen, params = [], {"search": "resident"}
+        while True:
+            page = self.client.get(url, params).context["certificates"]
+            self.assertEqual(page.total, 20)
+            seen += [cert.pk for cert in page]
+            if not page.has_next:
+                break
+            params = {"search": "resident", "cursor": page.next_cursor}
+        self.assertEqual(sorted(seen), sorted(cert.pk for cert in self.newest_first))
+        self.assertEqual(len(seen), len(set(seen)))
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class CertificateListCountTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser("admin", password="pw"))
+        self.url = reverse("certificates:list_certificates")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cert = Certificate.objects.create(full_name="Juan Dela Cruz", address="Longos", purpose="Work")
+
+    def _total(self, **params):
+        return self.client.get(self.url, params).context["certificates"].total
+
+    def test_count_follows_edits_outside_the_statistics(self):
+        self.assertEqual(self._total(search="juan"), 1)
+        self.cert.full_name = "Pedro Santos"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cert.save()
+        self.assertEqual(self._total(search="juan"), 0)
+        self.assertEqual(self._total(search="pedro"), 1)
+
+    def test_validity_count_follows_the_clock(self):
+        self.assertEqual(self._total(validity="active"), 1)
+        # Passing the expiration date writes nothing
+        Certificate.objects.filter(pk=self.cert.pk).update(expiration_date=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self._total(validity="active"), 0)
+        self.assertEqual(self._total(validity="expired"), 1)
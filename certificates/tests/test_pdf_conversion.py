@@ -0,0 +1,54 @@
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+from docx import Document
+
+from certificates import pdf_conversion
+from certificates.pdf_conversion import ConversionError, ConverterPool, FakeConverterProcess
+
+
+class ConverterPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.docx = self.dir / "in.docx"
+        document = Document()
+        document.add_paragraph("Barangay Clearance for Juan Dela Cruz")
+        document.save(self.docx)
+
+    def test_converts_on_an_idle_process(self):
+        proc = FakeConverterProcess(0)
+        pool = ConverterPool([proc], timeout=5)
+        result = pool.convert(self.docx, self.dir / "out.pdf")
+        self.assertTrue(result.read_bytes().startswith(b"%PDF"))
+        self.assertEqual((proc.starts, proc.conversions), (1, 1))
+
+    def test_crashed_converter_is_restarted_and_retried_once(self):
+        proc = FakeConverterProcess(0, crash=True)
+        pool = ConverterPool([proc], timeout=5)
+        with self.assertRaisesMessage(ConversionError, "crashed"):
+            pool.convert(self.docx, self.dir / "out.pdf")
+        self.assertEqual(proc.starts, 2)
+        # The process went back to the pool and serves the next conversion
+        proc.crash = False
+        pool.convert(self.docx, self.dir / "out.pdf")
+        self.assertEqual(proc.conversions, 1)
+
+    def test_hung_converter_times_out_and_is_stopped(self):
+        proc = FakeConverterProcess(0, delay=2)
+        pool = ConverterPool([proc], timeout=1)
+        with self.assertRaisesMessage(ConversionError, "timed out"):
+            pool.convert(self.docx, self.dir / "out.pdf")
+        self.assertFalse(proc.is_alive())
+
+    def test_queue_timeout_when_no_process_is_free(self):
+        pool = ConverterPool([], queue_timeout=0.01)
+        with self.assertRaisesMessage(ConversionError, "No converter became available"):
+            pool.convert(self.docx, self.dir / "out.pdf")
+
+    @override_settings(CERTIFICATE_PDF_BACKEND="fake", CERTIFICATE_PDF_POOL_SIZE=1)
+    def test_fake_backend_through_the_shared_pool(self):
+        pdf_conversion.reset_pool()
+        self.addCleanup(pdf_conversion.reset_pool)
+        out = pdf_conversion.convert_docx_to_pdf(self.docx, self.dir / "nested" / "out.pdf")
+        self.assertTrue(Path(out).read_bytes().startswith(b"%PDF"))
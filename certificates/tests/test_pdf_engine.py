@@ -0,0 +1,28 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from certificates import pdf_engine
+from certificates.generation import certificate_values
+from certificates.models import Certificate
+
+
+class RenderValuesTests(SimpleTestCase):
+    def render(self, **fields):
+        cert = Certificate(document_type="clearance", unique_id="BC-0001", **fields)
+        values = certificate_values(cert)
+        values["city"] = "Malabon & <Navotas>"
+        with mock.patch.object(pdf_engine, "_draw_text", wraps=pdf_engine._draw_text) as text, \
+                mock.patch.object(pdf_engine, "_draw_paragraph", wraps=pdf_engine._draw_paragraph) as paragraph:
+            pdf = pdf_engine.render_certificate_pdf(cert, values, verify_url=None)
+        self.assertTrue(pdf.startswith(b"%PDF"))
+        return [call.args[2] for call in text.call_args_list], [call.args[2] for call in paragraph.call_args_list]
+
+    def test_text_blocks_draw_raw_values(self):
+        texts, _ = self.render(full_name="Ana <b>& Co", purpose="Employment")
+        self.assertIn("Malabon & <Navotas>", texts)
+        self.assertFalse(any("&amp;" in text or "&lt;" in text for text in texts))
+
+    def test_paragraph_blocks_escape_values(self):
+        _, paragraphs = self.render(full_name="Ana <b>& Co", purpose="Employment")
+        self.assertTrue(any("<b>Ana &lt;b&gt;&amp; Co</b>" in text for text in paragraphs))
@@ -0,0 +1,84 @@
+import uuid
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from certificates import qr_service
+from certificates.models import Certificate
+from certificates.tests.utils import TempMediaMixin
+
+PAYLOAD = "http://testserver/certificates/verify/00000000-0000-0000-0000-000000000000/"
+
+
+class QRServiceTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        qr_service._lru.clear()
+        self.addCleanup(qr_service._lru.clear)
+
+    def test_images_are_encoded_once(self):
+        with mock.patch.object(qr_service, "_encode", wraps=qr_service._encode) as encode:
+            png = qr_service.get_qr(PAYLOAD)
+            self.assertEqual(qr_service.get_qr(PAYLOAD), png)
+            qr_service._lru.clear()  # a fresh process reads the stored image
+            self.assertEqual(qr_service.get_qr(PAYLOAD), png)
+        self.assertEqual(encode.call_count, 1)
+        self.assertTrue(png.startswith(b"\x89PNG"))
+
+    def test_prerender_stores_every_format(self):
+        qr_service.prerender(PAYLOAD)
+        qr_service._lru.clear()
+        with mock.patch.object(qr_service, "_encode") as encode:
+            self.assertIn(b"<svg", qr_service.get_qr(PAYLOAD, "svg"))
+            qr_service.get_qr(PAYLOAD, "png")
+        encode.assert_not_called()
+
+    def test_etag_depends_on_payload_and_format(self):
+        self.assertEqual(qr_service.etag(PAYLOAD), qr_service.etag(PAYLOAD))
+        self.assertNotEqual(qr_service.etag(PAYLOAD), qr_service.etag(PAYLOAD, "svg"))
+        self.assertNotEqual(qr_service.etag(PAYLOAD), qr_service.etag(PAYLOAD + "x"))
+
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            qr_service.get_qr(PAYLOAD, "gif")
+
+
+@override_settings(
+    ACTIVITY_LOG_BUFFERED=False,
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "verification": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "qr-tests"},
+    },
+)
+class CertificateQRViewTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.cert = Certificate.objects.create(full_name="Juan Dela Cruz", document_type="clearance", purpose="Work")
+        self.url = reverse("certificates:certificate_qr", args=[self.cert.verification_token])
+
+    def test_image_is_cacheable_and_revalidates_without_queries(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertIn("immutable", response["Cache-Control"])
+
+        with self.assertNumQueries(0):
+            again = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+    def test_svg_has_its_own_etag(self):
+        png = self.client.get(self.url)
+        svg = self.client.get(self.url, {"format": "svg"})
+        self.assertEqual(svg["Content-Type"], "image/svg+xml")
+        self.assertNotEqual(png["ETag"], svg["ETag"])
+        self.assertEqual(self.client.get(self.url, {"format": "svg"}, HTTP_IF_NONE_MATCH=png["ETag"]).status_code, 200)
+
+    @override_settings(QR_SIGNED_CLAIMS=True)
+    def test_signed_claim_images_are_revalidated(self):
+        response = self.client.get(self.url)
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertNotIn("immutable", response["Cache-Control"])
+
+    def test_unknown_token_is_not_found(self):
+        url = reverse("certificates:certificate_qr", args=[uuid.uuid4()])
+        self.assertEqual(self.client.get(url).status_code, 404)
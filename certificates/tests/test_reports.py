@@ -0,0 +1,67 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from certificates import report_cache
+from certificates.models import Certificate, DataVersion, ReissueLog
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class ReportsPdfValidatorTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser("admin", password="pw"))
+        self.url = reverse("certificates:reports_pdf")
+
+    def test_unchanged_data_is_not_modified_on_the_same_day(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"]).status_code, 304)
+
+    def test_both_validators_change_with_the_printed_date(self):
+        first = self.client.get(self.url)
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        with mock.patch("certificates.report_cache.timezone.localdate", return_value=tomorrow):
+            by_etag = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+            by_date = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        self.assertEqual(by_etag.status_code, 200)
+        self.assertEqual(by_date.status_code, 200)
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class DataVersionBumpTests(TestCase):
+    def _versions(self):
+        return {name: report_cache.state(name=name)[0] for name in (report_cache.REPORTS, report_cache.CERTIFICATES)}
+
+    def test_one_bump_per_version_after_commit(self):
+        before = self._versions()
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                cert = Certificate.objects.create(full_name="Juan Dela Cruz", document_type="clearance", purpose="Work")
+                cert.status = "COMPLETED"
+                cert.save()
+                ReissueLog.objects.create(certificate=cert)
+                self.assertEqual(self._versions(), before)
+        bumps = [
+            q["sql"] for q in queries
+            if q["sql"].startswith('UPDATE "certificates_dataversion"') and "'revocations'" not in q["sql"]
+        ]
+        self.assertEqual(len(bumps), 2)
+        self.assertEqual(self._versions(), {name: version + 1 for name, version in before.items()})
+
+    def test_rolled_back_changes_do_not_bump(self):
+        before = self._versions()
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Certificate.objects.create(full_name="Juan Dela Cruz", document_type="clearance", purpose="Work")
+                transaction.set_rollback(True)
+            # A bump after the rollback is still written
+            report_cache.bump()
+        self.assertEqual(self._versions(), {**before, report_cache.REPORTS: before[report_cache.REPORTS] + 1})
+        self.assertEqual(DataVersion.objects.get(name=report_cache.REPORTS).version, before[report_cache.REPORTS] + 1)
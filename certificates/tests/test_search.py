@@ -0,0 +1,29 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from certificates import search
+from certificates.models import Certificate
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class SearchIndexTests(TestCase):
+    def test_update_reindexes_changed_rows_and_drops_missing_ones(self):
+        cert = Certificate.objects.create(full_name="Juan Dela Cruz", address="Longos")
+        Certificate.objects.filter(pk=cert.pk).update(full_name="Pedro Santos")
+        search.update("certificate", [cert.pk, 999999])
+
+        names = Certificate.objects.all()
+        self.assertFalse(search.matching(names, "certificate", "juan").exists())
+        self.assertEqual(list(search.matching(names, "certificate", "ped san")), [cert])
+
+        Certificate.objects.filter(pk=cert.pk).delete()
+        search.update("certificate", [cert.pk])
+        self.assertFalse(search.matching(Certificate.objects.all(), "certificate", "pedro").exists())
+
+
+class PostgresBackendTests(SimpleTestCase):
+    def test_update_upserts_instead_of_delete_then_insert(self):
+        upsert, cleanup = search.PostgresBackend().update_sql(search.KINDS["certificate"], "%s, %s")
+        self.assertTrue(upsert.startswith("INSERT INTO certificates_certificate_search"))
+        self.assertIn("WHERE c.id IN (%s, %s)", upsert)
+        self.assertTrue(upsert.endswith("ON CONFLICT (id) DO UPDATE SET document = EXCLUDED.document"))
+        self.assertIn("NOT EXISTS", cleanup)
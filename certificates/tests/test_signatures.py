@@ -0,0 +1,82 @@
+import io
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from PIL import Image, ImageDraw
+
+from certificates import signatures
+from certificates.forms import DigitalSignatureForm
+from certificates.models import AdminSignature
+from certificates.tests.utils import TempMediaMixin
+
+
+def signature_png(size=(3000, 1200)):
+    """A large scan: a dark stroke in the middle of a wide white margin."""
+    image = Image.new("RGB", size, "white")
+    ImageDraw.Draw(image).line((1000, 500, 2000, 700), fill="black", width=40)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class SignatureDerivativeTests(TempMediaMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_user("admin")
+        signatures.invalidate()
+        self.addCleanup(signatures.invalidate)
+
+    def upload(self, user, data=None, bypass=False):
+        upload = SimpleUploadedFile("signature.png", data or signature_png(), content_type="image/png")
+        form = DigitalSignatureForm(
+            data={"bypass_digital_signature": bypass}, files={"signature_image": upload},
+            instance=AdminSignature(admin_user=user), user=user,
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        return form.save()
+
+    def test_derivative_is_trimmed_and_downscaled(self):
+        with Image.open(io.BytesIO(signatures.make_derivative(io.BytesIO(signature_png())))) as derivative:
+            self.assertEqual(derivative.mode, "P")
+            self.assertLessEqual(derivative.size, (472, 142))
+            # Margins are trimmed, so the stroke fills the width
+            self.assertGreater(derivative.width, 400)
+
+    def test_upload_stores_a_derivative_shared_by_identical_images(self):
+        first = self.upload(self.admin)
+        second = self.upload(User.objects.create_user("captain"))
+        self.assertTrue(first.signature_derivative.name.startswith("signatures/derived/"))
+        self.assertEqual(first.signature_derivative.name, second.signature_derivative.name)
+
+    def test_resolved_signature_is_cached_until_changed(self):
+        admin_signature = self.upload(self.admin)
+        path = signatures.get_signature_path(self.admin)
+        self.assertEqual(path, Path(admin_signature.signature_derivative.path))
+        with self.assertNumQueries(0):
+            self.assertEqual(signatures.get_signature_path(self.admin), path)
+
+        admin_signature.bypass_digital_signature = True
+        admin_signature.save()
+        self.assertIsNone(signatures.get_signature_path(self.admin))
+
+    def test_signature_uploaded_before_derivatives_is_prepared_on_first_use(self):
+        admin_signature = AdminSignature(admin_user=self.admin)
+        admin_signature.signature_image.save("legacy.png", io.BytesIO(signature_png()), save=True)
+
+        path = signatures.get_signature_path(self.admin)
+        admin_signature.refresh_from_db()
+        self.assertEqual(path, Path(admin_signature.signature_derivative.path))
+        self.assertTrue(path.exists())
+
+    def test_admin_without_a_signature_gets_the_default(self):
+        self.assertIsNone(signatures.get_signature_path(self.admin))
+
+        default = self.media_root / "signatures" / "default_signature.png"
+        default.parent.mkdir(parents=True, exist_ok=True)
+        default.write_bytes(signature_png())
+        signatures.invalidate()
+        path = signatures.get_signature_path(self.admin)
+        self.assertTrue(path.name.startswith("default_"))
+        self.assertTrue(path.exists())
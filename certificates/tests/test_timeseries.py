@@ -0,0 +1,61 @@
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from certificates import statistics, timeseries
+from certificates.models import Certificate
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+@override_settings(ACTIVITY_LOG_BUFFERED=False)
+class MonthlyTrendTests(TestCase):
+    def setUp(self):
+        for created_at, status, reissued in [
+            (_utc(2025, 1, 10, 2), "COMPLETED", False),
+            # 04:00 on February 1st in Manila
+            (_utc(2025, 1, 31, 20), "COMPLETED", True),
+            (_utc(2025, 4, 5, 2), "PENDING", False),
+            (_utc(2024, 12, 31, 2), "COMPLETED", False),
+        ]:
+            cert = Certificate.objects.create(
+                full_name=f"Resident {created_at:%Y%m%d%H}", document_type="clearance", purpose="Work",
+                status=status, reissued=reissued,
+            )
+            Certificate.objects.filter(pk=cert.pk).update(created_at=created_at)
+        statistics.rebuild()
+
+    def test_months_follow_local_time_and_are_zero_filled(self):
+        months = timeseries.monthly_counts(year=2025)
+        self.assertEqual(len(months), 12)
+        self.assertEqual(months[:4], [
+            {"month": "2025-01", "new_total": 1, "reissued_total": 0},
+            {"month": "2025-02", "new_total": 1, "reissued_total": 1},
+            {"month": "2025-03", "new_total": 0, "reissued_total": 0},
+            # Pending certificates are not counted as generated
+            {"month": "2025-04", "new_total": 0, "reissued_total": 0},
+        ])
+
+    def test_date_range_spans_years(self):
+        months = timeseries.monthly_counts(start=date(2024, 12, 1), end=date(2025, 2, 28))
+        self.assertEqual([(m["month"], m["new_total"]) for m in months], [
+            ("2024-12", 1), ("2025-01", 1), ("2025-02", 1),
+        ])
+
+    def test_without_bounds_the_series_covers_the_data(self):
+        months = timeseries.monthly_counts()
+        self.assertEqual((months[0]["month"], months[-1]["month"]), ("2024-12", "2025-04"))
+        self.assertEqual(timeseries.available_years(), [2024, 2025])
+
+    def test_endpoint_validates_parameters(self):
+        self.client.force_login(User.objects.create_superuser("admin", password="pw"))
+        url = reverse("certificates:report_trends")
+        data = self.client.get(url, {"year": 2024}).json()
+        self.assertEqual(data["months"][-1], {"month": "2024-12", "new_total": 1, "reissued_total": 0})
+        for params in ({"year": "last"}, {"start": "2025-13-01"}, {"start": "2025-03-01", "end": "2025-01-01"}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(url, params).status_code, 400)
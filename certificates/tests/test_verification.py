@@ -0,0 +1,89 @@
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.core.cache.backends.filebased import FileBasedCache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from certificates import batch, expiry, verification
+from certificates.models import LIFECYCLE_EXPIRED, Certificate
+
+CACHE_DIR = tempfile.mkdtemp()
+
+
+def tearDownModule():
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+@override_settings(
+    ACTIVITY_LOG_BUFFERED=False,
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "verification": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": CACHE_DIR},
+    },
+)
+class VerificationCacheTests(TestCase):
+    def setUp(self):
+        self.cert = Certificate.objects.create(full_name="Juan Dela Cruz", document_type="clearance", purpose="Work")
+        self.token = self.cert.verification_token
+
+    def _other_process(self):
+        """The shared cache as another process (e.g. a second web worker) sees it."""
+        return FileBasedCache(CACHE_DIR, {})
+
+    def test_cached_lookups_run_no_query(self):
+        verification.lookup_many([self.cert.unique_id], field="unique_id")  # warms both keys
+        with self.assertNumQueries(0):
+            self.assertEqual(verification.lookup(self.token)["status"], "PENDING")
+            verification.lookup_many([self.cert.unique_id], field="unique_id")
+
+    def test_save_drops_the_entry_for_every_process(self):
+        verification.lookup(self.token)
+        self.assertIsNotNone(self._other_process().get(verification._key(self.token)))
+
+        self.cert.status = "COMPLETED"
+        self.cert.save()
+        self.assertIsNone(self._other_process().get(verification._key(self.token)))
+        self.assertIsNone(self._other_process().get(verification._id_key(self.cert.unique_id)))
+        self.assertEqual(verification.lookup(self.token)["status"], "COMPLETED")
+
+    def test_other_certificates_stay_cached(self):
+        other = Certificate.objects.create(full_name="Maria Santos", document_type="clearance", purpose="Work")
+        verification.lookup(other.verification_token)
+        self.cert.status = "COMPLETED"
+        self.cert.save()
+        with self.assertNumQueries(0):
+            verification.lookup(other.verification_token)
+
+    def test_entries_are_dropped_again_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cert.status = "COMPLETED"
+            self.cert.save()
+            # A concurrent lookup caches the row as it was before the commit
+            self._other_process().set(verification._key(self.token), {"status": "PENDING"})
+        self.assertIsNone(self._other_process().get(verification._key(self.token)))
+
+    def test_batch_results_invalidate_cached_lookups(self):
+        before = verification.lookup(self.token)
+        batch._save_results({self.cert.pk: "generated/docx/out.docx"})
+
+        after = verification.lookup(self.token)
+        self.assertEqual(after["status"], "COMPLETED")
+        self.assertGreater(after["updated_at"], before["updated_at"])
+
+    def test_expiry_sweep_invalidates_cached_lookups(self):
+        Certificate.objects.filter(pk=self.cert.pk).update(expiration_date=timezone.now() - timedelta(days=1))
+        verification.invalidate(self.token, self.cert.unique_id)
+        self.assertNotEqual(verification.lookup(self.token)["lifecycle"], LIFECYCLE_EXPIRED)
+
+        self.assertEqual(expiry.sweep()["expired"], 1)
+        self.assertEqual(verification.lookup(self.token)["lifecycle"], LIFECYCLE_EXPIRED)
+
+    def test_releasing_an_expired_duplicate_invalidates_it(self):
+        Certificate.objects.filter(pk=self.cert.pk).update(expiration_date=timezone.now() - timedelta(days=1))
+        verification.invalidate(self.token, self.cert.unique_id)
+        verification.lookup(self.token)
+
+        Certificate.objects.create(full_name="Juan Dela Cruz", document_type="clearance", purpose="Work")
+        self.assertEqual(verification.lookup(self.token)["lifecycle"], LIFECYCLE_EXPIRED)
@@ -0,0 +1,25 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test import override_settings
+
+from certificates import template_registry
+
+
+class TempMediaMixin:
+    """Runs each test against an empty MEDIA_ROOT holding the default templates."""
+
+    def setUp(self):
+        super().setUp()
+        media_root = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        defaults = Path(settings.BASE_DIR) / "certificates" / "default_templates"
+        shutil.copytree(defaults, media_root / "certificate_templates")
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        template_registry.invalidate()
+        self.addCleanup(template_registry.invalidate)
+        self.media_root = media_root
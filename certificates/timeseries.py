@@ -0,0 +1,73 @@
+# certificates/timeseries.py
+"""
+Monthly time series for the reports charts.
+
+Aggregation runs in the database with TruncMonth/TruncYear over
+CertificateDailyStat. Its dates are already local (Asia/Manila) calendar days,
+computed with TruncDate(tzinfo=...) on rebuild and timezone.localdate() on
+updates, so the month and year buckets follow the configured timezone and a
+certificate issued late on the last day of a month counts toward that month.
+"""
+from datetime import date
+
+from django.db.models import Q, Sum
+from django.db.models.functions import TruncMonth, TruncYear
+
+from certificates.models import CertificateDailyStat
+
+
+def _months(first, last):
+    """First days of every month from ``first`` to ``last`` inclusive."""
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        yield date(year, month, 1)
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def available_years():
+    return [
+        d.year for d in CertificateDailyStat.objects.annotate(year=TruncYear("date"))
+        .values_list("year", flat=True).distinct().order_by("year")
+    ]
+
+
+def monthly_counts(year=None, start=None, end=None):
+    """
+    One row per month, {"month": "YYYY-MM", "new_total", "reissued_total"},
+    for a calendar ``year`` and/or the local date range [start, end]. Months
+    without certificates inside the requested bounds are included as zeros.
+    """
+    stats = CertificateDailyStat.objects.all()
+    if year:
+        stats = stats.filter(date__year=year)
+    if start:
+        stats = stats.filter(date__gte=start)
+    if end:
+        stats = stats.filter(date__lte=end)
+
+    rows = (
+        stats.annotate(month=TruncMonth("date"))
+        .values("month")
+        .annotate(
+            new_total=Sum("certificates", filter=Q(status="COMPLETED"), default=0),
+            reissued_total=Sum("reissued_certificates", default=0),
+        )
+        .order_by("month")
+    )
+    by_month = {row["month"]: row for row in rows}
+
+    first = start or (date(year, 1, 1) if year else min(by_month, default=None))
+    last = end or (date(year, 12, 1) if year else max(by_month, default=None))
+    if year:
+        first, last = max(first, date(year, 1, 1)), min(last, date(year, 12, 31))
+    if first is None or last is None or first > last:
+        return []
+
+    return [
+        {
+            "month": month.strftime("%Y-%m"),
+            "new_total": by_month.get(month, {}).get("new_total", 0),
+            "reissued_total": by_month.get(month, {}).get("reissued_total", 0),
+        }
+        for month in _months(first, last)
+    ]
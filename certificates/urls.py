@@ -13,6 +13,7 @@ from certificates.views import (
     ocr_extract_api,
     digital_signature_upload,
     activity_logs,
+    export_data,
     report_views,
     reports_pdf,
     manage_certificate_template,
@@ -21,7 +22,7 @@ from certificates.views import (
 
 # Split views
 from certificates.views import certificate_views
-from certificates.views import document_views  # contains generate_certificate, certificate_docx, verify_certificate, certificate_qr
+from certificates.views import document_views  # contains generate_certificate, certificate_docx, certificate_pdf
 from certificates.views import certificate_verification_views
 
 app_name = "certificates"
@@ -51,20 +52,31 @@ urlpatterns = [
     path("create/", certificate_views.create_certificate, name="create_certificate"),
     path("<int:pk>/", certificate_views.certificate_detail, name="certificate_detail"),
     path("<int:pk>/generate/", document_views.generate_certificate, name="generate_certificate"),
+    path("<int:pk>/generation-status/", document_views.generation_status, name="generation_status"),
     path("<int:pk>/docx/", document_views.certificate_docx, name="certificate_docx"),
+    path("<int:pk>/pdf/", document_views.certificate_pdf, name="certificate_pdf"),
+    path("generation-metrics/", document_views.generation_metrics, name="generation_metrics"),
+    path("generation-metrics/reset/", document_views.reset_generation_metrics, name="reset_generation_metrics"),
     path("reissue/<int:pk>/", certificate_views.reissue_certificate, name="reissue_certificate"),
 
     # ---------------- SIGNATURES & LOGS ----------------
     path("upload-signature/", digital_signature_upload, name="digital_signature_upload"),
     path("activity-logs/", activity_logs, name="activity_logs"),
 
+    # ---------------- EXPORTS ----------------
+    path("export/<str:dataset>.<str:fmt>", export_data, name="export_data"),
+
     # ---------------- CERTIFICATE VERIFICATION ----------------
     path("verify/<uuid:token>/", certificate_verification_views.verify_certificate, name="verify_certificate"),
+    path("verify/<uuid:token>.json", certificate_verification_views.verify_certificate_json, name="verify_certificate_json"),
+    path("verify/bulk.json", certificate_verification_views.verify_certificates_bulk, name="verify_certificates_bulk"),
     path("qr/<uuid:token>/", certificate_verification_views.certificate_qr, name="certificate_qr"),
+    path("revocations.json", certificate_verification_views.claim_revocations, name="claim_revocations"),
     path("check-age/", certificate_verification_views.check_age, name="check_age"),
 
     # ---------------- REPORTS & TEMPLATES ----------------
     path("reports/", report_views.reports, name="reports"),
+    path("reports/trends/", report_views.report_trends, name="report_trends"),
     path("reports/pdf/", reports_pdf, name="reports_pdf"),
     path("manage-templates/", manage_certificate_template, name="manage_certificate_template"),
 ]
@@ -14,7 +14,7 @@ from docx.shared import Mm
 TEMPLATE_MAP = {
     "clearance": "clearance.docx",
     "residency": "residency.docx",
-    "indigency": "Indigency.docx",
+    "indigency": "indigency.docx",
 }
 
 def get_template_path(document_type):
@@ -117,14 +117,14 @@ def generate_unique_id(document_type, reissue_count=0):
 # certificates/utils.py
 
 def convert(input_path, output_path=None):
-    if output_path:
-        # use docx2pdf to convert to output_path
-        from docx2pdf import convert as docx2pdf_convert
-        docx2pdf_convert(input_path, output_path)
-    else:
-        # default behavior
-        from docx2pdf import convert as docx2pdf_convert
-        docx2pdf_convert(input_path)
+    """
+    Convert a DOCX file to PDF using the pooled converter (see pdf_conversion.py).
+    Without output_path, the PDF is written next to the input file.
+    """
+    from certificates.pdf_conversion import convert_docx_to_pdf
+    if not output_path:
+        output_path = Path(input_path).with_suffix(".pdf")
+    return convert_docx_to_pdf(input_path, output_path)
 
 
 # certificates/utils.py
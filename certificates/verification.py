@@ -0,0 +1,173 @@
+# certificates/verification.py
+"""
+Cached results for the public verification endpoints.
+
+Every printed QR code points at verify_certificate, so a token is looked up
+far more often than its certificate changes. ``lookup(token)`` reads the
+few fields verification needs once and keeps them in the "verification"
+cache for VERIFICATION_CACHE_SECONDS, so a cache hit runs no query. Saves and
+deletes of the certificate (reissue, status change) delete its entries (see
+signals.py); code that writes certificates without signals (batch
+generation, the expiry sweep) calls invalidate_many() itself. The cache must
+be shared by every process that writes certificates, including
+``manage.py certificate_worker`` and cron commands, so that a save in one
+process reaches all of them (see CACHES in settings.py). Unknown tokens are
+cached too, so scans of a bad code do not reach the database either.
+
+Results are also cached by unique_id for bulk verification. ``lookup_many``
+reads a batch of either with one cache round trip and fetches the misses
+with an IN query per CHUNK_SIZE values.
+
+Expiry is evaluated when the result is served, not when it is cached, so a
+cached result never outlives its certificate's expiration date.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from certificates.models import LIFECYCLE_EXPIRED, Certificate
+
+FIELDS = (
+    "verification_token", "unique_id", "full_name", "document_type", "purpose", "status",
+    "lifecycle", "created_at", "reissue_date", "expiration_date", "updated_at",
+)
+# Cached in place of a result for tokens that match no certificate
+MISSING = "missing"
+# Values per IN query (below SQLite's bound parameter limit)
+CHUNK_SIZE = 200
+CACHE_ALIAS = "verification"
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _key(token):
+    return f"certificates:verify:{token}"
+
+
+def _id_key(unique_id):
+    return f"certificates:verify-id:{unique_id}"
+
+
+_KEYS = {"verification_token": _key, "unique_id": _id_key}
+
+
+def _timeout():
+    return getattr(settings, "VERIFICATION_CACHE_SECONDS", 60 * 60 * 24)
+
+
+def _row(values):
+    values["document_type_display"] = dict(Certificate._meta.get_field("document_type").choices).get(
+        values["document_type"], values["document_type"]
+    )
+    return values
+
+
+def lookup(token):
+    """The certificate's verification fields (a dict), or None for an unknown token."""
+    cached = _cache().get(_key(token))
+    if cached is None:
+        row = Certificate.objects.filter(verification_token=token).values(*FIELDS).first()
+        cached = _row(row) if row else MISSING
+        _cache().set(_key(token), cached, _timeout())
+    return None if cached == MISSING else cached
+
+
+def lookup_many(values, field="verification_token"):
+    """
+    {value: result or None} for verification tokens (UUIDs) or, with
+    ``field="unique_id"``, certificate ids. Shares lookup()'s cache.
+    """
+    key = _KEYS[field]
+    keys = {key(value): value for value in values}
+    found = {keys[cache_key]: result for cache_key, result in _cache().get_many(list(keys)).items()}
+    missing = list(dict.fromkeys(value for value in keys.values() if value not in found))
+
+    fetched = {}
+    for start in range(0, len(missing), CHUNK_SIZE):
+        chunk = missing[start:start + CHUNK_SIZE]
+        for row in Certificate.objects.filter(**{f"{field}__in": chunk}).values(*FIELDS):
+            fetched[row[field]] = _row(row)
+    if missing:
+        entries = {key(value): fetched.get(value, MISSING) for value in missing}
+        # Warm the other key of each certificate found, too
+        for result in fetched.values():
+            entries[_key(result["verification_token"])] = result
+            if result["unique_id"]:
+                entries[_id_key(result["unique_id"])] = result
+        _cache().set_many(entries, _timeout())
+        for value in missing:
+            found[value] = fetched.get(value, MISSING)
+
+    return {value: None if result == MISSING else result for value, result in found.items()}
+
+
+def invalidate_many(pairs):
+    """
+    Drop the cached results for (verification_token, unique_id) pairs: now,
+    and again once the current transaction commits, in case a concurrent
+    lookup cached the old row in between.
+    """
+    keys = []
+    for token, unique_id in pairs:
+        keys.append(_key(token))
+        if unique_id:
+            keys.append(_id_key(unique_id))
+    if keys:
+        _cache().delete_many(keys)
+        transaction.on_commit(lambda: _cache().delete_many(keys))
+
+
+def invalidate(token, unique_id=None):
+    invalidate_many([(token, unique_id)])
+
+
+def is_expired(result, now=None):
+    expires = result["expiration_date"]
+    return result["lifecycle"] == LIFECYCLE_EXPIRED or bool(expires and (now or timezone.now()) > expires)
+
+
+def status(result, now=None):
+    """Verification outcome: "valid", "expired" or "invalid" (not completed)."""
+    if is_expired(result, now):
+        return "expired"
+    return "valid" if result["status"] == "COMPLETED" else "invalid"
+
+
+def last_modified(result, now=None):
+    """When the outcome last changed: the last save, or the expiry once passed."""
+    if is_expired(result, now) and result["expiration_date"]:
+        return max(result["updated_at"], result["expiration_date"])
+    return result["updated_at"]
+
+
+def etag(result, now=None):
+    """Validator covering the stored fields and the current outcome."""
+    state = [result[field] for field in FIELDS] + [status(result, now)]
+    digest = hashlib.sha256(json.dumps(state, cls=DjangoJSONEncoder).encode()).hexdigest()[:32]
+    return digest
+
+
+def compact(result, now=None):
+    """JSON-ready summary for scanner apps."""
+    def day(value):
+        return timezone.localdate(value).isoformat() if value else None
+
+    outcome = status(result, now)
+    return {
+        "id": result["unique_id"],
+        "status": outcome,
+        "valid": outcome == "valid",
+        "type": result["document_type"],
+        "name": result["full_name"],
+        "purpose": result["purpose"],
+        "issued": day(result["created_at"]),
+        "reissued": day(result["reissue_date"]),
+        "expires": day(result["expiration_date"]),
+    }
@@ -1,52 +1,204 @@
 # certificates/views/certificate_verification_views.py
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render
 from certificates.models import Certificate
-from django.http import HttpResponse
-import qrcode
-from io import BytesIO
-from django.urls import reverse
+from certificates import claims, qr_service, report_cache, verification
+from certificates.generation import build_verify_url
+from django.contrib import messages
+from django.conf import settings
+from django.http import Http404, HttpResponse, StreamingHttpResponse
 from django.http import JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.cache import cache_control
 from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition, require_POST
 import json
+import uuid
 
+# A token's QR image never changes, so clients and proxies may keep it for a year
+# (unless it carries a signed claim)
+QR_CACHE_SECONDS = 60 * 60 * 24 * 365
+QR_FIELDS = ("verification_token", "unique_id", "full_name", "document_type", "created_at", "reissue_date", "expiration_date")
+
+# Scanner apps may reuse a JSON result this long before revalidating
+VERIFY_JSON_MAX_AGE = 60
+
+
+def _verification(request, token):
+    """Cached verification result, looked up once per request."""
+    if not hasattr(request, "_verification"):
+        request._verification = verification.lookup(token)
+    return request._verification
+
+
+def _verify_etag(request, token):
+    result = _verification(request, token)
+    # The page shows the signed-in user's menu and any pending messages
+    if result is None or len(messages.get_messages(request)):
+        return None
+    return f'"{verification.etag(result)}-{request.user.pk or 0}"'
+
+
+def _verify_last_modified(request, token):
+    result = _verification(request, token)
+    return verification.last_modified(result) if result else None
+
+
+@condition(etag_func=_verify_etag, last_modified_func=_verify_last_modified)
 def verify_certificate(request, token):
     """
     Verify a certificate using its UUID token.
+
+    The result comes from verification.lookup (cached per token); browsers
+    revalidate with the ETag / Last-Modified and get a 304 when nothing
+    changed.
     """
-    certificate = get_object_or_404(Certificate, verification_token=token)
+    result = _verification(request, token)
+    if result is None:
+        raise Http404("No certificate matches this verification code.")
+    outcome = verification.status(result)
     context = {
-        'cert': certificate,
-        'valid': not certificate.is_expired() and certificate.status == 'COMPLETED',
-        'expired': certificate.is_expired(),
+        'cert': result,
+        'valid': outcome == 'valid',
+        'expired': outcome == 'expired',
     }
-    return render(request, 'certificates/verify_certificate.html', context)
+    response = render(request, 'certificates/verify_certificate.html', context)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
 
-def certificate_qr(request, token):
+
+def _verify_json_etag(request, token):
+    result = _verification(request, token)
+    return f'"{verification.etag(result)}"' if result else None
+
+
+@condition(etag_func=_verify_json_etag, last_modified_func=_verify_last_modified)
+def verify_certificate_json(request, token):
+    """Compact JSON verification result for scanner apps."""
+    result = _verification(request, token)
+    if result is None:
+        response = JsonResponse({"ok": False, "error": "Unknown verification code."}, status=404)
+    else:
+        response = JsonResponse({"ok": True, **verification.compact(result)})
+    patch_cache_control(response, public=True, max_age=VERIFY_JSON_MAX_AGE)
+    return response
+
+def _bulk_items(kind, values):
+    """Result objects for one kind of bulk query, in request order, CHUNK_SIZE at a time."""
+    field = "verification_token" if kind == "token" else "unique_id"
+    for start in range(0, len(values), verification.CHUNK_SIZE):
+        chunk = values[start:start + verification.CHUNK_SIZE]
+        keys = []
+        for value in chunk:
+            try:
+                keys.append(uuid.UUID(value) if kind == "token" else value.strip().upper())
+            except (AttributeError, TypeError, ValueError):
+                keys.append(None)
+        results = verification.lookup_many([key for key in keys if key], field)
+        for value, key in zip(chunk, keys):
+            result = results.get(key) if key else None
+            if result is None:
+                yield {"query": value, "found": False}
+                continue
+            item = {"query": value, "found": True, **verification.compact(result)}
+            if kind == "id":
+                # Certificate ids are guessable; only a token reveals the holder
+                del item["name"], item["purpose"]
+            yield item
+
+
+@csrf_exempt
+@require_POST
+def verify_certificates_bulk(request):
     """
-    Generate QR code for certificate verification.
+    Verify many certificates in one request (for offices receiving stacks of
+    them). Body: {"tokens": [...], "ids": [...]} with verification tokens
+    and/or unique_ids, at most VERIFICATION_BULK_MAX in total. Results are
+    streamed as {"ok": true, "results": [...]} in request order, tokens first.
     """
-    # Get the certificate object
-    certificate = get_object_or_404(Certificate, verification_token=token)
+    try:
+        data = json.loads(request.body)
+        tokens = data.get("tokens") or []
+        ids = data.get("ids") or []
+        if not isinstance(tokens, list) or not isinstance(ids, list):
+            raise ValueError
+    except (ValueError, AttributeError):
+        return JsonResponse({"ok": False, "error": 'Send JSON: {"tokens": [...], "ids": [...]}.'}, status=400)
+    limit = getattr(settings, "VERIFICATION_BULK_MAX", 500)
+    if len(tokens) + len(ids) > limit:
+        return JsonResponse({"ok": False, "error": f"At most {limit} certificates per request."}, status=400)
 
-    # Build the absolute verification URL using Django's reverse
-    verification_url = request.build_absolute_uri(
-        reverse("certificates:verify_certificate", args=[certificate.verification_token])
-    )
+    def stream():
+        yield '{"ok":true,"results":['
+        separator = ""
+        for kind, values in (("token", tokens), ("id", ids)):
+            for item in _bulk_items(kind, values):
+                yield separator + json.dumps(item, separators=(",", ":"))
+                separator = ","
+        yield "]}"
 
-    # Generate the QR code
-    qr = qrcode.QRCode(version=1, box_size=10, border=4)
-    qr.add_data(verification_url)
-    qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-
-    # Prepare the response as PNG
-    buffer = BytesIO()
-    img.save(buffer, format="PNG")
-    response = HttpResponse(content_type="image/png")
-    response.write(buffer.getvalue())
+    response = StreamingHttpResponse(stream(), content_type="application/json")
+    patch_cache_control(response, no_store=True)
     return response
 
 
+def _qr_request(request, token):
+    fmt = "svg" if request.GET.get("format") == "svg" else "png"
+    result = _verification(request, token)
+    if result is None:
+        return None, fmt
+    # Signed claims need the certificate's fields, which lookup() has cached
+    cert = Certificate(**{field: result[field] for field in QR_FIELDS})
+    return build_verify_url(cert, request.build_absolute_uri("/")), fmt
+
+
+def _qr_etag(request, token):
+    payload, fmt = _qr_request(request, token)
+    return qr_service.etag(payload, fmt) if payload else None
+
+
+@condition(etag_func=_qr_etag)
+def certificate_qr(request, token):
+    """
+    Serve the QR code for certificate verification (PNG, or SVG with ?format=svg).
+
+    Images come from qr_service, which pre-renders them when a certificate is
+    created; the payload comes from the cached verification result, so once
+    it is cached, revalidations with a matching ETag get a 304 without a
+    database query.
+    """
+    verification_url, fmt = _qr_request(request, token)
+    if verification_url is None:
+        raise Http404("No certificate matches this verification code.")
+
+    response = HttpResponse(qr_service.get_qr(verification_url, fmt), content_type=qr_service.FORMATS[fmt])
+    if claims.enabled():
+        # The signed claim changes when the certificate is reissued
+        patch_cache_control(response, public=True, no_cache=True)
+    else:
+        patch_cache_control(response, public=True, max_age=QR_CACHE_SECONDS, immutable=True)
+    return response
+
+
+@cache_control(public=True, no_cache=True)
+@condition(etag_func=lambda request: report_cache.etag(
+    request, f"list-{request.GET.get('since', '')}", name=claims.REVOCATIONS
+))
+def claim_revocations(request):
+    """
+    Revoked signed QR claims for offline verifiers (see claims.py).
+    ``?since=<Unix seconds>`` returns only entries changed since then; pass
+    the previous response's "generated" value.
+    """
+    try:
+        since = int(request.GET["since"]) if request.GET.get("since") else None
+    except ValueError:
+        return JsonResponse({"ok": False, "error": "since must be Unix seconds."}, status=400)
+    data = report_cache.get_or_build(
+        request, f"revocations:{since}", lambda: claims.revocation_list(since), name=claims.REVOCATIONS
+    )
+    return JsonResponse({"ok": True, **data})
+
+
 @csrf_exempt
 def check_age(request):
     if request.method == 'POST':
@@ -3,13 +3,17 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib import messages
-from django.core.paginator import Paginator
-from django.db.models import Q
+from django.core.exceptions import ValidationError
+from django.conf import settings
 
-from certificates.models import Certificate, ReissueLog, ActivityLog
+from certificates.models import Certificate, ReissueLog
 from certificates.forms import CertificateForm
+from certificates.filters import CERTIFICATE_PARAMS, VALIDITIES, filter_certificates
+from certificates.pagination import paginate
+from certificates import audit, qr_service, report_cache
+from certificates.generation import build_verify_url
 from certificates.decorators import role_required
-from .document_views import generate_certificate  # DOCX generation helper
+from .document_views import generate_certificate  # queues DOCX generation
 
 # ---------------- CREATE CERTIFICATE ----------------
 @login_required
@@ -28,11 +32,13 @@ def create_certificate(request):
 
     try:
         certificate = form.save()
-        ActivityLog.objects.create(
-            user=request.user,
-            action=f"Created certificate for {certificate.full_name} ({certificate.document_type})"
-        )
+        # Encode the verification QR now so the public QR endpoint only serves cached images
+        qr_service.prerender(build_verify_url(certificate, request.build_absolute_uri("/")))
+        audit.log(request.user, f"Created certificate for {certificate.full_name} ({certificate.document_type})")
         return JsonResponse({"ok": True, "id": certificate.id})
+    except ValidationError as e:
+        # A concurrent request issued the same certificate first
+        return JsonResponse({"ok": False, "error": e.messages[0]})
     except ValueError as e:
         return JsonResponse({"ok": False, "error": f"Date error: {str(e)}"})
 
@@ -40,29 +46,37 @@ def create_certificate(request):
 # ---------------- LIST CERTIFICATES ----------------
 @login_required
 def list_certificates(request):
-    search = request.GET.get('search', '')
-    document_type = request.GET.get('document_type', '')
-    status = request.GET.get('status', '')
-    certificates = Certificate.objects.all()
+    certificates = filter_certificates(Certificate.objects.all(), request.GET)
+    if request.GET.get('validity', '').strip().lower() in VALIDITIES:
+        # Certificates cross their expiration date without being written
+        total = certificates.count()
+    else:
+        # Filtered count, cached until any certificate is written
+        key = "certificate-count:" + "&".join(f"{name}={request.GET.get(name, '').strip()}" for name in CERTIFICATE_PARAMS)
+        total = report_cache.get_or_build(request, key, certificates.count, name=report_cache.CERTIFICATES)
 
-    if search:
-        certificates = certificates.filter(Q(full_name__icontains=search) | Q(address__icontains=search))
-    if document_type:
-        certificates = certificates.filter(document_type__iexact=document_type)
-    if status:
-        certificates = certificates.filter(status__iexact=status)
+    if request.GET.get('search', '').strip():
+        # Full-text matches, best first
+        page = paginate(
+            filter_certificates(Certificate.objects.all(), request.GET, rank=True),
+            request.GET.get('cursor'), per_page=9, keys=("search_rank", "pk"), total=total,
+        )
+    else:
+        page = paginate(certificates, request.GET.get('cursor'), per_page=9, total=total)
 
-    paginator = Paginator(certificates.order_by('-created_at'), 9)
-    page_number = request.GET.get('page')
-    certificates = paginator.get_page(page_number)
-    return render(request, 'certificates/list_certificates.html', {'certificates': certificates})
+    # Filters carried over to the Previous / Next links
+    filters = request.GET.copy()
+    filters.pop('cursor', None)
+    return render(request, 'certificates/list_certificates.html', {'certificates': page, 'filters': filters.urlencode()})
 
 
 # ---------------- CERTIFICATE DETAIL ----------------
 @login_required
 def certificate_detail(request, pk):
     cert = get_object_or_404(Certificate, pk=pk)
-    return render(request, "certificates/certificate_detail.html", {"cert": cert})
+    job = cert.generation_jobs.order_by("-created_at").first()
+    pdf_on_demand = getattr(settings, "CERTIFICATE_PDF_BACKEND", "") == "reportlab" and cert.status == "COMPLETED"
+    return render(request, "certificates/certificate_detail.html", {"cert": cert, "job": job, "pdf_on_demand": pdf_on_demand})
 
 
 # ---------------- REISSUE CERTIFICATE ----------------
@@ -78,11 +92,8 @@ def reissue_certificate(request, pk):
             remarks=f"Reissued {cert.get_document_type_display()} certificate for {cert.full_name}"
         )
         generate_certificate(request, pk=cert.pk, skip_log=True)
-        ActivityLog.objects.create(
-            user=request.user,
-            action=f"Reissued {cert.get_document_type_display()} certificate for {cert.full_name}"
-        )
-        messages.success(request, f"✅ Certificate for {cert.full_name} has been successfully reissued and regenerated.")
+        audit.log(request.user, f"Reissued {cert.get_document_type_display()} certificate for {cert.full_name}")
+        messages.success(request, f"✅ Certificate for {cert.full_name} has been reissued and queued for regeneration.")
     except Exception as e:
         messages.error(request, f"⚠️ Reissue failed: {str(e)}")
     return redirect("certificates:certificate_detail", pk=cert.pk)
@@ -1,116 +1,87 @@
 # certificates/views/document_views.py
-from django.contrib.auth.decorators import login_required
+from django.contrib.auth.decorators import login_required, user_passes_test
 from django.shortcuts import get_object_or_404, redirect
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
 from django.conf import settings
 from pathlib import Path
 from django.contrib import messages
+from django.views.decorators.http import require_POST
 
-from docxtpl import DocxTemplate, InlineImage
-from docx.shared import Mm
-import qrcode
-
-from certificates.models import Certificate, AdminSignature, ActivityLog, CertificateTemplate
+from certificates.models import Certificate
 from certificates.decorators import role_required
-from certificates.utils import TEMPLATE_MAP, _ensure_dirs
+from certificates import instrumentation, jobs
+from certificates.generation import build_verify_url, is_up_to_date, render_certificate_pdf
 
 
 # ---------------- Certificate Generation ----------------
 @login_required
 def generate_certificate(request, pk, skip_log=False):
+    """
+    Queue DOCX generation for a certificate and return immediately.
+    The certificate_worker command does the rendering; the detail page polls
+    generation_status until the job finishes.
+    """
     cert = get_object_or_404(Certificate, pk=pk)
-    _ensure_dirs()
-
-    tpl_path = None
+    verify_url = build_verify_url(cert, request.build_absolute_uri("/"))
+    if is_up_to_date(cert, request.user, verify_url):
+        # Same template, values, signature and QR: the stored file is reused
+        messages.info(request, "Certificate is already up to date.")
+        return redirect("certificates:certificate_detail", pk=cert.pk)
 
-    # ✅ Try to find uploaded template first
-    uploaded_template = CertificateTemplate.objects.filter(template_type=cert.document_type).first()
-    if uploaded_template and uploaded_template.file:
-        tpl_path = Path(uploaded_template.file.path)
-    else:
-        # Fallback to default TEMPLATE_MAP
-        tpl_filename = TEMPLATE_MAP.get(cert.document_type)
-        if tpl_filename:
-            tpl_path = Path(settings.MEDIA_ROOT) / "certificate_templates" / tpl_filename
+    job = jobs.enqueue_generation(cert, user=request.user, verify_url=verify_url, skip_log=skip_log)
 
-    if not tpl_path or not tpl_path.exists():
-        messages.error(request, f"Template file missing for '{cert.document_type}'.")
+    if not getattr(settings, "CERTIFICATE_GENERATION_ASYNC", True):
+        # No worker process: generate within the request
+        if not jobs.run_inline(job):
+            job.refresh_from_db()
+            messages.error(request, f"Certificate generation error: {job.last_error}")
         return redirect("certificates:certificate_detail", pk=cert.pk)
 
-    # ---------------- Generate QR code ----------------
-    verify_url = request.build_absolute_uri(f"/certificates/verify/{cert.verification_token}/")
-    qr_path = Path(settings.MEDIA_ROOT) / "qrcodes" / f"qr_{cert.pk}.png"
-    qr_path.parent.mkdir(parents=True, exist_ok=True)
-    qrcode.make(verify_url).save(qr_path)
-
-    try:
-        # ---------------- Load template ----------------
-        doc = DocxTemplate(str(tpl_path))
-
-        # ---------------- Handle signature ----------------
-        signature_image_path = None
-        default_signature_path = Path(settings.MEDIA_ROOT) / "signatures" / "default_signature.png"
-
-        try:
-            admin_signature = AdminSignature.objects.get(admin_user=request.user)
-            if not admin_signature.bypass_digital_signature:
-                if admin_signature.signature_image and admin_signature.signature_image.name:
-                    signature_image_path = Path(settings.MEDIA_ROOT) / admin_signature.signature_image.name
-                elif default_signature_path.exists():
-                    signature_image_path = default_signature_path
-        except AdminSignature.DoesNotExist:
-            if default_signature_path.exists():
-                signature_image_path = default_signature_path
-
-        signature_inline = None
-        if signature_image_path and signature_image_path.exists():
-            signature_inline = InlineImage(doc, str(signature_image_path), width=Mm(40), height=Mm(12))
-
-        # ---------------- Template context ----------------
-        context = {
-            "cert": cert,
-            "full_name": cert.full_name,
-            "age": cert.age or "",
-            "address": cert.address or "",
-            "occupation": cert.occupation or "",
-            "purpose": cert.purpose or "",
-            "resident_since": cert.resident_since or "",
-            "date_issued": cert.created_at.strftime("%B %d, %Y") if cert.created_at else "",
-            "date_reissued": cert.reissue_date.strftime("%B %d, %Y") if cert.reissue_date else None,
-            "barangay": "Longos",
-            "city": "Malabon City",
-            "captain": "Maria Lourdes Casareo",
-            "postal": "1472",
-            "signature": signature_inline,
-            "captain_signature": signature_inline,
-            "qr_code": InlineImage(doc, str(qr_path), width=Mm(30)),
-        }
-
-        # Render and save document
-        doc.render(context)
-
-        docx_out_dir = Path(settings.MEDIA_ROOT) / "generated" / "docx"
-        docx_out_dir.mkdir(parents=True, exist_ok=True)
-        docx_name = f"{cert.document_type}_{cert.full_name.replace(' ', '_')}.docx"
-        docx_out = docx_out_dir / docx_name
-        doc.save(str(docx_out))
-
-        cert.generated_docx.name = f"generated/docx/{docx_name}"
-        cert.status = "COMPLETED"
-        cert.save(update_fields=["generated_docx", "status"])
-
-    except Exception as e:
-        messages.error(request, f"Certificate generation error: {str(e)}")
-        return redirect("certificates:certificate_detail", pk=cert.pk)
+    messages.info(request, "Certificate generation has been queued.")
+    return redirect("certificates:certificate_detail", pk=cert.pk)
 
-    # ---------------- Log activity ----------------
-    if not skip_log:
-        try:
-            ActivityLog.objects.create(user=request.user, action=f"Created certificate {cert.id} - {cert.full_name}")
-        except Exception as e:
-            print(f"[Activity Log Error] {e}")
 
-    return redirect("certificates:certificate_detail", pk=cert.pk)
+def _is_staff(user):
+    return user.is_active and user.is_staff
+
+
+@login_required
+@user_passes_test(_is_staff)
+def generation_metrics(request):
+    """
+    Per-stage generation timings (and tracemalloc peaks, when enabled) from
+    this process's rolling window. Django staff accounts only.
+    """
+    return JsonResponse({"ok": True, **instrumentation.snapshot()})
+
+
+@login_required
+@user_passes_test(_is_staff)
+@require_POST
+def reset_generation_metrics(request):
+    """Return the current window, then clear it."""
+    data = instrumentation.snapshot()
+    instrumentation.reset()
+    return JsonResponse({"ok": True, **data})
+
+
+@login_required
+def generation_status(request, pk):
+    """Latest generation job status for a certificate (polled by the detail page)."""
+    cert = get_object_or_404(Certificate, pk=pk)
+    job = cert.generation_jobs.order_by("-created_at").first()
+    if job is None:
+        return JsonResponse({"ok": True, "status": None, "certificate_status": cert.status})
+
+    return JsonResponse({
+        "ok": True,
+        "status": job.status,
+        "pending": job.is_pending,
+        "attempts": job.attempts,
+        "error": job.last_error,
+        "certificate_status": cert.status,
+        "has_docx": bool(cert.generated_docx),
+    })
 
 
 # ---------------- DOCX Download ----------------
@@ -130,23 +101,24 @@ def certificate_docx(request, pk):
         return response
 
 
-# ---------------- Certificate Verification ----------------
+# ---------------- PDF Download ----------------
 @login_required
-def verify_certificate(request, token):
-    cert = get_object_or_404(Certificate, verification_token=token)
-    return HttpResponse(f"Certificate for {cert.full_name} is valid.")
-
-
-# ---------------- QR Code ----------------
-@login_required
-def certificate_qr(request, token):
-    cert = get_object_or_404(Certificate, verification_token=token)
-    qr_path = Path(settings.MEDIA_ROOT) / "qrcodes" / f"qr_{cert.pk}.png"
-    qr_path.parent.mkdir(parents=True, exist_ok=True)
+@role_required(allowed_roles=["staff", "admin"])
+def certificate_pdf(request, pk):
+    certificate = get_object_or_404(Certificate, pk=pk)
+    if certificate.generated_pdf and Path(certificate.generated_pdf.path).exists():
+        with open(certificate.generated_pdf.path, "rb") as f:
+            pdf_bytes = f.read()
+    elif getattr(settings, "CERTIFICATE_PDF_BACKEND", "") == "reportlab" and certificate.status == "COMPLETED":
+        # Native engine is fast enough to render on demand
+        last_job = certificate.generation_jobs.order_by("-created_at").first()
+        signer = last_job.requested_by if last_job and last_job.requested_by else request.user
+        verify_url = build_verify_url(certificate, request.build_absolute_uri("/"))
+        pdf_bytes = render_certificate_pdf(certificate, signer, verify_url)
+    else:
+        return HttpResponse("Generated PDF not found.", status=404)
 
-    if not qr_path.exists():
-        verify_url = request.build_absolute_uri(f"/certificates/verify/{cert.verification_token}/")
-        qrcode.make(verify_url).save(qr_path)
+    response = HttpResponse(pdf_bytes, content_type="application/pdf")
+    response["Content-Disposition"] = f'attachment; filename=certificate_{pk}.pdf'
+    return response
 
-    with open(qr_path, "rb") as f:
-        return HttpResponse(f.read(), content_type="image/png")
@@ -0,0 +1,28 @@
+# certificates/views/export_views.py
+from django.contrib.auth.decorators import login_required
+from django.http import FileResponse, Http404, StreamingHttpResponse
+
+from certificates import exports
+from certificates.decorators import role_required
+
+
+# ---------------- CSV / XLSX EXPORTS ----------------
+@login_required
+@role_required(allowed_roles=["staff", "admin"])
+def export_data(request, dataset, fmt):
+    """Export a dataset with the same filters as its list page (query string)."""
+    if dataset not in exports.DATASETS or fmt not in exports.FORMATS:
+        raise Http404("Unknown export.")
+
+    filename = exports.filename(dataset, fmt)
+    if fmt == "csv":
+        response = StreamingHttpResponse(exports.iter_csv(dataset, request.GET), content_type=exports.FORMATS[fmt])
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    return FileResponse(
+        exports.xlsx_file(dataset, request.GET),
+        as_attachment=True,
+        filename=filename,
+        content_type=exports.FORMATS[fmt],
+    )
@@ -2,7 +2,7 @@ from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
 from django.shortcuts import render
 from django.views.decorators.csrf import csrf_exempt
-from certificates.models import ActivityLog 
+from certificates import audit
 from certificates.forms import OCRUploadForm 
 from certificates.ocr import extract_from_image
 
@@ -37,9 +37,10 @@ def ocr_extract_api(request):
         # Log admin bypass (if user explicitly used bypass) for audit trail
         if bypass and is_authorized:
             try:
-                ActivityLog.objects.create(
-                    user=request.user,
-                    action=f"⚠️ Admin attempted to bypass barangay check (OCR disabled) for manual entry."
+                audit.log(
+                    request.user,
+                    "⚠️ Admin attempted to bypass barangay check (OCR disabled) for manual entry.",
+                    critical=True,
                 )
             except Exception:
                 pass
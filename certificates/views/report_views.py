@@ -1,11 +1,11 @@
 # certificates/views/report_views.py
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
 from django.conf import settings
 from django.utils import timezone
-from django.db.models import Count, Q
-from django.views.decorators.cache import never_cache
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
 
 from docxtpl import DocxTemplate
 from docx import Document
@@ -13,106 +13,87 @@ from reportlab.lib.pagesizes import A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
+import io
 import os
 import json
+from datetime import date
 
-from certificates.models import Certificate, ReissueLog
 from certificates.decorators import role_required
+from certificates import report_cache, statistics, timeseries
 
 # ---------------- Reports Dashboard ----------------
-@never_cache
+def _reports_data():
+    # --- Counts from the pre-aggregated daily statistics ---
+    counts = statistics.totals()
+
+    return {
+        # --- Certificates by Document Type (Completed + Reissued) ---
+        "cert_counts": statistics.counts_by_type(),
+        # --- Purpose Breakdown ---
+        "purpose_counts": statistics.counts_by_purpose(),
+        # --- Monthly Trends (chart data is fetched from report_trends) ---
+        "years": timeseries.available_years(),
+        # --- New vs Reissued total ---
+        "new_vs_reissue": {"new": counts["generated"], "reissued": counts["reissued"]},
+        "total_certs": counts["total"],
+        "generated_certs": counts["generated"],
+        "reissued_certs": counts["reissued"],
+        "pending_certs": counts["pending"],
+    }
+
+
 @login_required
 @role_required(allowed_roles=["staff", "admin"])
+@cache_control(private=True, no_cache=True, must_revalidate=True)
+@condition(etag_func=lambda request: report_cache.etag(request, "page", per_session=True))
 def reports(request):
-    # --- Generated Certificates (Completed) ---
-    generated_certs = Certificate.objects.filter(status__iexact="completed").count()
-
-    # --- Reissued Certificates ---
-    reissued_logs = ReissueLog.objects.select_related('certificate')
-    reissued_certs = reissued_logs.count()
+    # Cached per data version; always revalidated, unchanged pages get a 304
+    data = report_cache.get_or_build(request, "data", _reports_data)
+    return render(request, "certificates/reports.html", data)
 
-    # --- Pending Certificates ---
-    pending_certs = Certificate.objects.filter(status__iexact="pending").count()
 
-    # --- Total Certificates ---
-    total_certs = generated_certs + reissued_certs
-
-    # --- Certificates by Document Type (Completed + Reissued) ---
-    completed_or_reissued = Certificate.objects.filter(
-        Q(status__iexact="completed") | Q(reissued=True)
+# ---------------- Monthly Trends (JSON) ----------------
+@login_required
+@role_required(allowed_roles=["staff", "admin"])
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=lambda request: report_cache.etag(request, f"trends-{request.GET.urlencode()}"))
+def report_trends(request):
+    """
+    Monthly generated/reissued counts for the reports chart.
+    Filters: ?year=YYYY and/or ?start=YYYY-MM-DD&end=YYYY-MM-DD (local dates).
+    """
+    try:
+        year = int(request.GET["year"]) if request.GET.get("year") else None
+        start = date.fromisoformat(request.GET["start"]) if request.GET.get("start") else None
+        end = date.fromisoformat(request.GET["end"]) if request.GET.get("end") else None
+    except ValueError:
+        return JsonResponse({"ok": False, "error": "Use year=YYYY and dates as YYYY-MM-DD."}, status=400)
+    if start and end and start > end:
+        return JsonResponse({"ok": False, "error": "start must not be after end."}, status=400)
+
+    months = report_cache.get_or_build(
+        request, f"trends:{year}:{start}:{end}",
+        lambda: timeseries.monthly_counts(year=year, start=start, end=end),
     )
-    cert_counts = completed_or_reissued.values("document_type").annotate(total=Count("id")).order_by("document_type")
-    reissue_type_counts = reissued_logs.values("certificate__document_type").annotate(total=Count("id"))
-
-    # Merge reissue counts into cert_counts
-    reissue_map = {r["certificate__document_type"]: r["total"] for r in reissue_type_counts}
-    merged_counts_list = [{"document_type": c["document_type"], "total": c["total"] + reissue_map.get(c["document_type"], 0)} for c in cert_counts]
-
-    # --- Purpose Breakdown ---
-    purpose_counts = completed_or_reissued.values("purpose").annotate(total=Count("id"))
-    purpose_counts_list = list(purpose_counts)
-
-    # --- Monthly Trends ---
-    monthly_counts_qs = completed_or_reissued.values("created_at").annotate(
-        new_total=Count("id", filter=Q(status__iexact="completed")),
-        reissued_total=Count("id", filter=Q(reissued=True))
-    ).order_by("created_at")
-
-    monthly_counts = []
-    years = set()
-    for item in monthly_counts_qs:
-        month_str = item["created_at"].strftime("%Y-%m-01")
-        year = item["created_at"].year
-        years.add(year)
-        monthly_counts.append({
-            "month": month_str,
-            "new_total": item["new_total"],
-            "reissued_total": item["reissued_total"]
-        })
-    years = sorted(list(years))
-
-    # --- New vs Reissued total ---
-    new_vs_reissue = {"new": generated_certs, "reissued": reissued_certs}
-
-    return render(request, "certificates/reports.html", {
-        "cert_counts": merged_counts_list,
-        "purpose_counts": purpose_counts_list,
-        "monthly_counts": monthly_counts,
-        "years": years,
-        "new_vs_reissue": new_vs_reissue,
-        "total_certs": total_certs,
-        "generated_certs": generated_certs,
-        "reissued_certs": reissued_certs,
-        "pending_certs": pending_certs,
-    })
+    return JsonResponse({"ok": True, "year": year, "start": start, "end": end, "months": months})
 
 
 # ---------------- PDF Export ----------------
-@login_required
-def reports_pdf(request):
+def _build_reports_pdf():
     # --- Accurate Dashboard-Matching Counts ---
-    generated_certs = Certificate.objects.filter(status__iexact="completed").count()
-    reissued_certs = ReissueLog.objects.count()
-    pending_certs = Certificate.objects.filter(status__iexact="pending").count()
-    total_certs = generated_certs + reissued_certs
+    counts = statistics.totals()
+    generated_certs = counts["generated"]
+    reissued_certs = counts["reissued"]
+    pending_certs = counts["pending"]
+    total_certs = counts["total"]
 
     # --- Aggregations ---
-    cert_counts = Certificate.objects.filter(
-        Q(status__iexact="completed") | Q(reissued=True)
-    ).values("document_type").annotate(total=Count("id")).order_by("document_type")
-
-    purpose_counts = Certificate.objects.filter(
-        Q(status__iexact="completed") | Q(reissued=True)
-    ).values("purpose").annotate(total=Count("id")).order_by("purpose")
-
-    # --- HTTP Response Setup ---
-    response = HttpResponse(content_type="application/pdf")
-    response["Content-Disposition"] = 'inline; filename="Barangay_Reports.pdf"'
-    response["X-Content-Type-Options"] = "nosniff"
-    response["Cache-Control"] = "no-store, no-cache, must-revalidate, private"
+    cert_counts = statistics.counts_by_type()
+    purpose_counts = statistics.counts_by_purpose()
 
     # --- PDF Document ---
-    pdf = SimpleDocTemplate(response, pagesize=A4, topMargin=30, bottomMargin=30)
+    buffer = io.BytesIO()
+    pdf = SimpleDocTemplate(buffer, pagesize=A4, topMargin=30, bottomMargin=30)
     pdf.title = "Barangay Reports Summary"
 
     story = []
@@ -176,4 +157,20 @@ def reports_pdf(request):
     story.append(Paragraph("<i>Generated automatically by the Barangay Certificate Management System</i>", normal_style))
 
     pdf.build(story)
+    return buffer.getvalue()
+
+
+@login_required
+@cache_control(private=True, no_cache=True, must_revalidate=True)
+@condition(
+    etag_func=lambda request: report_cache.etag(request, "pdf"),
+    last_modified_func=lambda request: report_cache.last_modified(request, dated=True),
+)
+def reports_pdf(request):
+    # Rendered once per data version and day; unchanged reports get a 304
+    pdf_bytes = report_cache.get_or_build(request, "pdf", _build_reports_pdf)
+
+    response = HttpResponse(pdf_bytes, content_type="application/pdf")
+    response["Content-Disposition"] = 'inline; filename="Barangay_Reports.pdf"'
+    response["X-Content-Type-Options"] = "nosniff"
     return response